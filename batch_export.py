@@ -0,0 +1,80 @@
+# batch_export.py
+"""
+On-demand CSV and Parquet export of Drive batch results
+Files are written in chunks to spooled temporary files the first time a
+download is requested and reused until the results are replaced
+"""
+
+import threading
+import time
+from tempfile import SpooledTemporaryFile
+
+from excel_export import SPOOL_MAX_SIZE
+
+# Rows rendered to CSV text at a time
+CSV_CHUNK_ROWS = 10000
+# Export format -> (label, file extension, MIME type)
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'csv', 'text/csv'),
+    'parquet': ('Parquet', 'parquet', 'application/vnd.apache.parquet')
+}
+
+
+def iter_csv_chunks(df, chunk_rows=CSV_CHUNK_ROWS):
+    """Yield a DataFrame as CSV text in row chunks, header first"""
+    yield df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=False)
+
+
+def write_csv(df, spool_max_size=SPOOL_MAX_SIZE):
+    """Stream a DataFrame as UTF-8 CSV into a spooled temporary file"""
+    output = SpooledTemporaryFile(max_size=spool_max_size, suffix='.csv')
+    for chunk in iter_csv_chunks(df):
+        output.write(chunk.encode('utf-8'))
+    output.seek(0)
+    return output
+
+
+def write_parquet(df, spool_max_size=SPOOL_MAX_SIZE):
+    """Write a DataFrame as Parquet into a spooled temporary file"""
+    output = SpooledTemporaryFile(max_size=spool_max_size, suffix='.parquet')
+    df.to_parquet(output, index=False)
+    output.seek(0)
+    return output
+
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet
+}
+
+
+class BatchExport:
+    """Lazily built export files for one set of batch results; safe to use from any thread"""
+
+    def __init__(self, df):
+        """df is the results DataFrame, or a callable returning it when the first file is built"""
+        self.df = df
+        self.build_seconds = {}
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def read(self, fmt):
+        """Bytes of the export in the given format, building it on first use"""
+        with self._lock:
+            output = self._files.get(fmt)
+            if output is None:
+                started = time.perf_counter()
+                output = WRITERS[fmt](self.df() if callable(self.df) else self.df)
+                self.build_seconds[fmt] = time.perf_counter() - started
+                self._files[fmt] = output
+            output.seek(0)
+            return output.read()
+
+    def close(self):
+        """Release the spooled files, e.g. when the results are replaced"""
+        with self._lock:
+            for output in self._files.values():
+                output.close()
+            self._files = {}
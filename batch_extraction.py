@@ -0,0 +1,204 @@
+# batch_extraction.py
+"""
+Concurrent batch extraction engine for the Google Drive tab
+Downloads Drive PDFs and runs the extraction pipeline over them as an
+overlapping producer/consumer pipeline with bounded concurrency
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from normalize import parse_currency, parse_dates
+
+# Number of extractions allowed in flight at once
+DEFAULT_MAX_WORKERS = 4
+# Number of concurrent Drive downloads feeding the extractions
+DEFAULT_DOWNLOAD_WORKERS = 2
+# Bytes of downloaded (or downloading) PDFs allowed to wait for extraction
+DEFAULT_PREFETCH_BYTES = 64 * 1024 * 1024
+# Assumed size for listing entries without a size field
+DEFAULT_FILE_SIZE = 1024 * 1024
+
+
+class ByteBudget:
+    """
+    Blocking byte counter used for backpressure between download and extraction
+    A file larger than the whole budget is admitted once nothing else is held
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size):
+        with self._condition:
+            while self.used and self.used + size > self.max_bytes:
+                self._condition.wait()
+            self.used += size
+
+    def release(self, size):
+        with self._condition:
+            self.used -= size
+            self._condition.notify_all()
+
+
+def listed_size(pdf):
+    """Size in bytes from the Drive listing, which reports it as a string"""
+    try:
+        return int(pdf.get('size') or DEFAULT_FILE_SIZE)
+    except (TypeError, ValueError):
+        return DEFAULT_FILE_SIZE
+
+
+def extract_one(pdf, pipeline, *args):
+    """Run pipeline(pdf, *args) for a single file and capture success or failure"""
+    started = time.perf_counter()
+    outcome = {
+        'filename': pdf['name'],
+        'file': pdf,
+        'status': 'success',
+        'result': None,
+        'error': None
+    }
+    try:
+        outcome['result'] = pipeline(pdf, *args)
+    except Exception as e:
+        outcome['status'] = 'failed'
+        outcome['error'] = str(e)
+    outcome['elapsed'] = time.perf_counter() - started
+    return outcome
+
+
+def run_pipelined_extraction(pdfs, download, pipeline, max_workers=DEFAULT_MAX_WORKERS,
+                             download_workers=DEFAULT_DOWNLOAD_WORKERS,
+                             prefetch_bytes=DEFAULT_PREFETCH_BYTES, on_file_done=None,
+                             extract_executor=None):
+    """
+    Download and extract files as an overlapping producer/consumer pipeline
+    download(pdf) returns the file bytes and pipeline(pdf, pdf_bytes) extracts them.
+    Downloads run ahead of extraction until prefetch_bytes (by listed size) are
+    held, then wait for extractions to free budget. on_file_done(outcome, done, total)
+    is called on the calling thread; outcomes are returned in the order of pdfs.
+    Extractions run on extract_executor when given (e.g. a shared
+    job_queue.FairShareExecutor), otherwise on a private pool of max_workers threads
+    """
+    pdfs = list(pdfs)
+    total = len(pdfs)
+    outcomes = [None] * total
+    if not pdfs:
+        return outcomes
+
+    budget = ByteBudget(prefetch_bytes)
+    finished = queue.Queue()
+    stop = threading.Event()
+    download_pool = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix='drive-download')
+    extract_pool = extract_executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='drive-extract')
+
+    def extract_downloaded(index, pdf, size, download_future):
+        try:
+            # A failed download surfaces here and is recorded as a failed file
+            outcome = extract_one(pdf, lambda p: pipeline(p, download_future.result()))
+        finally:
+            budget.release(size)
+        finished.put((index, outcome))
+
+    def produce():
+        for index, pdf in enumerate(pdfs):
+            size = listed_size(pdf)
+            budget.acquire(size)
+            if stop.is_set():
+                return
+            try:
+                download_future = download_pool.submit(download, pdf)
+            except RuntimeError:
+                # The pools were shut down while this thread waited for budget
+                return
+            download_future.add_done_callback(
+                lambda f, i=index, p=pdf, n=size: extract_pool.submit(extract_downloaded, i, p, n, f)
+            )
+
+    producer = threading.Thread(target=produce, name='drive-prefetch', daemon=True)
+    producer.start()
+    try:
+        for done in range(1, total + 1):
+            index, outcome = finished.get()
+            outcomes[index] = outcome
+            if on_file_done:
+                on_file_done(outcome, done, total)
+    finally:
+        # On an early exit (e.g. a Streamlit rerun) stop queueing and drain in-flight work
+        stop.set()
+        download_pool.shutdown(wait=True)
+        extract_pool.shutdown(wait=True)
+        producer.join()
+
+    return outcomes
+
+
+def content_key(pdf):
+    """(size, md5Checksum) from the Drive listing, or None when Drive reports no checksum for the file"""
+    checksum = pdf.get('md5Checksum')
+    return (pdf.get('size'), checksum) if checksum else None
+
+
+def group_duplicates(pdfs, preferred=()):
+    """
+    Group files with identical content by their listed size and checksum
+    Returns {representative file ID: [duplicate listing entries]} for groups of two
+    or more files. The representative is the first file of a group in listing
+    order, or the first one whose ID is in preferred (e.g. already extracted)
+    """
+    groups = {}
+    for pdf in pdfs:
+        key = content_key(pdf)
+        if key is not None:
+            groups.setdefault(key, []).append(pdf)
+    duplicates = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        representative = next((pdf for pdf in members if pdf['id'] in preferred), members[0])
+        duplicates[representative['id']] = [pdf for pdf in members if pdf is not representative]
+    return duplicates
+
+
+def duplicate_outcome(outcome, pdf):
+    """Outcome for a duplicate file, copied from its representative's outcome under the duplicate's name"""
+    result = outcome['result']
+    if result is not None:
+        summary = dict(result['summary'], filename=pdf['name'], duplicate_of=outcome['filename'])
+        result = dict(result, summary=summary)
+    return dict(outcome, filename=pdf['name'], file=pdf, result=result, elapsed=0.0)
+
+
+def summarize_batch(outcomes):
+    """Split batch outcomes into successful results and failures"""
+    results = [o['result'] for o in outcomes if o['status'] == 'success']
+    failures = [o for o in outcomes if o['status'] == 'failed']
+    return results, failures
+
+
+def results_summary(results_df):
+    """
+    Headline figures of a normalized Drive results frame (see normalize.normalize_frame)
+    Values and dates left as text because some did not parse count where they do parse
+    """
+    values = pd.Series(dtype='float64')
+    dates = pd.Series(dtype='datetime64[ns]')
+    if 'contract_value' in results_df:
+        values = parse_currency(results_df['contract_value'])
+    if 'contract_date' in results_df:
+        dates = parse_dates(results_df['contract_date'])
+    statuses = results_df['status'] if 'status' in results_df else pd.Series(dtype='category')
+    return {
+        'total_value': float(values.sum()),
+        'average_value': float(values.mean()) if values.notna().any() else None,
+        'status_counts': {str(k): int(v) for k, v in statuses.value_counts().items() if v},
+        'first_date': dates.min() if dates.notna().any() else None,
+        'last_date': dates.max() if dates.notna().any() else None
+    }
@@ -0,0 +1,122 @@
+# batch_manifest.py
+"""
+Durable checkpoint manifest for Drive batch extractions
+Records each file's status and result in SQLite as it finishes, so a rerun of
+the same folder skips files that are done and unchanged since
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MANIFEST_PATH = os.environ.get(
+    'EXTRACTION_MANIFEST_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'trulioo_contract_extractor', 'batch_manifest.sqlite3')
+)
+
+STATUS_PENDING = 'pending'
+STATUS_SUCCESS = 'success'
+STATUS_FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_files (
+    user TEXT NOT NULL,
+    folder_id TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    modified_time TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user, folder_id, file_id)
+)
+"""
+
+
+class BatchManifest:
+    """SQLite manifest of per-file batch progress, keyed by user, folder and file ID"""
+
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # Each checkpoint is a single-row commit; NORMAL keeps them cheap under WAL
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def plan(self, user, folder_id, pdfs):
+        """
+        Split a folder listing into finished outcomes and files still to extract
+        A file is finished if it succeeded and its modifiedTime is unchanged;
+        the others are marked pending. Returns (done outcomes by file ID, pdfs to run)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_id, modified_time, result FROM batch_files "
+                "WHERE user = ? AND folder_id = ? AND status = ?",
+                (user, folder_id, STATUS_SUCCESS)
+            ).fetchall()
+        succeeded = {file_id: (modified_time, result) for file_id, modified_time, result in rows}
+
+        done = {}
+        todo = []
+        for pdf in pdfs:
+            previous = succeeded.get(pdf['id'])
+            if previous is not None and previous[0] == pdf.get('modifiedTime'):
+                done[pdf['id']] = {
+                    'filename': pdf['name'],
+                    'file': pdf,
+                    'status': STATUS_SUCCESS,
+                    'result': json.loads(previous[1]),
+                    'error': None,
+                    'elapsed': 0.0
+                }
+            else:
+                todo.append(pdf)
+        self.mark_pending(user, folder_id, todo)
+        return done, todo
+
+    def mark_pending(self, user, folder_id, pdfs):
+        """Record files as pending, e.g. when a finished file has to run again"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO batch_files (user, folder_id, file_id, name, modified_time, status, result, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, ?) "
+                "ON CONFLICT (user, folder_id, file_id) DO UPDATE SET "
+                "name = excluded.name, modified_time = excluded.modified_time, "
+                "status = excluded.status, result = NULL, error = NULL, updated_at = excluded.updated_at",
+                [(user, folder_id, pdf['id'], pdf['name'], pdf.get('modifiedTime'), STATUS_PENDING, now) for pdf in pdfs]
+            )
+
+    def record(self, user, folder_id, outcome):
+        """Checkpoint the outcome of one file as soon as it finishes"""
+        pdf = outcome['file']
+        result = json.dumps(outcome['result']) if outcome['status'] == STATUS_SUCCESS else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE batch_files SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE user = ? AND folder_id = ? AND file_id = ?",
+                (outcome['status'], result, outcome['error'], time.time(), user, folder_id, pdf['id'])
+            )
+
+    def counts(self, user, folder_id):
+        """Number of files per status recorded for a folder"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM batch_files WHERE user = ? AND folder_id = ? GROUP BY status",
+                (user, folder_id)
+            ).fetchall()
+        return dict(rows)
+
+    def clear(self, user, folder_id):
+        """Forget a folder's checkpoints so the next run starts over"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM batch_files WHERE user = ? AND folder_id = ?", (user, folder_id))
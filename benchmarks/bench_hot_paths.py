@@ -0,0 +1,294 @@
+# benchmarks/bench_hot_paths.py
+"""
+Benchmarks for the data and rendering hot paths of the contract extractor
+Runs headless and writes timings as JSON so runs can be compared
+
+Usage:
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --quick --compare benchmarks/results/previous.json
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Keep benchmark cache entries, indexed contracts, checkpoints, spilled tables and spooled
+# uploads out of the user's own; the scratch directory is removed when the run ends
+WORK_DIR = tempfile.mkdtemp(prefix='bench_')
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+os.environ.setdefault('EXTRACTION_CACHE_DIR', os.path.join(WORK_DIR, 'cache'))
+os.environ.setdefault('EXTRACTION_INDEX_PATH', os.path.join(WORK_DIR, 'index.sqlite3'))
+os.environ.setdefault('EXTRACTION_MANIFEST_PATH', os.path.join(WORK_DIR, 'manifest.sqlite3'))
+os.environ.setdefault('EXTRACTION_SPILL_DIR', os.path.join(WORK_DIR, 'sessions'))
+os.environ.setdefault('EXTRACTION_SPOOL_DIR', os.path.join(WORK_DIR, 'uploads'))
+
+import pandas as pd  # noqa: E402
+
+from dummy_data import (  # noqa: E402
+    DUMMY_PIPELINE_VERSION,
+    create_dummy_consumption_rate,
+    create_dummy_consumption_schedule,
+    create_dummy_contract_data,
+    create_dummy_extraction_results,
+    create_dummy_line_item_data,
+    create_dummy_subscription_data,
+    dummy_pdf_bytes,
+    to_excel_dummy,
+)
+from batch_export import BatchExport  # noqa: E402
+from contract_index import ContractIndex, drive_summary_rows  # noqa: E402
+from excel_export import write_workbook  # noqa: E402
+from extraction_result import ExtractionResult, table_block  # noqa: E402
+from pdf_pages import extract_page_texts, new_page_executor  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+
+APP_PATH = os.path.join(ROOT_DIR, 'streamlit_frontend_only.py')
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+ROW_COUNTS = [1000, 10000, 100000]
+PAGE_COUNTS = [20, 200]
+QUICK_ROW_COUNTS = [1000, 10000]
+# A benchmark is flagged when its median is this much slower than the baseline
+REGRESSION_THRESHOLD = 1.2
+
+
+def make_tables(rows):
+    """The seven result tables, each with rows synthetic rows"""
+    return {
+        'df_contract': create_dummy_contract_data(rows),
+        'df_subscription': create_dummy_subscription_data(rows),
+        'df_lineitemsource': create_dummy_line_item_data(rows),
+        'df_subconsumptionschedule': create_dummy_consumption_schedule(rows),
+        'df_subconsumptionrate': create_dummy_consumption_rate(rows),
+        'df_lisconsmptionschedule': create_dummy_consumption_schedule(rows, seed=1),
+        'df_lisconsumptionrate': create_dummy_consumption_rate(rows, seed=1)
+    }
+
+
+def make_response(rows):
+    """A pipeline response whose seven columnar output_records hold rows rows each"""
+    return {'output_records': [table_block(df) for df in make_tables(rows).values()]}
+
+
+def measure(name, fn, repeat, **params):
+    """Time fn() repeat times and summarize the wall-clock seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return summarize(name, timings, **params)
+
+
+def summarize(name, timings, **params):
+    """Summarize wall-clock seconds measured elsewhere"""
+    result = {
+        'name': name,
+        'params': params,
+        'repeat': len(timings),
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'max': max(timings)
+    }
+    print(f"{name:<32} {json.dumps(params):<24} median {result['median'] * 1000:10.2f} ms")
+    return result
+
+
+def bench_excel(row_counts, repeat):
+    results = []
+    for rows in row_counts:
+        tables = make_tables(rows)
+        results.append(measure('to_excel_dummy', lambda: to_excel_dummy(**tables), repeat, rows_per_sheet=rows))
+        sheets = ExtractionResult.from_response(make_response(rows)).sheets()
+        results.append(measure('write_workbook', lambda: write_workbook(sheets)[0].close(), repeat, rows_per_sheet=rows))
+    return results
+
+
+def bench_output_records(row_counts, repeat):
+    results = []
+    for rows in row_counts:
+        response = make_response(rows)
+        # Row dicts, as the endpoint sends them, for comparison with the columnar blocks
+        records = [df.to_dict('records') for df in make_tables(rows).values()]
+        results.append(measure(
+            'output_records_to_dataframes',
+            lambda: [pd.DataFrame(data) for data in records],
+            repeat, rows_per_table=rows
+        ))
+        results.append(measure(
+            'extraction_result_from_response',
+            lambda: ExtractionResult.from_response(response),
+            repeat, rows_per_table=rows
+        ))
+    return results
+
+
+def bench_drive_csv(row_counts, repeat):
+    results = []
+    for rows in row_counts:
+        results_df = pd.DataFrame(create_dummy_extraction_results(rows))
+        results.append(measure('drive_results_to_csv', lambda: results_df.to_csv(index=False), repeat, files=rows))
+        for fmt in ('csv', 'parquet'):
+            results.append(measure(
+                f'batch_export_{fmt}', lambda: BatchExport(results_df).read(fmt), repeat, files=rows
+            ))
+    return results
+
+
+def bench_contract_search(row_counts, repeat):
+    """Search tab queries against an index holding rows contracts"""
+    results = []
+    queries = {
+        'text': {'text': 'contoso bank'},
+        'text_status': {'text': 'service', 'statuses': ['Pending']},
+        'date_range': {'date_from': '2023-01-01', 'date_to': '2023-03-31'},
+        'value_range': {'min_value': 100000, 'max_value': 200000}
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in row_counts:
+            index = ContractIndex(os.path.join(tmp_dir, f'index_{rows}.sqlite3'))
+            index.add('benchmark', [
+                row for i, summary in enumerate(create_dummy_extraction_results(rows))
+                for row in drive_summary_rows(summary, f'doc-{i}')
+            ])
+            for name, query in queries.items():
+                results.append(measure(
+                    f'contract_search_{name}', lambda: index.search('benchmark', **query), repeat, contracts=rows
+                ))
+    return results
+
+
+def bench_page_extraction(page_counts, repeat):
+    """Text extraction of a spooled PDF in-process and on the page process pool"""
+    results = []
+    executor = new_page_executor()
+    executor.submit(int).result()  # Start the workers outside the timings
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for pages in page_counts:
+            path = os.path.join(tmp_dir, f'sample_{pages}.pdf')
+            with open(path, 'wb') as f:
+                f.write(dummy_pdf_bytes(pages))
+            results.append(measure('page_text_inline', lambda: extract_page_texts(path), repeat, pages=pages))
+            results.append(measure(
+                'page_text_process_pool', lambda: extract_page_texts(path, executor), repeat, pages=pages
+            ))
+    executor.shutdown()
+    return results
+
+
+def open_single_extraction(result_cache, rows, run):
+    """AppTest session with a cached response of rows rows per table uploaded and ready to extract"""
+    from streamlit.testing.v1 import AppTest
+
+    pdf_bytes = f"%PDF-1.4 benchmark {rows} {run}".encode('utf-8')
+    # Prime the disk cache so Extract renders immediately without the simulated pipeline
+    result_cache.put(result_cache.key_for(pdf_bytes), make_response(rows))
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.session_state.authenticated = True
+    at.session_state.username = 'benchmark@example.com'
+    at.run()
+    at.file_uploader[0].upload('benchmark.pdf', pdf_bytes, 'application/pdf').run()
+    return at
+
+
+def wait_for_workbook(at, timeout=600):
+    """Rerun until the background build of the remaining tables and the workbook has been collected"""
+    deadline = time.monotonic() + timeout
+    while at.session_state.single_extraction['result'] is None:
+        if at.exception or time.monotonic() > deadline:
+            raise RuntimeError(f"Single extraction workbook was not built: {at.exception}")
+        time.sleep(0.2)
+        at.run()
+
+
+def bench_single_tab_rerun(row_counts, repeat):
+    """
+    Time from Extract to the first result table on screen, and full script reruns
+    once every table and the workbook are ready
+    """
+    results = []
+    result_cache = ResultCache(DUMMY_PIPELINE_VERSION, cache_dir=os.environ['EXTRACTION_CACHE_DIR'])
+    for rows in row_counts:
+        first_table = []
+        for run in range(repeat):
+            at = open_single_extraction(result_cache, rows, run)
+            started = time.perf_counter()
+            next(b for b in at.button if b.label.endswith('Extract')).click().run()
+            first_table.append(time.perf_counter() - started)
+            if at.exception or not at.dataframe:
+                raise RuntimeError(f"Single extraction did not render: {at.exception}")
+        results.append(summarize('single_tab_first_table', first_table, rows_per_table=rows))
+        wait_for_workbook(at)
+        results.append(measure('single_tab_rerun', at.run, repeat, rows_per_table=rows))
+    return results
+
+
+def compare(results, baseline_path):
+    """Print the median ratio against a previous results file and return the regressions"""
+    with open(baseline_path) as f:
+        baseline = {
+            (r['name'], json.dumps(r['params'], sort_keys=True)): r
+            for r in json.load(f)['results']
+        }
+    regressions = []
+    print(f"\nComparison against {baseline_path}")
+    for result in results:
+        previous = baseline.get((result['name'], json.dumps(result['params'], sort_keys=True)))
+        if previous is None:
+            continue
+        ratio = result['median'] / previous['median'] if previous['median'] else float('inf')
+        flag = '  <-- regression' if ratio > REGRESSION_THRESHOLD else ''
+        print(f"{result['name']:<32} {json.dumps(result['params']):<24} x{ratio:6.2f}{flag}")
+        if flag:
+            regressions.append(result)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per benchmark')
+    parser.add_argument('--quick', action='store_true', help='skip the 100k row sizes')
+    parser.add_argument('--skip-app', action='store_true', help='skip the Streamlit AppTest rerun benchmark')
+    parser.add_argument('--output', help='results JSON path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', help='previous results JSON to compare medians against')
+    args = parser.parse_args()
+
+    row_counts = QUICK_ROW_COUNTS if args.quick else ROW_COUNTS
+    results = []
+    results += bench_excel(row_counts, args.repeat)
+    results += bench_output_records(row_counts, args.repeat)
+    results += bench_drive_csv(row_counts, args.repeat)
+    results += bench_page_extraction(PAGE_COUNTS, args.repeat)
+    results += bench_contract_search(row_counts, args.repeat)
+    if not args.skip_app:
+        results += bench_single_tab_rerun(QUICK_ROW_COUNTS, args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'results': results
+        }, f, indent=2)
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if args.compare and compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,619 @@
+# benchmarks/load_test.py
+"""
+Multi-session load test of the Streamlit app
+Starts `streamlit run streamlit_frontend_only.py` against a stub extraction
+endpoint with configurable latency and drives N simulated browser sessions
+over Streamlit's websocket protocol. Each session logs in through the auth
+page, then repeats a single-file extraction (unique PDF per session and cycle)
+and a Drive connect, select, extract and disconnect cycle before logging out.
+Fragment polling is followed like the browser does it.
+
+Every concurrency level runs on a fresh server and reports rerun latency
+percentiles (overall, per step and per session), server CPU and RSS, and
+completed flows per second. The knee is the first level whose per-step p95
+rerun latency exceeds the single-session p95 by --knee-factor; the throughput
+of the level before it is the sustainable throughput of this host.
+
+Drive folders hold the same dummy documents for every user, so after the first
+extraction of a level Drive files come from the shared result cache; only the
+single-file flow reaches the stubbed endpoint every time.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --sessions 1 2 4 8 16 --cycles 2 --latency-ms 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import FileUploaderState, UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+from bench_hot_paths import APP_PATH, RESULTS_DIR, ROOT_DIR, make_tables
+from dummy_data import dummy_pdf_bytes
+
+DEFAULT_SESSION_COUNTS = [1, 2, 4, 8]
+# Seconds to wait for the server to answer its health check
+SERVER_START_TIMEOUT = 60
+# Seconds one rerun, or one wait for a job through fragment polling, may take
+STEP_TIMEOUT = 300
+# Script run states after which the browser considers a rerun finished
+TERMINAL_STATUSES = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY
+}
+# Baseline p95 used for steps faster than this, so noise on instant reruns is not taken for a knee
+KNEE_FLOOR_SECONDS = 0.25
+DRIVE_FOLDER = 'Contracts 2024'
+PDF_PAGES = 2
+
+
+def percentiles(values):
+    """p50/p95/p99/max of a list of seconds, linearly interpolated"""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def at(q):
+        position = (len(ordered) - 1) * q
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    return {'count': len(ordered), 'p50': at(0.5), 'p95': at(0.95), 'p99': at(0.99), 'max': ordered[-1]}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class StubEndpoint:
+    """Token and extraction endpoints standing in for the remote pipeline; /extract answers after a delay"""
+
+    def __init__(self, rows, latency_ms, jitter_ms):
+        # Row-oriented blocks, as the real endpoint sends them
+        records = [{'data': df.to_dict('records')} for df in make_tables(rows).values()]
+        payload = json.dumps({'output_records': records}).encode('utf-8')
+        token = json.dumps({'access_token': 'load-test', 'expires_in': 3600}).encode('utf-8')
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if self.path == '/token':
+                    body = token
+                else:
+                    stub.count()
+                    time.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+                    body = payload
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, name='stub-endpoint', daemon=True).start()
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class AppServer:
+    """`streamlit run` of the app in a subprocess, with its caches, index and spill files in a scratch directory"""
+
+    def __init__(self, stub_url):
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.work_dir = tempfile.mkdtemp(prefix='load_test_')
+        env = dict(
+            os.environ,
+            EXTRACTION_API_URL=f"{stub_url}/extract",
+            EXTRACTION_TOKEN_URL=f"{stub_url}/token",
+            EXTRACTION_CACHE_DIR=os.path.join(self.work_dir, 'cache'),
+            EXTRACTION_MANIFEST_PATH=os.path.join(self.work_dir, 'manifest.sqlite3'),
+            EXTRACTION_INDEX_PATH=os.path.join(self.work_dir, 'index.sqlite3'),
+            EXTRACTION_SPILL_DIR=os.path.join(self.work_dir, 'sessions'),
+            EXTRACTION_SPOOL_DIR=os.path.join(self.work_dir, 'uploads')
+        )
+        self.log = open(os.path.join(self.work_dir, 'server.log'), 'wb')
+        self.process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+                '--server.headless', 'true',
+                '--server.address', '127.0.0.1',
+                '--server.port', str(self.port),
+                '--server.enableXsrfProtection', 'false',
+                '--server.fileWatcherType', 'none',
+                '--browser.gatherUsageStats', 'false'
+            ],
+            cwd=ROOT_DIR, env=env, stdout=self.log, stderr=subprocess.STDOUT
+        )
+        self._wait_healthy()
+
+    def _wait_healthy(self):
+        deadline = time.time() + SERVER_START_TIMEOUT
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with {self.process.returncode}, see {self.log.name}")
+            try:
+                if requests.get(f"{self.url}/_stcore/health", timeout=1).ok:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"Server did not become healthy in {SERVER_START_TIMEOUT}s, see {self.log.name}")
+
+    def close(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class ProcessSampler:
+    """Samples CPU time and RSS of a process from /proc while a level runs"""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='process-sampler', daemon=True)
+
+    def read(self):
+        """(wall seconds, CPU seconds, RSS bytes) of the process now"""
+        with open(f"/proc/{self.pid}/stat") as f:
+            # Fields after the command name, which may itself contain spaces
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open(f"/proc/{self.pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        return time.perf_counter(), cpu_seconds, resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.samples.append(self.read())
+            except OSError:
+                return
+
+    def __enter__(self):
+        self.samples.append(self.read())
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.samples.append(self.read())
+        except OSError:
+            pass
+
+    def summary(self):
+        """Average and peak CPU percent (100 = one core) and RSS over the sampled period"""
+        first, last = self.samples[0], self.samples[-1]
+        cpu = [
+            100 * (b[1] - a[1]) / (b[0] - a[0])
+            for a, b in zip(self.samples, self.samples[1:]) if b[0] > a[0]
+        ]
+        rss = [s[2] for s in self.samples]
+        return {
+            'cpu_percent': 100 * (last[1] - first[1]) / max(last[0] - first[0], 1e-9),
+            'peak_cpu_percent': max(cpu, default=0.0),
+            'rss_mb': rss[-1] / 2**20,
+            'peak_rss_mb': max(rss) / 2**20
+        }
+
+
+class SimulatedSession:
+    """
+    One browser session: keeps the widget states and rendered elements the way the
+    frontend does and records the latency of every rerun it sends
+    """
+
+    def __init__(self, server_url, index, think_seconds):
+        self.server_url = server_url
+        self.index = index
+        self.username = f"load{index:03d}@example.com"
+        self.think_seconds = think_seconds
+        self.session_id = None
+        self.page_script_hash = ''
+        # Widget ID -> WidgetState sent with every rerun, like the browser's widget state manager
+        self.widgets = {}
+        # Delta path -> (fragment ID, Element) of the elements currently shown
+        self.elements = {}
+        # Fragment ID -> seconds between the reruns requested with run_every
+        self.auto_reruns = {}
+        # (step, 'app' or 'fragment', seconds) of every rerun
+        self.reruns = []
+        # (step, seconds) of every user-visible step, including the polling it waited for
+        self.steps = []
+        self.exceptions = []
+        self.error = None
+        self.flows = 0
+        self._step = 'load'
+        self._finished = None
+        self._file_urls = {}
+        self._ws = None
+
+    async def run(self, cycles, start_delay):
+        await asyncio.sleep(start_delay)
+        uri = self.server_url.replace('http://', 'ws://') + '/_stcore/stream'
+        try:
+            async with connect(uri, subprotocols=['streamlit'], max_size=None) as ws:
+                self._ws = ws
+                reader = asyncio.create_task(self._read())
+                try:
+                    await self.step('load', self.rerun)
+                    await self.login()
+                    for cycle in range(cycles):
+                        await self.single_extraction(cycle)
+                        await self.drive_extraction()
+                    await self.step('logout', self.click, 'button', '🚪 Logout')
+                finally:
+                    reader.cancel()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+    async def _read(self):
+        async for data in self._ws:
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            self._handle(msg)
+
+    def _handle(self, msg):
+        kind = msg.WhichOneof('type')
+        if kind == 'new_session':
+            self.session_id = msg.new_session.initialize.session_id
+            self.page_script_hash = msg.new_session.page_script_hash
+            fragment_ids = set(msg.new_session.fragment_ids_this_run)
+            if fragment_ids:
+                self.elements = {
+                    path: shown for path, shown in self.elements.items() if shown[0] not in fragment_ids
+                }
+            else:
+                # A full run redraws the page and registers its fragment polling again
+                self.elements = {}
+                self.auto_reruns = {}
+        elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+            element = msg.delta.new_element
+            self.elements[tuple(msg.metadata.delta_path)] = (msg.delta.fragment_id, element)
+            if element.WhichOneof('type') == 'exception':
+                self.exceptions.append(element.exception.message)
+        elif kind == 'auto_rerun':
+            self.auto_reruns[msg.auto_rerun.fragment_id] = msg.auto_rerun.interval
+        elif kind == 'stop_auto_rerun':
+            for fragment_id in msg.stop_auto_rerun.fragment_ids:
+                self.auto_reruns.pop(fragment_id, None)
+        elif kind == 'file_urls_response':
+            future = self._file_urls.pop(msg.file_urls_response.response_id, None)
+            if future is not None and not future.done():
+                future.set_result(msg.file_urls_response)
+        elif kind == 'script_finished' and msg.script_finished in TERMINAL_STATUSES:
+            if self._finished is not None and not self._finished.done():
+                self._finished.set_result(msg.script_finished)
+
+    def find(self, kind, label):
+        """The first shown widget of a kind with the label, e.g. the login form's Email rather than the register form's"""
+        for _, element in self.elements.values():
+            if element.WhichOneof('type') == kind and getattr(element, kind).label == label:
+                return getattr(element, kind)
+        return None
+
+    def shows(self, kind, text, enabled=False):
+        """Whether an element of the kind whose label or body contains text is shown (and enabled)"""
+        for _, element in self.elements.values():
+            if element.WhichOneof('type') != kind:
+                continue
+            proto = getattr(element, kind)
+            content = getattr(proto, 'label', '') or getattr(proto, 'body', '')
+            if text in content and not (enabled and proto.disabled):
+                return True
+        return False
+
+    def require(self, kind, label):
+        widget = self.find(kind, label)
+        if widget is None:
+            raise RuntimeError(f"No {kind} '{label}' on the page")
+        return widget
+
+    async def rerun(self, triggers=(), fragment_id=''):
+        """Send a rerun with the current widget states plus one-shot triggers and wait until it finishes"""
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.page_script_hash = self.page_script_hash
+        client_state.widget_states.widgets.extend(list(self.widgets.values()) + list(triggers))
+        if fragment_id:
+            client_state.fragment_id = fragment_id
+            client_state.is_auto_rerun = True
+        self._finished = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._finished, STEP_TIMEOUT)
+        self.reruns.append((self._step, 'fragment' if fragment_id else 'app', time.perf_counter() - started))
+        if not fragment_id:
+            # Forget widgets that are no longer shown, as the browser does
+            shown = {getattr(element, element.WhichOneof('type')).id for _, element in self.elements.values()
+                     if 'id' in getattr(element, element.WhichOneof('type')).DESCRIPTOR.fields_by_name}
+            self.widgets = {widget_id: state for widget_id, state in self.widgets.items() if widget_id in shown}
+
+    async def click(self, kind, label):
+        await self.rerun([WidgetState(id=self.require(kind, label).id, trigger_value=True)])
+
+    async def step(self, name, action, *args):
+        """Run one user action as a named step, after the user's think time"""
+        self._step = name
+        if self.think_seconds and name != 'load':
+            await asyncio.sleep(random.uniform(0.5, 1.5) * self.think_seconds)
+        started = time.perf_counter()
+        await action(*args)
+        self.steps.append((name, time.perf_counter() - started))
+        return started
+
+    async def wait_for(self, name, predicate, started):
+        """Follow the page's fragment polling until predicate() holds; the step counts from started"""
+        self._step = name
+        while not predicate():
+            if time.perf_counter() - started > STEP_TIMEOUT:
+                raise TimeoutError(f"{name} did not finish in {STEP_TIMEOUT}s")
+            if not self.auto_reruns:
+                raise RuntimeError(f"{name}: the page stopped polling before it finished ({self.exceptions[-1:]})")
+            fragment_id, interval = next(iter(self.auto_reruns.items()))
+            await asyncio.sleep(interval)
+            await self.rerun(fragment_id=fragment_id)
+        self.steps.append((name, time.perf_counter() - started))
+
+    async def login(self):
+        async def submit():
+            for label, value in (('Email', self.username), ('Password', 'load-test')):
+                widget_id = self.require('text_input', label).id
+                self.widgets[widget_id] = WidgetState(id=widget_id, string_value=value)
+            await self.click('button', 'Login')
+        await self.step('login', submit)
+        if self.find('button', '🚪 Logout') is None:
+            raise RuntimeError("Login did not show the app")
+
+    async def single_extraction(self, cycle):
+        """Upload a PDF no other session uploads, extract it and wait for the first table and the workbook"""
+        async def upload():
+            name = f"load_{self.index:03d}_{cycle:03d}.pdf"
+            data = dummy_pdf_bytes(PDF_PAGES, f"Load test {self.index} {cycle} {uuid.uuid4().hex}")
+            uploader_id = self.require('file_uploader', 'Upload an order form').id
+            request = BackMsg()
+            request.file_urls_request.request_id = uuid.uuid4().hex
+            request.file_urls_request.session_id = self.session_id
+            request.file_urls_request.file_names.append(name)
+            future = asyncio.get_running_loop().create_future()
+            self._file_urls[request.file_urls_request.request_id] = future
+            await self._ws.send(request.SerializeToString())
+            file_urls = (await asyncio.wait_for(future, STEP_TIMEOUT)).file_urls[0]
+            response = await asyncio.to_thread(
+                requests.put, self.server_url + file_urls.upload_url,
+                files={'file': (name, data, 'application/pdf')}, timeout=STEP_TIMEOUT
+            )
+            response.raise_for_status()
+            state = FileUploaderState()
+            info = state.uploaded_file_info.add()
+            info.CopyFrom(UploadedFileInfo(name=name, size=len(data), file_id=file_urls.file_id))
+            info.file_urls.CopyFrom(file_urls)
+            self.widgets[uploader_id] = WidgetState(id=uploader_id, file_uploader_state_value=state)
+            await self.rerun()
+
+        await self.step('single_upload', upload)
+        started = await self.step('single_extract', self.click, 'button', '🔄 Extract')
+        await self.wait_for(
+            'single_first_table', lambda: self.shows('alert', 'Extraction completed successfully'), started
+        )
+        await self.wait_for(
+            'single_workbook', lambda: self.shows('download_button', 'Download Result', enabled=True), started
+        )
+        self.flows += 1
+
+    async def drive_extraction(self):
+        """Connect Drive, pick the folder, extract it and disconnect again"""
+        async def select():
+            widget_id = self.require('selectbox', 'Choose a folder:').id
+            self.widgets[widget_id] = WidgetState(id=widget_id, string_value=DRIVE_FOLDER)
+            await self.rerun()
+
+        await self.step('drive_connect', self.click, 'button', '🔗 Connect to Google Drive')
+        await self.step('drive_select', select)
+        if self.find('button', 'Start over') is not None:
+            # Files checkpointed by an earlier cycle would be skipped otherwise
+            await self.step('drive_start_over', self.click, 'button', 'Start over')
+        await self.step('drive_extract', self.click, 'button', '🚀 Start Google Drive Extraction')
+        if not self.shows('alert', 'Successfully extracted'):
+            raise RuntimeError(f"Drive extraction did not succeed ({self.exceptions[-1:]})")
+        await self.step('drive_disconnect', self.click, 'button', '🔄 Disconnect Google Drive')
+        self.flows += 1
+
+
+async def drive_sessions(server_url, session_count, cycles, think_seconds, ramp_seconds):
+    sessions = [SimulatedSession(server_url, index, think_seconds) for index in range(session_count)]
+    await asyncio.gather(*(
+        session.run(cycles, ramp_seconds * index / session_count) for index, session in enumerate(sessions)
+    ))
+    return sessions
+
+
+def run_level(stub, session_count, args):
+    """Run session_count concurrent sessions against a fresh server and summarize them"""
+    server = AppServer(stub.url)
+    stub.reset()
+    try:
+        with ProcessSampler(server.process.pid) as sampler:
+            started = time.perf_counter()
+            sessions = asyncio.run(drive_sessions(
+                server.url, session_count, args.cycles, args.think_ms / 1000, args.ramp_seconds
+            ))
+            wall_seconds = time.perf_counter() - started
+    finally:
+        server.close()
+
+    reruns = [r for s in sessions for r in s.reruns]
+    app_reruns = [seconds for _, kind, seconds in reruns if kind == 'app']
+    by_step = {}
+    for step, kind, seconds in reruns:
+        if kind == 'app':
+            by_step.setdefault(step, []).append(seconds)
+    flow_steps = {}
+    for s in sessions:
+        for step, seconds in s.steps:
+            flow_steps.setdefault(step, []).append(seconds)
+    session_p95 = [percentiles([seconds for _, _, seconds in s.reruns])['p95'] for s in sessions if s.reruns]
+    flows = sum(s.flows for s in sessions)
+    level = {
+        'sessions': session_count,
+        'flows': flows,
+        'flows_per_second': flows / wall_seconds,
+        'wall_seconds': wall_seconds,
+        'errors': [f"session {s.index}: {s.error}" for s in sessions if s.error],
+        'exceptions': sum(len(s.exceptions) for s in sessions),
+        'stub_requests': stub.requests,
+        'reruns': percentiles(app_reruns),
+        'fragment_reruns': percentiles([seconds for _, kind, seconds in reruns if kind == 'fragment']),
+        'session_p95': {'median': statistics.median(session_p95), 'max': max(session_p95)} if session_p95 else None,
+        'rerun_steps': {step: percentiles(values) for step, values in by_step.items()},
+        'flow_steps': {step: percentiles(values) for step, values in flow_steps.items()},
+        'server': sampler.summary()
+    }
+    print_level(level)
+    return level
+
+
+def print_level(level):
+    reruns = level['reruns'] or {'p50': 0, 'p95': 0, 'p99': 0}
+    server = level['server']
+    print(
+        f"{level['sessions']:>4} sessions  {level['flows_per_second']:6.2f} flows/s  "
+        f"rerun p50 {reruns['p50'] * 1000:8.1f} ms  p95 {reruns['p95'] * 1000:8.1f} ms  "
+        f"p99 {reruns['p99'] * 1000:8.1f} ms  CPU {server['cpu_percent']:5.0f}% (peak {server['peak_cpu_percent']:.0f}%)  "
+        f"RSS {server['peak_rss_mb']:7.1f} MB  errors {len(level['errors'])}"
+    )
+    for error in level['errors']:
+        print(f"      {error}")
+
+
+def find_knee(levels, factor):
+    """
+    First level whose per-step p95 rerun latency is more than factor times the
+    single-session p95 (at least KNEE_FLOOR_SECONDS) or that had errors, and the
+    throughput of the level before it
+    """
+    baseline = levels[0]['rerun_steps']
+    for previous, level in zip([None] + levels, levels):
+        slowdowns = {
+            step: stats['p95'] / max(baseline[step]['p95'], KNEE_FLOOR_SECONDS)
+            for step, stats in level['rerun_steps'].items() if step in baseline
+        }
+        level['p95_slowdown'] = max(slowdowns.values(), default=1.0)
+        if level['errors'] or level['p95_slowdown'] > factor:
+            return {
+                'sessions': level['sessions'],
+                'p95_slowdown': level['p95_slowdown'],
+                'worst_step': max(slowdowns, key=slowdowns.get) if slowdowns else None,
+                'sustainable_sessions': previous['sessions'] if previous else None,
+                'sustainable_flows_per_second': previous['flows_per_second'] if previous else None
+            }
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSION_COUNTS,
+                        help='concurrent session counts to ramp through; the first is the baseline')
+    parser.add_argument('--cycles', type=int, default=2, help='single and Drive extraction cycles per session')
+    parser.add_argument('--latency-ms', type=float, default=1000, help='stub extraction endpoint latency')
+    parser.add_argument('--jitter-ms', type=float, default=200, help='uniform +/- jitter on the endpoint latency')
+    parser.add_argument('--rows', type=int, default=200, help='rows per table in the stub response')
+    parser.add_argument('--think-ms', type=float, default=500, help='average pause between user actions')
+    parser.add_argument('--ramp-seconds', type=float, default=5, help='sessions of a level start spread over this')
+    parser.add_argument('--knee-factor', type=float, default=2.0,
+                        help='p95 slowdown against the baseline that counts as degraded')
+    parser.add_argument('--output', help='results JSON path (default: benchmarks/results/load_<timestamp>.json)')
+    args = parser.parse_args()
+
+    stub = StubEndpoint(args.rows, args.latency_ms, args.jitter_ms)
+    levels = []
+    try:
+        for session_count in args.sessions:
+            levels.append(run_level(stub, session_count, args))
+    finally:
+        stub.close()
+
+    knee = find_knee(levels, args.knee_factor)
+    if knee is None:
+        print(f"\nNo knee up to {levels[-1]['sessions']} sessions "
+              f"({levels[-1]['flows_per_second']:.2f} flows/s, p95 within {args.knee_factor}x of one session)")
+    elif knee['sustainable_sessions'] is None:
+        print(f"\nTail latency is degraded at {knee['sessions']} sessions already")
+    else:
+        print(
+            f"\nTail latency degrades at {knee['sessions']} sessions ({knee['p95_slowdown']:.1f}x p95 in "
+            f"{knee['worst_step']}); sustainable: {knee['sustainable_sessions']} sessions, "
+            f"{knee['sustainable_flows_per_second']:.2f} flows/s"
+        )
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'config': vars(args),
+            'levels': levels,
+            'knee': knee
+        }, f, indent=2)
+    print(f"Saved {len(levels)} levels to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+# contract_index.py
+"""
+Local searchable index of historical extraction results
+Contracts from single extractions and Drive batches are kept in SQLite with
+B-tree indexes on date, value and status and an FTS5 index over party names,
+contract types and file names
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    'EXTRACTION_INDEX_PATH',
+    os.path.join(os.path.expanduser('~'), '.cache', 'trulioo_contract_extractor', 'contract_index.sqlite3')
+)
+# Rows returned by a search when no limit is given
+DEFAULT_SEARCH_LIMIT = 500
+
+# Columns of the contracts table, in insert order
+CONTRACT_FIELDS = [
+    'owner', 'source', 'document', 'document_key', 'contract_id', 'party_1', 'party_2',
+    'contract_type', 'status', 'contract_date', 'end_date', 'contract_value'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    source TEXT NOT NULL,
+    document TEXT NOT NULL,
+    document_key TEXT NOT NULL,
+    contract_id TEXT NOT NULL DEFAULT '',
+    party_1 TEXT,
+    party_2 TEXT,
+    contract_type TEXT,
+    status TEXT,
+    contract_date TEXT,
+    end_date TEXT,
+    contract_value REAL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (owner, document_key, contract_id)
+);
+CREATE INDEX IF NOT EXISTS contracts_owner_date ON contracts (owner, contract_date);
+CREATE INDEX IF NOT EXISTS contracts_owner_value ON contracts (owner, contract_value);
+CREATE INDEX IF NOT EXISTS contracts_owner_status ON contracts (owner, status);
+CREATE VIRTUAL TABLE IF NOT EXISTS contracts_fts USING fts5(
+    party_1, party_2, contract_type, document,
+    content='contracts', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS contracts_ai AFTER INSERT ON contracts BEGIN
+    INSERT INTO contracts_fts (rowid, party_1, party_2, contract_type, document)
+    VALUES (new.id, new.party_1, new.party_2, new.contract_type, new.document);
+END;
+CREATE TRIGGER IF NOT EXISTS contracts_ad AFTER DELETE ON contracts BEGIN
+    INSERT INTO contracts_fts (contracts_fts, rowid, party_1, party_2, contract_type, document)
+    VALUES ('delete', old.id, old.party_1, old.party_2, old.contract_type, old.document);
+END;
+CREATE TRIGGER IF NOT EXISTS contracts_au AFTER UPDATE ON contracts BEGIN
+    INSERT INTO contracts_fts (contracts_fts, rowid, party_1, party_2, contract_type, document)
+    VALUES ('delete', old.id, old.party_1, old.party_2, old.contract_type, old.document);
+    INSERT INTO contracts_fts (rowid, party_1, party_2, contract_type, document)
+    VALUES (new.id, new.party_1, new.party_2, new.contract_type, new.document);
+END;
+"""
+
+SEARCH_COLUMNS = ['document', 'contract_id', 'party_1', 'party_2', 'contract_type', 'status',
+                  'contract_date', 'end_date', 'contract_value', 'source']
+
+
+def parse_money(value):
+    """Numeric value of an amount such as 50000 or '$75,000'; None when it has no number"""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None or pd.isna(value) else float(value)
+    digits = re.sub(r'[^\d.\-]', '', str(value))
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def iso_date(value):
+    """YYYY-MM-DD text of an ISO date string or Timestamp; None when missing or not a date"""
+    if value is None or pd.isna(value):
+        return None
+    if not hasattr(value, 'strftime'):
+        value = pd.to_datetime(str(value), format='ISO8601', errors='coerce')
+        if pd.isna(value):
+            return None
+    return value.strftime('%Y-%m-%d')
+
+
+def fts_query(text):
+    """FTS5 MATCH expression requiring every word of text as a prefix, with operators escaped"""
+    terms = re.findall(r'\w+', text)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def drive_summary_rows(summary, document_key):
+    """Index row for one Drive batch summary record"""
+    return [{
+        'source': 'drive',
+        'document': summary['filename'],
+        'document_key': document_key,
+        'contract_id': '',
+        'party_1': summary.get('party_1'),
+        'party_2': summary.get('party_2'),
+        'contract_type': summary.get('contract_type'),
+        'status': summary.get('status'),
+        'contract_date': iso_date(summary.get('contract_date')),
+        'end_date': None,
+        'contract_value': parse_money(summary.get('contract_value'))
+    }]
+
+
+def contract_table_rows(df, document, document_key):
+    """Index rows for the contract table of one extraction result"""
+    rows = []
+    for record in df.to_dict('records'):
+        rows.append({
+            'source': 'upload',
+            'document': document,
+            'document_key': document_key,
+            'contract_id': str(record.get('Contract ID') or ''),
+            'party_1': record.get('Client Name'),
+            'party_2': None,
+            'contract_type': record.get('Contract Type'),
+            'status': record.get('Status'),
+            'contract_date': iso_date(record.get('Start Date')),
+            'end_date': iso_date(record.get('End Date')),
+            'contract_value': parse_money(record.get('Contract Value'))
+        })
+    return rows
+
+
+class ContractIndex:
+    """SQLite index of extracted contracts, scoped per user"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def add(self, owner, rows):
+        """
+        Insert or refresh contract rows; a document's contract is indexed once per user
+        document_key is the SHA-256 of the file, so rows from an earlier upload or Drive
+        batch of the same document are replaced instead of listed twice
+        """
+        now = time.time()
+        document_keys = sorted({row['document_key'] for row in rows})
+        params = [tuple([owner] + [row[f] for f in CONTRACT_FIELDS[1:]] + [now]) for row in rows]
+        columns = ', '.join(CONTRACT_FIELDS + ['indexed_at'])
+        placeholders = ', '.join('?' * (len(CONTRACT_FIELDS) + 1))
+        updates = ', '.join(f"{f} = excluded.{f}" for f in CONTRACT_FIELDS[1:] + ['indexed_at'])
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'DELETE FROM contracts WHERE owner = ? AND document_key = ?',
+                [(owner, key) for key in document_keys]
+            )
+            self._conn.executemany(
+                f"INSERT INTO contracts ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT (owner, document_key, contract_id) DO UPDATE SET {updates}",
+                params
+            )
+
+    def search(self, owner, text=None, statuses=None, date_from=None, date_to=None,
+               min_value=None, max_value=None, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Contracts of owner matching every given filter, newest first
+        text matches party names, contract type and file name by word prefix
+        Returns (DataFrame of at most limit rows, total number of matches)
+        """
+        clauses = ['c.owner = ?']
+        params = [owner]
+        match = fts_query(text) if text else ''
+        if match:
+            # The FTS lookup runs once as a subquery instead of once per candidate row
+            clauses.append('c.id IN (SELECT rowid FROM contracts_fts WHERE contracts_fts MATCH ?)')
+            params.append(match)
+        if statuses:
+            clauses.append(f"c.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if date_from:
+            clauses.append('c.contract_date >= ?')
+            params.append(str(date_from))
+        if date_to:
+            clauses.append('c.contract_date <= ?')
+            params.append(str(date_to))
+        if min_value is not None:
+            clauses.append('c.contract_value >= ?')
+            params.append(min_value)
+        if max_value is not None:
+            clauses.append('c.contract_value <= ?')
+            params.append(max_value)
+        where = ' AND '.join(clauses)
+        columns = ', '.join(f"c.{c}" for c in SEARCH_COLUMNS)
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM contracts c WHERE {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM contracts c WHERE {where} "
+                f"ORDER BY c.contract_date DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        return pd.DataFrame(rows, columns=SEARCH_COLUMNS), total
+
+    def statuses(self, owner):
+        """Distinct contract statuses indexed for owner"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT status FROM contracts WHERE owner = ? AND status IS NOT NULL ORDER BY status",
+                (owner,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def count(self, owner):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM contracts WHERE owner = ?", (owner,)).fetchone()[0]
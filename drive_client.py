@@ -0,0 +1,59 @@
+# drive_client.py
+"""
+Minimal Google Drive v3 REST client
+Only covers the listing, change feed and download calls the extractor needs;
+base_url can point at a local fake Drive server for testing
+"""
+
+import requests
+
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+PDF_MIME_TYPE = "application/pdf"
+# Drive caps pageSize at 1000 for files.list and changes.list
+MAX_PAGE_SIZE = 1000
+FILE_FIELDS = "id, name, size, modifiedTime, parents, md5Checksum, mimeType, trashed"
+REQUEST_TIMEOUT = 30
+
+
+class DriveClient:
+    """Authenticated Drive v3 client sharing one HTTP session"""
+
+    def __init__(self, access_token, base_url=DRIVE_API_URL, session=None, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers['Authorization'] = f"Bearer {access_token}"
+
+    def _get(self, path, params=None, stream=False):
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout, stream=stream)
+        response.raise_for_status()
+        return response
+
+    def list_files(self, query, page_token=None, page_size=MAX_PAGE_SIZE):
+        """One page of files.list; returns the raw JSON with files and nextPageToken"""
+        params = {
+            'q': query,
+            'pageSize': page_size,
+            'fields': f"nextPageToken, files({FILE_FIELDS})"
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        return self._get('/files', params).json()
+
+    def get_start_page_token(self):
+        """Token marking the current position of the change feed"""
+        return self._get('/changes/startPageToken').json()['startPageToken']
+
+    def list_changes(self, page_token, page_size=MAX_PAGE_SIZE):
+        """One page of changes.list; returns changes plus nextPageToken or newStartPageToken"""
+        params = {
+            'pageToken': page_token,
+            'pageSize': page_size,
+            'fields': f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}))"
+        }
+        return self._get('/changes', params).json()
+
+    def download(self, file_id):
+        """Download a file's content as bytes"""
+        return self._get(f"/files/{file_id}", {'alt': 'media'}).content
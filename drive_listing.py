@@ -0,0 +1,169 @@
+# drive_listing.py
+"""
+Cached Google Drive listing layer
+Keeps folder trees and file metadata per user with a TTL and refreshes them
+from the Drive change feed instead of re-listing whole folders
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+from drive_client import FOLDER_MIME_TYPE, PDF_MIME_TYPE
+
+# Listings younger than this are served without contacting Drive
+DEFAULT_LISTING_TTL = 300
+# modifiedTime windows fetched concurrently for a cold folder listing
+DEFAULT_LISTING_PARTITIONS = 4
+# Lower bound of the first modifiedTime window
+DRIVE_EPOCH = datetime(2006, 1, 1, tzinfo=timezone.utc)
+
+FOLDERS_QUERY = f"mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+
+
+def folder_pdfs_query(folder_id):
+    """files.list query for the PDFs directly inside a folder"""
+    return f"'{folder_id}' in parents and mimeType='{PDF_MIME_TYPE}' and trashed=false"
+
+
+def modified_time_windows(partitions, start=DRIVE_EPOCH, end=None):
+    """
+    Split time into contiguous modifiedTime query clauses
+    The first and last windows are open-ended so no file falls outside them
+    """
+    end = end or datetime.now(timezone.utc)
+    if partitions <= 1:
+        return [None]
+    step = (end - start) / partitions
+    bounds = [(start + step * i).strftime('%Y-%m-%dT%H:%M:%S') for i in range(1, partitions)]
+    clauses = [f"modifiedTime < '{bounds[0]}'"]
+    for lower, upper in zip(bounds, bounds[1:]):
+        clauses.append(f"modifiedTime >= '{lower}' and modifiedTime < '{upper}'")
+    clauses.append(f"modifiedTime >= '{bounds[-1]}'")
+    return clauses
+
+
+def list_all(client, query):
+    """Follow nextPageToken until the listing is exhausted"""
+    files = []
+    page_token = None
+    while True:
+        page = client.list_files(query, page_token=page_token)
+        files.extend(page.get('files', []))
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            return files
+
+
+def list_partitioned(client, query, partitions=DEFAULT_LISTING_PARTITIONS):
+    """List a query as several modifiedTime windows paged concurrently, merged by file ID"""
+    clauses = modified_time_windows(partitions)
+    queries = [f"{query} and {clause}" if clause else query for clause in clauses]
+    if len(queries) == 1:
+        return list_all(client, query)
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        pages = list(executor.map(lambda q: list_all(client, q), queries))
+    merged = {}
+    for files in pages:
+        for file in files:
+            merged[file['id']] = file
+    return list(merged.values())
+
+
+class DriveListingCache:
+    """Per-user cache of Drive folders and folder PDF listings"""
+
+    def __init__(self, ttl_seconds=DEFAULT_LISTING_TTL, partitions=DEFAULT_LISTING_PARTITIONS):
+        self.ttl_seconds = ttl_seconds
+        self.partitions = partitions
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def _user_state(self, user):
+        with self._lock:
+            if user not in self._users:
+                self._users[user] = {
+                    'lock': threading.Lock(),
+                    'folders': None,
+                    'folders_at': 0,
+                    'listings': {},
+                    'change_token': None,
+                    'synced_at': 0
+                }
+            return self._users[user]
+
+    def _is_fresh(self, fetched_at):
+        return time.time() - fetched_at < self.ttl_seconds
+
+    def get_folders(self, user, client):
+        """All folders visible to the user, sorted by name"""
+        state = self._user_state(user)
+        with state['lock']:
+            if state['folders'] is None or not self._is_fresh(state['folders_at']):
+                state['folders'] = sorted(list_all(client, FOLDERS_QUERY), key=lambda f: f['name'])
+                state['folders_at'] = time.time()
+            return list(state['folders'])
+
+    def get_folder_files(self, user, client, folder_id):
+        """PDFs in a folder, sorted by name; stale listings are refreshed from the change feed"""
+        state = self._user_state(user)
+        with state['lock']:
+            if folder_id not in state['listings']:
+                self._load_folder(state, client, folder_id)
+            elif not self._is_fresh(state['synced_at']):
+                self._sync_changes(state, client, folder_id)
+            files = state['listings'][folder_id].values()
+            return sorted(files, key=lambda f: f['name'])
+
+    def invalidate(self, user):
+        """Forget everything cached for a user, e.g. on disconnect"""
+        with self._lock:
+            self._users.pop(user, None)
+
+    def _load_folder(self, state, client, folder_id):
+        # Take the change token before listing so nothing changed meanwhile is missed
+        if state['change_token'] is None:
+            state['change_token'] = client.get_start_page_token()
+            state['synced_at'] = time.time()
+        files = list_partitioned(client, folder_pdfs_query(folder_id), self.partitions)
+        state['listings'][folder_id] = {f['id']: f for f in files}
+
+    def _sync_changes(self, state, client, folder_id):
+        token = state['change_token']
+        try:
+            while True:
+                page = client.list_changes(token)
+                for change in page.get('changes', []):
+                    self._apply_change(state, change)
+                if 'newStartPageToken' in page:
+                    token = page['newStartPageToken']
+                    break
+                token = page['nextPageToken']
+        except requests.HTTPError:
+            # Expired or invalid token: fall back to a full listing of this folder
+            state['listings'] = {}
+            state['change_token'] = None
+            self._load_folder(state, client, folder_id)
+            return
+        state['change_token'] = token
+        state['synced_at'] = time.time()
+
+    def _apply_change(self, state, change):
+        file = change.get('file') or {}
+        removed = change.get('removed') or file.get('trashed', False)
+        if file.get('mimeType') == FOLDER_MIME_TYPE:
+            # A folder was added, renamed or removed; reload the tree next time
+            state['folders'] = None
+        for folder_id, listing in state['listings'].items():
+            in_folder = (
+                not removed
+                and file.get('mimeType') == PDF_MIME_TYPE
+                and folder_id in file.get('parents', [])
+            )
+            if in_folder:
+                listing[change['fileId']] = file
+            else:
+                listing.pop(change['fileId'], None)
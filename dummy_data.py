@@ -4,13 +4,91 @@ Dummy data functions for frontend testing
 Contains all test data generators for the Trulioo Contract Extractor
 """
 
+import hashlib
+import numpy as np
 import pandas as pd
+import re
 import time
+from contextlib import nullcontext
 from io import BytesIO
 
+from extraction_result import table_block
+from pdf_pages import count_pages, extract_page_texts
 
-def create_dummy_contract_data():
-    """Create dummy contract data for frontend testing"""
+# Value pools for the scalable synthetic generators (rows=... / n_files=...)
+SYNTHETIC_CLIENTS = [
+    'ABC Corporation', 'XYZ Industries Ltd', 'Global Tech Solutions', 'TechCorp Partners',
+    'InnovateAI', 'Northwind Traders', 'Contoso Bank', 'Fabrikam Payments'
+]
+SYNTHETIC_CONTRACT_TYPES = ['Service Agreement', 'Licensing Deal', 'Partnership Agreement']
+SYNTHETIC_SERVICES = [
+    'Premium Identity Verification', 'Standard Background Check', 'Enhanced Due Diligence',
+    'Basic Verification', 'Enhanced Check', 'Document Scan', 'Real-time Monitoring', 'AML Screening'
+]
+SYNTHETIC_LINE_ITEMS = [
+    ('Identity Verification - Basic', 'Verification'),
+    ('Background Check - Standard', 'Screening'),
+    ('Document Verification', 'Document'),
+    ('AML Screening', 'Compliance')
+]
+SYNTHETIC_TIERS = ['Standard', 'Premium', 'Enterprise']
+SYNTHETIC_BILLING_CYCLES = ['Monthly', 'Quarterly', 'Annual']
+SYNTHETIC_UNIT_PRICES = np.array([1.99, 2.49, 2.99, 3.49, 3.99, 5.99, 8.99])
+SYNTHETIC_MONTHLY_FEES = np.array([99.99, 199.99, 299.99, 449.99, 999.99])
+# Synthetic dates fall on days counted from this date
+SYNTHETIC_FIRST_DAY = '2022-01-01'
+SYNTHETIC_CALENDAR_DAYS = 2000
+
+
+def _sequential_ids(prefix, count, width=None):
+    """Vectorized identifiers such as CNT-0000042"""
+    if count == 0:
+        return np.array([], dtype=str)
+    width = width or max(3, len(str(count)))
+    numbers = np.arange(1, count + 1).astype(f'U{width}')
+    return np.char.add(prefix, np.char.zfill(numbers, width))
+
+
+def _pick(rng, values, count, p=None):
+    """Random categorical column drawn from a small value pool"""
+    return pd.Categorical.from_codes(rng.choice(len(values), size=count, p=p), categories=values)
+
+
+def _records(df):
+    """Rows of a synthetic frame as dicts; unlike to_dict('records') categoricals are expanded once per column"""
+    columns = list(df.columns)
+    values = [np.asarray(df[column], dtype=object).tolist() for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _calendar():
+    """'YYYY-MM-DD' strings for the synthetic date range"""
+    days = np.datetime64(SYNTHETIC_FIRST_DAY) + np.arange(SYNTHETIC_CALENDAR_DAYS)
+    return np.datetime_as_string(days, unit='D')
+
+
+def _dates(day_offsets):
+    """Date strings for day offsets, stored as a categorical over the calendar"""
+    return pd.Categorical.from_codes(day_offsets, categories=_calendar())
+
+
+def create_dummy_contract_data(rows=None, seed=0):
+    """
+    Create dummy contract data for frontend testing
+    rows=None gives the fixed sample; otherwise rows seeded synthetic contracts
+    """
+    if rows is not None:
+        rng = np.random.default_rng(seed)
+        start = rng.integers(0, 730, rows)
+        return pd.DataFrame({
+            'Contract ID': _sequential_ids('CNT-', rows),
+            'Client Name': _pick(rng, SYNTHETIC_CLIENTS, rows),
+            'Contract Value': rng.integers(10, 500, rows) * 1000,
+            'Start Date': _dates(start),
+            'End Date': _dates(start + rng.integers(180, 1096, rows)),
+            'Status': _pick(rng, ['Active', 'Pending', 'Expired'], rows, p=[0.7, 0.2, 0.1]),
+            'Contract Type': _pick(rng, SYNTHETIC_CONTRACT_TYPES, rows)
+        })
     return pd.DataFrame({
         'Contract ID': ['CNT-001', 'CNT-002', 'CNT-003'],
         'Client Name': ['ABC Corporation', 'XYZ Industries Ltd', 'Global Tech Solutions'],
@@ -22,8 +100,21 @@ def create_dummy_contract_data():
     })
 
 
-def create_dummy_subscription_data():
-    """Create dummy subscription data for frontend testing"""
+def create_dummy_subscription_data(rows=None, seed=0):
+    """
+    Create dummy subscription data for frontend testing
+    rows=None gives the fixed sample; otherwise rows seeded synthetic subscriptions
+    """
+    if rows is not None:
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({
+            'Subscription ID': _sequential_ids('SUB-', rows),
+            'Service Type': _pick(rng, SYNTHETIC_SERVICES, rows),
+            'Monthly Fee': rng.choice(SYNTHETIC_MONTHLY_FEES, rows),
+            'Status': _pick(rng, ['Active', 'Trial', 'Cancelled'], rows, p=[0.8, 0.15, 0.05]),
+            'Start Date': _dates(rng.integers(0, 1095, rows)),
+            'Billing Cycle': _pick(rng, SYNTHETIC_BILLING_CYCLES, rows)
+        })
     return pd.DataFrame({
         'Subscription ID': ['SUB-001', 'SUB-002', 'SUB-003'],
         'Service Type': ['Premium Identity Verification', 'Standard Background Check', 'Enhanced Due Diligence'],
@@ -34,8 +125,24 @@ def create_dummy_subscription_data():
     })
 
 
-def create_dummy_line_item_data():
-    """Create dummy line item data"""
+def create_dummy_line_item_data(rows=None, seed=0):
+    """
+    Create dummy line item data
+    rows=None gives the fixed sample; otherwise rows seeded synthetic line items
+    """
+    if rows is not None:
+        rng = np.random.default_rng(seed)
+        item = rng.integers(0, len(SYNTHETIC_LINE_ITEMS), rows)
+        quantity = rng.integers(1, 1000, rows)
+        unit_price = rng.choice(SYNTHETIC_UNIT_PRICES, rows)
+        return pd.DataFrame({
+            'Line Item ID': _sequential_ids('LI-', rows),
+            'Description': pd.Categorical.from_codes(item, categories=[d for d, _ in SYNTHETIC_LINE_ITEMS]),
+            'Quantity': quantity,
+            'Unit Price': unit_price,
+            'Total Amount': np.round(quantity * unit_price, 2),
+            'Category': pd.Categorical.from_codes(item, categories=[c for _, c in SYNTHETIC_LINE_ITEMS])
+        })
     return pd.DataFrame({
         'Line Item ID': ['LI-001', 'LI-002', 'LI-003', 'LI-004'],
         'Description': ['Identity Verification - Basic', 'Background Check - Standard', 'Document Verification', 'AML Screening'],
@@ -46,8 +153,27 @@ def create_dummy_line_item_data():
     })
 
 
-def create_dummy_consumption_schedule():
-    """Create dummy consumption schedule data"""
+def create_dummy_consumption_schedule(rows=None, seed=0):
+    """
+    Create dummy consumption schedule data
+    rows=None gives the fixed sample; otherwise rows seeded synthetic periods
+    """
+    if rows is not None:
+        rng = np.random.default_rng(seed)
+        quarters = [f"Q{q} {y}" for y in range(2022, 2027) for q in range(1, 5)]
+        allocated = rng.integers(5, 50, rows) * 100
+        used = (allocated * rng.uniform(0.3, 1.0, rows)).astype(np.int64)
+        return pd.DataFrame({
+            'Schedule ID': _sequential_ids('SCH-', rows),
+            'Period': pd.Categorical.from_codes(rng.integers(0, len(quarters), rows), categories=quarters),
+            'Allocated Units': allocated,
+            'Used Units': used,
+            'Remaining Units': allocated - used,
+            'Usage Percentage': pd.Categorical.from_codes(
+                np.rint(used * 100 / allocated).astype(np.int64),
+                categories=[f"{pct}%" for pct in range(101)]
+            )
+        })
     return pd.DataFrame({
         'Schedule ID': ['SCH-001', 'SCH-002', 'SCH-003'],
         'Period': ['Q1 2024', 'Q2 2024', 'Q3 2024'],
@@ -58,8 +184,22 @@ def create_dummy_consumption_schedule():
     })
 
 
-def create_dummy_consumption_rate():
-    """Create dummy consumption rate data"""
+def create_dummy_consumption_rate(rows=None, seed=0):
+    """
+    Create dummy consumption rate data
+    rows=None gives the fixed sample; otherwise rows seeded synthetic rates
+    """
+    if rows is not None:
+        rng = np.random.default_rng(seed)
+        min_volume = rng.choice(np.array([100, 200, 500, 1000]), rows)
+        return pd.DataFrame({
+            'Rate ID': _sequential_ids('RT-', rows),
+            'Service': _pick(rng, SYNTHETIC_SERVICES, rows),
+            'Rate per Unit': rng.choice(SYNTHETIC_UNIT_PRICES, rows),
+            'Tier': _pick(rng, SYNTHETIC_TIERS, rows, p=[0.5, 0.35, 0.15]),
+            'Min Volume': min_volume,
+            'Max Volume': min_volume * 10 - 1
+        })
     return pd.DataFrame({
         'Rate ID': ['RT-001', 'RT-002', 'RT-003', 'RT-004'],
         'Service': ['Basic Verification', 'Enhanced Check', 'Document Scan', 'Real-time Monitoring'],
@@ -92,12 +232,48 @@ def dummy_google_folders():
             'id': 'folder_004',
             'name': 'Service Agreements',
             'parents': ['root']
+        },
+        {
+            'id': DUMMY_LARGE_FOLDER_ID,
+            'name': f'Contract Archive ({DUMMY_LARGE_FOLDER_FILES:,} PDFs)',
+            'parents': ['root']
         }
     ]
 
 
-def dummy_pdf_files():
-    """Return dummy PDF files"""
+def _listing_columns(n_files, seed):
+    """File numbers, names, modifiedTime day offsets and sizes in KiB of a synthetic listing"""
+    rng = np.random.default_rng(seed)
+    numbers = _sequential_ids('', n_files)
+    clients = np.array([f"Contract_{c.replace(' ', '')}_" for c in SYNTHETIC_CLIENTS])
+    names = np.char.add(np.char.add(clients[rng.integers(0, len(clients), n_files)], numbers), '.pdf')
+    days = rng.integers(0, 1095, n_files)
+    kilobytes = rng.integers(200, 5000, n_files)
+    return numbers, names, days, kilobytes
+
+
+def dummy_pdf_listing(n_files, seed=0, id_prefix='pdf_'):
+    """
+    n_files seeded synthetic Drive listings as a DataFrame, built one column at a time
+    Only the IDs and names are distinct per file; sizes and times are categoricals
+    """
+    numbers, names, days, kilobytes = _listing_columns(n_files, seed)
+    return pd.DataFrame({
+        'id': np.char.add(id_prefix, numbers),
+        'name': names,
+        'size': pd.Categorical.from_codes(kilobytes - 200, categories=(np.arange(200, 5000) * 1024).astype(str)),
+        'modifiedTime': pd.Categorical.from_codes(days, categories=np.char.add(_calendar()[:1095], 'T10:00:00Z'))
+    })
+
+
+def dummy_pdf_files(n_files=None, seed=0, id_prefix='pdf_'):
+    """
+    Return dummy PDF files
+    n_files=None gives the fixed five files; otherwise n_files seeded synthetic listings
+    as Drive file records (see dummy_pdf_listing for the same listing as a DataFrame)
+    """
+    if n_files is not None:
+        return _records(dummy_pdf_listing(n_files, seed, id_prefix))
     return [
         {
             'id': 'pdf_001',
@@ -132,8 +308,154 @@ def dummy_pdf_files():
     ]
 
 
-def create_dummy_extraction_results():
-    """Create dummy Google Drive extraction results"""
+def dummy_pdf_bytes(n_pages=1, title="Order Form"):
+    """
+    A valid text PDF with n_pages pages, for exercising real text extraction offline
+    Each page carries the title, its page number and a few lines of order form text
+    """
+    font_id = 3
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once the page object numbers are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    page_ids = []
+    for page in range(1, n_pages + 1):
+        lines = [f"{title} - page {page} of {n_pages}"] + [
+            f"Line {i}: Subscription SUB-{page:04d}-{i} Units {page * 100 + i} Rate 0.{i:02d} USD"
+            for i in range(1, 6)
+        ]
+        text = " T* ".join(f"({line})Tj" for line in lines)
+        content = f"BT /F1 11 Tf 14 TL 72 720 Td {text} ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>"
+
+    output = BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1'))
+    xref_at = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1'))
+    output.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1'))
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode('latin-1'))
+    return output.getvalue()
+
+
+def dummy_download_pdf(pdf):
+    """Return dummy PDF bytes for a Google Drive file"""
+    body = f"%PDF-1.4\n% {pdf['id']} {pdf['name']} {pdf.get('modifiedTime', '')}\n%%EOF\n"
+    return body.encode('utf-8')
+
+
+class DummyDriveClient:
+    """
+    In-memory stand-in for drive_client.DriveClient
+    Serves dummy_google_folders(), the same dummy_pdf_files() in every folder
+    and DUMMY_LARGE_FOLDER_FILES synthetic files in the large folder. Folders in
+    DUMMY_DUPLICATE_FILES also hold renamed copies, and every
+    DUMMY_DUPLICATE_EVERY-th large folder file is a copy of the one before it
+    """
+
+    def __init__(self, page_size=1000):
+        self.page_size = page_size
+        self.calls = 0
+        self._files_by_id = {}
+        # Copy file ID -> ID of the file whose content it has
+        self._sources = {}
+
+    def _folder_files(self, folder_id):
+        if folder_id == DUMMY_LARGE_FOLDER_ID:
+            pdfs = dummy_pdf_files(n_files=DUMMY_LARGE_FOLDER_FILES, id_prefix='bulk_')
+        else:
+            pdfs = dummy_pdf_files()
+        files = [dict(pdf, parents=[folder_id], mimeType='application/pdf') for pdf in pdfs]
+        by_id = {f['id']: f for f in files}
+        for copy_id, copy_name, source_id in DUMMY_DUPLICATE_FILES.get(folder_id, []):
+            files.append(dict(by_id[source_id], id=copy_id, name=copy_name))
+            self._sources[copy_id] = source_id
+        if folder_id == DUMMY_LARGE_FOLDER_ID:
+            for previous, f in zip(files[DUMMY_DUPLICATE_EVERY - 2::DUMMY_DUPLICATE_EVERY],
+                                   files[DUMMY_DUPLICATE_EVERY - 1::DUMMY_DUPLICATE_EVERY]):
+                f['size'] = previous['size']
+                self._sources[f['id']] = previous['id']
+        self._files_by_id.update((f['id'], f) for f in files)
+        for f in files:
+            f['md5Checksum'] = hashlib.md5(self._content(f)).hexdigest()
+        return files
+
+    def _content(self, pdf):
+        source_id = self._sources.get(pdf['id'])
+        return dummy_download_pdf(self._files_by_id[source_id] if source_id else pdf)
+
+    def list_files(self, query, page_token=None, page_size=None):
+        """Dummy files.list supporting the folder, parent and modifiedTime clauses"""
+        self.calls += 1
+        if 'application/vnd.google-apps.folder' in query:
+            files = [dict(f, mimeType='application/vnd.google-apps.folder') for f in dummy_google_folders()]
+        else:
+            folder_id = re.search(r"'([^']+)' in parents", query).group(1)
+            files = self._folder_files(folder_id)
+            for op, bound in re.findall(r"modifiedTime (>=|<) '([^']+)'", query):
+                files = [f for f in files if (f['modifiedTime'][:19] >= bound) == (op == '>=')]
+        start = int(page_token or 0)
+        end = start + (page_size or self.page_size)
+        page = {'files': files[start:end]}
+        if end < len(files):
+            page['nextPageToken'] = str(end)
+        return page
+
+    def get_start_page_token(self):
+        return '1'
+
+    def list_changes(self, page_token, page_size=None):
+        """Dummy changes.list; the dummy Drive never changes"""
+        self.calls += 1
+        return {'changes': [], 'newStartPageToken': page_token}
+
+    def download(self, file_id):
+        pdf = self._files_by_id.get(file_id) or next(f for f in dummy_pdf_files() if f['id'] == file_id)
+        time.sleep(0.1)  # Simulate download time
+        return self._content(pdf)
+
+
+def create_dummy_extraction_frame(n_files, seed=0):
+    """
+    One synthetic Drive extraction result per file of dummy_pdf_listing(n_files, seed),
+    as a DataFrame built one column at a time
+    """
+    _, names, days, _ = _listing_columns(n_files, seed)
+    rng = np.random.default_rng(seed)
+    client = rng.integers(0, len(SYNTHETIC_CLIENTS), n_files)
+    contract_type = rng.integers(0, len(SYNTHETIC_CONTRACT_TYPES), n_files)
+    status = rng.choice(3, n_files, p=[0.7, 0.2, 0.1])
+    thousands = rng.integers(10, 500, n_files)
+    return pd.DataFrame({
+        'filename': names,
+        'contract_date': pd.Categorical.from_codes(days, categories=_calendar()[:1095]),
+        'party_1': pd.Categorical.from_codes(client, categories=SYNTHETIC_CLIENTS),
+        'party_2': pd.Categorical.from_codes(np.zeros(n_files, dtype=np.int64), categories=['Trulioo Inc.']),
+        'contract_value': pd.Categorical.from_codes(thousands - 10, categories=[f"${k},000" for k in range(10, 500)]),
+        'contract_type': pd.Categorical.from_codes(contract_type, categories=SYNTHETIC_CONTRACT_TYPES),
+        'status': pd.Categorical.from_codes(status, categories=['Active', 'Pending', 'Expired'])
+    })
+
+
+def create_dummy_extraction_results(n_files=None, seed=0):
+    """
+    Create dummy Google Drive extraction results
+    n_files=None gives the fixed three results; otherwise one synthetic result record
+    per file of dummy_pdf_files(n_files, seed) (see create_dummy_extraction_frame)
+    """
+    if n_files is not None:
+        return _records(create_dummy_extraction_frame(n_files, seed))
     return [
         {
             'filename': 'Contract_ABC_Corporation.pdf',
@@ -165,45 +487,82 @@ def create_dummy_extraction_results():
     ]
 
 
-def main_pipeline_dummy(pdf_path, url, jwt_token, progress_callback=None):
+def create_dummy_extraction_result(pdf):
+    """Create the dummy Google Drive extraction result for a single PDF file"""
+    records = create_dummy_extraction_results()
+    for record in records:
+        if record['filename'] == pdf['name']:
+            return record
+    # Files without a canned record reuse one keyed by the file id
+    record = dict(records[sum(map(ord, pdf['id'])) % len(records)])
+    record['filename'] = pdf['name']
+    record['contract_date'] = pdf.get('modifiedTime', '')[:10]
+    return record
+
+
+def _stage(timings, name):
+    """Timing span for a pipeline stage, or a no-op when no recorder is given"""
+    return timings.span(name) if timings is not None else nullcontext()
+
+
+def main_pipeline_dummy(pdf_path, url, jwt_token, progress_callback=None, delay_scale=1.0, rows=None,
+                        timings=None, page_executor=None):
     """
     Dummy version of main_pipeline with progress callbacks
     Simulates the real pipeline with realistic progress updates
+    delay_scale multiplies the simulated processing time (0 disables sleeping)
+    rows=None returns the fixed sample tables; otherwise each table has rows synthetic rows
+    timings is an optional perf_timing.SpanRecorder that receives one span per stage
+    When pdf_path is a path on disk the text is really extracted, page ranges running
+    on page_executor (see pdf_pages); file objects keep the simulated read and extract
     """
+    on_disk = isinstance(pdf_path, str)
+
     # 1. Reading the Order Form
-    if progress_callback:
-        progress_callback(0.1, "📄 Reading PDF file...")
-    time.sleep(0.5)  # Simulate processing time
+    with _stage(timings, 'read_pdf'):
+        if progress_callback:
+            progress_callback(0.1, "📄 Reading PDF file...")
+        if on_disk:
+            page_count = count_pages(pdf_path)
+        else:
+            time.sleep(0.5 * delay_scale)  # Simulate processing time
     
-    if progress_callback:
-        progress_callback(0.5, "✍️ PDF content extracted successfully")
-    time.sleep(0.5)
+    with _stage(timings, 'extract_text'):
+        if on_disk:
+            # Page texts come back merged in page order, ready for analysis
+            extract_page_texts(pdf_path, page_executor, page_count)
+        else:
+            time.sleep(0.5 * delay_scale)
+        if progress_callback:
+            progress_callback(0.5, "✍️ PDF content extracted successfully")
     
     # 2. Extracting Order Form Details
-    if progress_callback:
-        progress_callback(0.6, "🔍 Analyzing document content...")
-    time.sleep(0.8)
-    
-    if progress_callback:
-        progress_callback(0.8, "⚙️ Processing contract details...")
-    time.sleep(0.7)
+    with _stage(timings, 'analyze'):
+        if progress_callback:
+            progress_callback(0.6, "🔍 Analyzing document content...")
+        time.sleep(0.8 * delay_scale)
     
-    if progress_callback:
-        progress_callback(1.0, "✅ Extraction completed!")
-    time.sleep(0.3)
-    
-    # Return dummy response structure matching the real API response
-    return {
-        'output_records': [
-            {"data": create_dummy_contract_data().to_dict('records')},
-            {"data": create_dummy_subscription_data().to_dict('records')},
-            {"data": create_dummy_line_item_data().to_dict('records')},
-            {"data": create_dummy_consumption_schedule().to_dict('records')},
-            {"data": create_dummy_consumption_rate().to_dict('records')},
-            {"data": create_dummy_consumption_schedule().to_dict('records')},  # LIS schedule
-            {"data": create_dummy_consumption_rate().to_dict('records')}       # LIS rate
-        ]
-    }
+    with _stage(timings, 'post_process'):
+        if progress_callback:
+            progress_callback(0.8, "⚙️ Processing contract details...")
+        time.sleep(0.7 * delay_scale)
+        
+        if progress_callback:
+            progress_callback(1.0, "✅ Extraction completed!")
+        time.sleep(0.3 * delay_scale)
+        
+        # Same response structure as the real API, with the tables as columnar blocks
+        return {
+            'output_records': [
+                table_block(create_dummy_contract_data(rows)),
+                table_block(create_dummy_subscription_data(rows)),
+                table_block(create_dummy_line_item_data(rows)),
+                table_block(create_dummy_consumption_schedule(rows)),
+                table_block(create_dummy_consumption_rate(rows)),
+                table_block(create_dummy_consumption_schedule(rows, seed=1)),  # LIS schedule
+                table_block(create_dummy_consumption_rate(rows, seed=1))       # LIS rate
+            ]
+        }
 
 
 def to_excel_dummy(df_contract, df_subscription, df_lineitemsource, 
@@ -238,6 +597,18 @@ def to_excel_dummy(df_contract, df_subscription, df_lineitemsource,
 
 
 # Configuration constants for frontend testing
+DUMMY_LARGE_FOLDER_ID = "folder_bulk"  # Synthetic folder for testing the Drive flow at volume
+DUMMY_LARGE_FOLDER_FILES = 10000
+# Folder ID -> (file ID, name, ID of the file it is a copy of) for the duplicate detection
+DUMMY_DUPLICATE_FILES = {
+    'folder_002': [
+        ('pdf_006', 'Copy of Contract_ABC_Corporation.pdf', 'pdf_001'),
+        ('pdf_007', 'ABC_Corporation_signed_final.pdf', 'pdf_001'),
+        ('pdf_008', 'Licensing_Deal_InnovateAI (1).pdf', 'pdf_005')
+    ]
+}
+DUMMY_DUPLICATE_EVERY = 10
+DUMMY_PIPELINE_VERSION = "dummy-2"  # Part of the result cache key; bump when the pipeline output changes
 DUMMY_ALLOWED_DOMAINS = ["any-domain.com"]  # Not used anymore, but kept for reference
 DUMMY_USER_CREDENTIALS = {
     "any_username": "any_password"  # Frontend accepts any credentials
@@ -0,0 +1,167 @@
+# excel_export.py
+"""
+Streaming Excel export for extraction results
+Writes rows in xlsxwriter constant-memory mode into a spooled temporary file
+"""
+
+import threading
+import time
+from tempfile import SpooledTemporaryFile
+
+import xlsxwriter
+
+# Workbooks smaller than this stay in memory, larger ones roll over to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Rows converted to Python values at a time while streaming a sheet
+ROW_CHUNK_SIZE = 10000
+# Rows per worksheet allowed by Excel, header included; longer sheets continue on another worksheet
+EXCEL_MAX_ROWS = 1048576
+# Longest worksheet name Excel accepts
+MAX_SHEET_NAME_LENGTH = 31
+
+
+def iter_sheet_rows(df, chunk_size=ROW_CHUNK_SIZE):
+    """Yield the rows of a DataFrame as tuples, with missing values as None"""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def part_name(sheet_name, part):
+    """Worksheet name of the part-th worksheet of a sheet, e.g. 'Contract (2)' for its first continuation"""
+    if part == 1:
+        return sheet_name
+    suffix = f" ({part})"
+    return sheet_name[:MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+
+
+def add_sheet(workbook, name, header, header_format=None):
+    """New worksheet with the header row written"""
+    worksheet = workbook.add_worksheet(name)
+    worksheet.set_column('A:Z', 15)  # Set default column width
+    worksheet.write_row(0, 0, header, header_format)
+    return worksheet
+
+
+def write_sheet(workbook, sheet_name, df, header_format=None, max_rows=EXCEL_MAX_ROWS):
+    """
+    Stream one DataFrame into a new worksheet, header first
+    Rows past Excel's row limit continue on further worksheets with the same header
+    """
+    header = [str(c) for c in df.columns]
+    part = 1
+    worksheet = add_sheet(workbook, sheet_name, header, header_format)
+    row_num = 1
+    for row in iter_sheet_rows(df):
+        if row_num >= max_rows:
+            part += 1
+            worksheet = add_sheet(workbook, part_name(sheet_name, part), header, header_format)
+            row_num = 1
+        worksheet.write_row(row_num, 0, row)
+        row_num += 1
+    return part
+
+
+def write_workbook(sheets, spool_max_size=SPOOL_MAX_SIZE):
+    """
+    Write (sheet_name, DataFrame) pairs to an .xlsx spooled temporary file
+    Returns the file rewound to the start and the export time in seconds
+    """
+    started = time.perf_counter()
+    output = SpooledTemporaryFile(max_size=spool_max_size, suffix='.xlsx')
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd'
+    })
+    header_format = workbook.add_format({'bold': True, 'border': 1})
+    for sheet_name, df in sheets:
+        write_sheet(workbook, sheet_name, df, header_format)
+    workbook.close()
+    output.seek(0)
+    return output, time.perf_counter() - started
+
+
+class WorkbookAppender:
+    """
+    Multi-file workbook that grows one extraction result at a time
+    Each append writes a file's tables below the rows already written, with the
+    source file name as the first column, so only that file's rows are in memory.
+    The first file appended to a sheet fixes its columns and later files are
+    aligned to them. A file with columns the sheet does not have yet, or rows past
+    Excel's row limit, continues the sheet on a new worksheet, e.g. 'Contract (2)',
+    whose header includes every column seen so far. Safe to append from worker threads
+    """
+
+    def __init__(self, sheet_names, source_column='Source File', spool_max_size=SPOOL_MAX_SIZE,
+                 max_rows=EXCEL_MAX_ROWS):
+        self.source_column = source_column
+        self.max_rows = max_rows
+        self.output = SpooledTemporaryFile(max_size=spool_max_size, suffix='.xlsx')
+        self.workbook = xlsxwriter.Workbook(self.output, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd'
+        })
+        self.header_format = self.workbook.add_format({'bold': True, 'border': 1})
+        # Sheets are created up front so they keep a fixed order whatever finishes first;
+        # worksheets maps each sheet to the worksheet its rows currently go to
+        self.worksheets = {}
+        for sheet_name in sheet_names:
+            worksheet = self.workbook.add_worksheet(sheet_name)
+            worksheet.set_column('A:Z', 15)  # Set default column width
+            self.worksheets[sheet_name] = worksheet
+        self.columns = {}
+        self.parts = dict.fromkeys(sheet_names, 1)
+        self.next_row = dict.fromkeys(sheet_names, 1)
+        self.file_count = 0
+        self.write_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _header(self, sheet_name):
+        return [self.source_column] + [str(c) for c in self.columns[sheet_name]]
+
+    def _continue_sheet(self, sheet_name):
+        # Caller holds the lock. In constant-memory mode rows already written, including
+        # the header, cannot be changed, so a wider header or more rows need a new worksheet
+        self.parts[sheet_name] += 1
+        self.worksheets[sheet_name] = add_sheet(
+            self.workbook, part_name(sheet_name, self.parts[sheet_name]), self._header(sheet_name), self.header_format
+        )
+        self.next_row[sheet_name] = 1
+
+    def append(self, source_name, sheets):
+        """Write the (sheet_name, DataFrame) pairs of one file below the existing rows"""
+        with self._lock:
+            started = time.perf_counter()
+            for sheet_name, df in sheets:
+                columns = self.columns.get(sheet_name)
+                if columns is None:
+                    self.columns[sheet_name] = list(df.columns)
+                    self.worksheets[sheet_name].write_row(0, 0, self._header(sheet_name), self.header_format)
+                else:
+                    added = [c for c in df.columns if c not in columns]
+                    if added:
+                        self.columns[sheet_name] = columns + added
+                        self._continue_sheet(sheet_name)
+                df = df.reindex(columns=self.columns[sheet_name])
+                for row in iter_sheet_rows(df):
+                    if self.next_row[sheet_name] >= self.max_rows:
+                        self._continue_sheet(sheet_name)
+                    self.worksheets[sheet_name].write_row(self.next_row[sheet_name], 0, (source_name,) + row)
+                    self.next_row[sheet_name] += 1
+            self.file_count += 1
+            self.write_seconds += time.perf_counter() - started
+
+    def close(self):
+        """Finish the workbook; returns it rewound to the start and the total write time in seconds"""
+        with self._lock:
+            started = time.perf_counter()
+            self.workbook.close()
+            self.output.seek(0)
+            return self.output, self.write_seconds + time.perf_counter() - started
+
+
+def read_workbook(output):
+    """Read a spooled workbook from the start, used when the download is requested"""
+    output.seek(0)
+    return output.read()
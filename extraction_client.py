@@ -0,0 +1,198 @@
+# extraction_client.py
+"""
+Shared HTTP client for the remote extraction endpoint
+One pooled keep-alive session per process, gzip request bodies, a per-host
+concurrency cap, jittered retries on 429/5xx and JWT reuse until expiry
+"""
+
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from extraction_result import columnar_response
+from pdf_pages import map_pdf
+
+# Keep-alive connections kept per host by the pool
+DEFAULT_POOL_SIZE = 16
+# Requests allowed in flight to one host at a time
+DEFAULT_MAX_PER_HOST = 8
+DEFAULT_MAX_RETRIES = 4
+# Full-jitter backoff: sleep uniformly in [0, min(cap, base * 2 ** attempt)]
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Connect and read timeouts in seconds; extraction of large contracts is slow
+REQUEST_TIMEOUT = (10, 300)
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+# In-memory bodies larger than this are sent uncompressed rather than copied into a gzip buffer
+MAX_COMPRESS_BYTES = 8 * 1024 * 1024
+# Tokens are refreshed this many seconds before they expire
+TOKEN_EXPIRY_SKEW = 60
+# Lifetime assumed for tokens that carry no expiry information
+DEFAULT_TOKEN_LIFETIME = 300
+
+
+class ExtractionError(Exception):
+    """The extraction endpoint failed after all retries"""
+
+
+def jwt_expiry(token):
+    """The exp claim of a JWT (unverified), or None if it cannot be read"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """
+    Reuses a JWT until shortly before it expires
+    fetch_token() returns either the token string or a dict with
+    access_token and optionally expires_in seconds
+    """
+
+    def __init__(self, fetch_token, skew=TOKEN_EXPIRY_SKEW):
+        self.fetch_token = fetch_token
+        self.skew = skew
+        self._token = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._token is None or time.time() >= self._expires_at - self.skew:
+                self._refresh()
+            return self._token
+
+    def invalidate(self):
+        """Drop the cached token, e.g. after the endpoint answered 401"""
+        with self._lock:
+            self._token = None
+
+    def _refresh(self):
+        fetched = self.fetch_token()
+        now = time.time()
+        if isinstance(fetched, dict):
+            self._token = fetched['access_token']
+            expires_in = fetched.get('expires_in')
+            expires_at = now + float(expires_in) if expires_in else jwt_expiry(self._token)
+        else:
+            self._token = fetched
+            expires_at = jwt_expiry(fetched)
+        self._expires_at = expires_at or now + DEFAULT_TOKEN_LIFETIME
+
+
+def token_url_fetcher(token_url, credentials, timeout=REQUEST_TIMEOUT):
+    """fetch_token callable that POSTs credentials to a token endpoint"""
+    def fetch_token():
+        response = requests.post(token_url, json=credentials, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    return fetch_token
+
+
+class ExtractionClient:
+    """Process-wide client for the extraction endpoint; safe to share across threads"""
+
+    def __init__(self, token_cache, pool_size=DEFAULT_POOL_SIZE, max_per_host=DEFAULT_MAX_PER_HOST,
+                 max_retries=DEFAULT_MAX_RETRIES, timeout=REQUEST_TIMEOUT):
+        self.token_cache = token_cache
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slots_for(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(BACKOFF_CAP, float(retry_after))
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def post(self, url, body, content_type):
+        """
+        POST a body (bytes or a memory map) with retries; returns the successful requests.Response
+        Memory maps of spooled uploads are streamed as they are, and only bytes bodies of
+        moderate size are gzipped. A 401 refreshes the token once without using up a retry
+        """
+        headers = {'Content-Type': content_type}
+        if isinstance(body, bytes) and MIN_COMPRESS_BYTES <= len(body) <= MAX_COMPRESS_BYTES:
+            compressed = gzip.compress(body, compresslevel=6)
+            if len(compressed) < len(body):
+                body = compressed
+                headers['Content-Encoding'] = 'gzip'
+
+        last_error = None
+        token_refreshed = False
+        attempt = 0
+        while attempt <= self.max_retries:
+            headers['Authorization'] = f"Bearer {self.token_cache.get()}"
+            if hasattr(body, 'seek'):
+                # A memory-mapped body is streamed, so rewind it for every attempt
+                body.seek(0)
+            response = None
+            try:
+                with self._slots_for(url):
+                    response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+            else:
+                if response.status_code == 401 and not token_refreshed:
+                    # Token revoked or clock skew: fetch a fresh one and retry once at once
+                    self.token_cache.invalidate()
+                    token_refreshed = True
+                    continue
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response
+                last_error = requests.HTTPError(f"{response.status_code} from {url}", response=response)
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, response))
+            attempt += 1
+        raise ExtractionError(f"Extraction request failed after {self.max_retries + 1} attempts: {last_error}")
+
+    def extract(self, pdf_file, url, progress_callback=None, timings=None):
+        """
+        Send one PDF (bytes, a file-like object or a spooled path on disk) to the extraction endpoint
+        Returns the parsed JSON response with columnar output_records (see extraction_result.columnar_response)
+        """
+        if progress_callback:
+            progress_callback(0.1, "📤 Uploading PDF file...")
+        if isinstance(pdf_file, str):
+            with map_pdf(pdf_file) as mapped:
+                return self._extract_bytes(mapped, url, progress_callback, timings)
+        pdf_bytes = pdf_file if isinstance(pdf_file, bytes) else pdf_file.getvalue()
+        return self._extract_bytes(pdf_bytes, url, progress_callback, timings)
+
+    def _extract_bytes(self, pdf_bytes, url, progress_callback, timings):
+        if progress_callback:
+            progress_callback(0.4, "🔍 Extracting contract details...")
+        started = time.perf_counter()
+        response = self.post(url, pdf_bytes, 'application/pdf')
+        if timings is not None:
+            timings.record('extraction_request', time.perf_counter() - started)
+
+        if progress_callback:
+            progress_callback(1.0, "✅ Extraction completed!")
+        return columnar_response(response.json())
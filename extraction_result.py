@@ -0,0 +1,109 @@
+# extraction_result.py
+"""
+Columnar result model for the extraction pipeline
+Holds the seven output tables by name, built once from the API response
+"""
+
+import pandas as pd
+
+from normalize import normalize_frame
+
+# (name, Excel sheet name, preview tab label) in API response order
+RESULT_TABLES = [
+    ('contract', 'Contract', '📋 Contract Data'),
+    ('subscription', 'Subscription', '📊 Subscription Data'),
+    ('line_item_source', 'LineItemSource', '📄 Line Item Source'),
+    ('sub_consumption_schedule', 'subConsumptionSchedule', '📅 Sub Consumption Schedule'),
+    ('sub_consumption_rate', 'subConsumptionRate', '💰 Sub Consumption Rate'),
+    ('lis_consumption_schedule', 'lisConsmptionSchedule', '📋 LIS Consumption Schedule'),
+    ('lis_consumption_rate', 'lisConsumptionRate', '💸 LIS Consumption Rate')
+]
+TABLE_NAMES = [name for name, _, _ in RESULT_TABLES]
+
+
+def table_block(df):
+    """Columnar output_records block of one table: column name -> list of values"""
+    return {'columns': df.to_dict('list')}
+
+
+def columnar_response(response):
+    """
+    Response with its row-oriented ("data") output_records blocks turned into columnar ones
+    Done once when a response arrives, so the cache and every later read skip the row dicts
+    """
+    blocks = [
+        table_block(pd.DataFrame(block['data'])) if 'data' in block else block
+        for block in response['output_records']
+    ]
+    return dict(response, output_records=blocks)
+
+
+def output_block_to_frame(block):
+    """
+    Convert one columnar output_records block (see table_block) to a DataFrame
+    Currency, percentage, date and label columns are converted to typed columns
+    """
+    return normalize_frame(pd.DataFrame(block['columns']))
+
+
+def table_from_response(response, name):
+    """Build one result table from a pipeline response, e.g. to preview it before the others"""
+    return output_block_to_frame(response['output_records'][TABLE_NAMES.index(name)])
+
+
+def _scalar(value):
+    """Plain Python value of a table cell; missing values (NaN, NaT) become None"""
+    if value is None or pd.isna(value):
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return value.item() if hasattr(value, 'item') else value
+
+
+def contract_summary(filename, contract):
+    """
+    Drive batch summary record of one document, built from its normalized contract table
+    The first contract row gives the client, type, status, start date and value
+    """
+    row = contract.iloc[0] if len(contract) else {}
+    return {
+        'filename': filename,
+        'contract_date': _scalar(row.get('Start Date')),
+        'party_1': _scalar(row.get('Client Name')),
+        'party_2': None,
+        'contract_value': _scalar(row.get('Contract Value')),
+        'contract_type': _scalar(row.get('Contract Type')),
+        'status': _scalar(row.get('Status'))
+    }
+
+
+class ExtractionResult:
+    """The seven extraction tables of one document, keyed by table name"""
+
+    def __init__(self, tables):
+        missing = [name for name, _, _ in RESULT_TABLES if name not in tables]
+        if missing:
+            raise ValueError(f"Missing result tables: {', '.join(missing)}")
+        self.tables = tables
+
+    @classmethod
+    def from_response(cls, response, prebuilt=None):
+        """
+        Build the result from a pipeline response with output_records in table order
+        Tables in prebuilt (name -> DataFrame) are used as they are instead of being built again
+        """
+        blocks = response['output_records']
+        if len(blocks) != len(RESULT_TABLES):
+            raise ValueError(f"Expected {len(RESULT_TABLES)} output records, got {len(blocks)}")
+        prebuilt = prebuilt or {}
+        return cls({
+            name: prebuilt[name] if name in prebuilt else output_block_to_frame(block)
+            for name, block in zip(TABLE_NAMES, blocks)
+        })
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def sheets(self):
+        """(sheet name, DataFrame) pairs in workbook order"""
+        return [(sheet_name, self.tables[name]) for name, sheet_name, _ in RESULT_TABLES]
@@ -0,0 +1,264 @@
+# job_queue.py
+"""
+Process-wide background job queue for extractions
+Jobs run on worker threads so they survive Streamlit reruns and page refreshes.
+Every session shares the same workers: each user has a queue per priority,
+users are served round-robin, interactive jobs go before batch work and a
+user's batch work is capped so one large Drive run cannot take every worker
+"""
+
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+# Number of worker threads shared by every session
+DEFAULT_JOB_WORKERS = 8
+# Batch tasks one user may run at once
+DEFAULT_USER_BATCH_QUOTA = 4
+# Workers that batch tasks never take, so interactive jobs start without waiting
+RESERVED_INTERACTIVE_WORKERS = 1
+# Finished jobs are forgotten after this many seconds
+JOB_RETENTION_SECONDS = 3600
+# Recent queue waits kept for the wait time percentiles
+WAIT_SAMPLES = 1000
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+# Priorities in the order they are served
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BATCH = 'batch'
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BATCH)
+
+DEFAULT_OWNER = 'anonymous'
+
+
+class FairShareExecutor:
+    """
+    Executor-style view of the queue for one user's batch work
+    submit() returns a concurrent.futures.Future; shutdown() waits for this
+    view's tasks only and leaves the shared workers running
+    """
+
+    def __init__(self, queue, owner, priority=PRIORITY_BATCH):
+        self.queue = queue
+        self.owner = owner
+        self.priority = priority
+        self._futures = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def task():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        self.queue.enqueue(self.owner, self.priority, task)
+        return future
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._closed = True
+            futures = list(self._futures)
+        if wait:
+            for future in futures:
+                try:
+                    future.exception()
+                except BaseException:
+                    pass
+
+
+class JobQueue:
+    """Fair-share worker pool that tracks status and progress per job"""
+
+    def __init__(self, max_workers=DEFAULT_JOB_WORKERS, user_batch_quota=DEFAULT_USER_BATCH_QUOTA,
+                 reserved_interactive=RESERVED_INTERACTIVE_WORKERS, retention_seconds=JOB_RETENTION_SECONDS):
+        self.max_workers = max_workers
+        self.user_batch_quota = user_batch_quota
+        self.max_batch_workers = max(1, max_workers - reserved_interactive)
+        self._retention_seconds = retention_seconds
+        self._jobs = {}
+        # job ID -> callable run when a forgotten job stops running
+        self._after_forget = {}
+        self._lock = threading.Lock()
+        # priority -> owner -> deque of (enqueued_at, task); owner order is the round-robin order
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}
+        self._running = Counter()
+        self._running_batch = Counter()
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITIES}
+        self._condition = threading.Condition()
+        for i in range(max_workers):
+            threading.Thread(target=self._work, name=f'extraction-job-{i}', daemon=True).start()
+
+    def submit(self, fn, *args, owner=DEFAULT_OWNER, priority=PRIORITY_INTERACTIVE, **kwargs):
+        """
+        Queue fn(*args, progress_callback=..., **kwargs) for owner and return its job ID
+        fn reports progress through the progress_callback(value, message) keyword
+        """
+        self._prune()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                'id': job_id,
+                'owner': owner,
+                'priority': priority,
+                'status': JOB_QUEUED,
+                'progress': 0.0,
+                'message': '⏳ Waiting for a free worker...',
+                'result': None,
+                'error': None,
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None
+            }
+        self.enqueue(owner, priority, lambda: self._run(job_id, fn, args, kwargs))
+        return job_id
+
+    def executor(self, owner, priority=PRIORITY_BATCH):
+        """Executor that runs an owner's tasks on the shared workers, e.g. one per Drive batch"""
+        return FairShareExecutor(self, owner, priority)
+
+    def enqueue(self, owner, priority, task):
+        """Queue a bare callable for owner without job tracking"""
+        with self._condition:
+            self._queues[priority].setdefault(owner, deque()).append((time.time(), task))
+            self._condition.notify()
+
+    def get(self, job_id):
+        """Return a snapshot of the job, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def forget(self, job_id, then=None):
+        """
+        Drop a job and its result; a queued job is not started
+        then() runs once the job is no longer running, e.g. to remove the file it reads
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is not None and job['status'] not in FINISHED_STATES and then is not None:
+                self._after_forget[job_id] = then
+                return
+        if then is not None:
+            then()
+
+    def stats(self):
+        """Worker usage, queue depth per priority and owner, and recent queue wait percentiles"""
+        with self._condition:
+            queued = {p: sum(len(q) for q in self._queues[p].values()) for p in PRIORITIES}
+            queued_by_owner = Counter()
+            for priority in PRIORITIES:
+                for owner, tasks in self._queues[priority].items():
+                    queued_by_owner[owner] += len(tasks)
+            running = sum(self._running.values())
+            waits = {p: np.asarray(self._waits[p]) for p in PRIORITIES}
+        stats = {
+            'workers': self.max_workers,
+            'running': running,
+            'queued': queued,
+            'queued_by_owner': dict(queued_by_owner)
+        }
+        for priority, values in waits.items():
+            p50, p95 = np.percentile(values, [50, 95]) if len(values) else (0.0, 0.0)
+            stats[f'{priority}_wait_p50'] = float(p50)
+            stats[f'{priority}_wait_p95'] = float(p95)
+        return stats
+
+    def _next_task(self):
+        """Block until a task may start; interactive first, then owners round-robin within quota"""
+        with self._condition:
+            while True:
+                for priority in PRIORITIES:
+                    if priority == PRIORITY_BATCH and sum(self._running_batch.values()) >= self.max_batch_workers:
+                        continue
+                    owners = self._queues[priority]
+                    for owner in list(owners):
+                        if priority == PRIORITY_BATCH and self._running_batch[owner] >= self.user_batch_quota:
+                            continue
+                        enqueued_at, task = owners[owner].popleft()
+                        if owners[owner]:
+                            owners.move_to_end(owner)
+                        else:
+                            del owners[owner]
+                        self._running[owner] += 1
+                        if priority == PRIORITY_BATCH:
+                            self._running_batch[owner] += 1
+                        self._waits[priority].append(time.time() - enqueued_at)
+                        return owner, priority, task
+                self._condition.wait()
+
+    def _work(self):
+        while True:
+            owner, priority, task = self._next_task()
+            try:
+                task()
+            except Exception:
+                # Job tasks record their own errors and executor tasks set them on their future
+                pass
+            finally:
+                with self._condition:
+                    self._running[owner] -= 1
+                    if priority == PRIORITY_BATCH:
+                        self._running_batch[owner] -= 1
+                    self._condition.notify_all()
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _run(self, job_id, fn, args, kwargs):
+        try:
+            with self._lock:
+                if job_id not in self._jobs:
+                    # Forgotten while queued
+                    return
+                self._jobs[job_id].update(status=JOB_RUNNING, started_at=time.time())
+
+            def progress_callback(progress_value, status_message):
+                self._update(job_id, progress=progress_value, message=status_message)
+
+            try:
+                result = fn(*args, progress_callback=progress_callback, **kwargs)
+            except Exception as e:
+                self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+            else:
+                self._update(job_id, status=JOB_SUCCEEDED, result=result, progress=1.0, finished_at=time.time())
+        finally:
+            with self._lock:
+                then = self._after_forget.pop(job_id, None)
+            if then is not None:
+                then()
+
+    def _prune(self):
+        cutoff = time.time() - self._retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['status'] in FINISHED_STATES and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,104 @@
+# normalize.py
+"""
+Vectorized post-processing of extracted tables
+Display strings such as '$50,000', '85%' and '2024-01-15' become numeric and
+datetime columns, and repeated labels become categoricals, one column
+operation at a time. A column is only converted when every value in it parses,
+so text the pipeline returned in another format is kept as it is
+"""
+
+import pandas as pd
+
+CURRENCY = 'currency'
+PERCENTAGE = 'percentage'
+DATE = 'date'
+CATEGORY = 'category'
+
+# Column name -> kind, shared by the seven result tables and the Drive summaries
+COLUMN_KINDS = {
+    'contract_value': CURRENCY,
+    'Contract Value': CURRENCY,
+    'Monthly Fee': CURRENCY,
+    'Unit Price': CURRENCY,
+    'Total Amount': CURRENCY,
+    'Rate per Unit': CURRENCY,
+    'Usage Percentage': PERCENTAGE,
+    'contract_date': DATE,
+    'Start Date': DATE,
+    'End Date': DATE,
+    'status': CATEGORY,
+    'Status': CATEGORY,
+    'contract_type': CATEGORY,
+    'Contract Type': CATEGORY,
+    'party_2': CATEGORY,
+    'Service Type': CATEGORY,
+    'Service': CATEGORY,
+    'Billing Cycle': CATEGORY,
+    'Category': CATEGORY,
+    'Tier': CATEGORY,
+    'Period': CATEGORY
+}
+
+# Everything except digits, sign and decimal point, e.g. currency symbols and thousands separators
+NON_NUMERIC_PATTERN = r'[^\d.\-]'
+
+
+def _parse_number(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+    cleaned = series.astype('string').str.replace(NON_NUMERIC_PATTERN, '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').astype('float64')
+
+
+def parse_currency(series):
+    """Amounts like '$75,000' or 'USD 1,200.50' as float; unparseable values become NaN"""
+    return _parse_number(series)
+
+
+def parse_percentage(series):
+    """Percentages like '85%' as float percentage points (85.0)"""
+    return _parse_number(series)
+
+
+def parse_dates(series):
+    """ISO-style date strings as datetime64; unparseable values become NaT"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, format='ISO8601', errors='coerce')
+
+
+def to_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype('category')
+
+
+PARSERS = {
+    CURRENCY: parse_currency,
+    PERCENTAGE: parse_percentage,
+    DATE: parse_dates,
+    CATEGORY: to_category
+}
+
+
+def _parses_fully(original, parsed):
+    """True when every non-null value of original has a parsed value"""
+    return bool((parsed.notna() | original.isna()).all())
+
+
+def normalize_frame(df, column_kinds=COLUMN_KINDS):
+    """
+    Copy of df with every known column converted to its typed form
+    Known columns with a value that does not parse, e.g. 'TBD' or 'January 15, 2024',
+    and all other columns are kept as they are
+    """
+    converted = {}
+    for column in df.columns:
+        if column not in column_kinds:
+            continue
+        parsed = PARSERS[column_kinds[column]](df[column])
+        if _parses_fully(df[column], parsed):
+            converted[column] = parsed
+    if not converted:
+        return df
+    return df.assign(**converted)
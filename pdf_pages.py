@@ -0,0 +1,146 @@
+# pdf_pages.py
+"""
+Disk-spooled PDF uploads and page-level parallel text extraction
+Uploads are copied to a temporary file in chunks and memory-mapped; page
+ranges are extracted on a process pool and merged back in page order
+"""
+
+import hashlib
+import mmap
+import multiprocessing
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from pypdf import PdfReader
+
+# Uploads are spooled below this directory, in a subdirectory per app process start
+SPOOL_ROOT = os.environ.get(
+    'EXTRACTION_SPOOL_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'trulioo_contract_extractor', 'uploads')
+)
+# PID plus a per-start token: a restarted container often gets the same PID again
+PROCESS_SPOOL_NAME = f"{os.getpid()}-{uuid.uuid4().hex}"
+# Bytes copied from an upload at a time while spooling it to disk
+SPOOL_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PAGE_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+# Documents with fewer pages are extracted in-process; the pool only pays off above this
+PARALLEL_MIN_PAGES = 16
+# Page ranges per worker, so a slow range does not leave the other workers idle
+RANGES_PER_WORKER = 2
+
+
+def process_spool_dir(spool_root=SPOOL_ROOT):
+    """This process's spool directory, named after its PID and start, created on first use"""
+    path = os.path.join(spool_root, PROCESS_SPOOL_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def spool_upload(fileobj, spool_dir=None):
+    """
+    Copy an uploaded file to a temporary .pdf on disk in chunks
+    Returns the path and the SHA-256 digest of the content; the caller removes the file
+    """
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    with tempfile.NamedTemporaryFile(dir=spool_dir or process_spool_dir(), prefix='upload_', suffix='.pdf',
+                                     delete=False) as f:
+        while chunk := fileobj.read(SPOOL_CHUNK_SIZE):
+            digest.update(chunk)
+            f.write(chunk)
+    fileobj.seek(0)
+    return f.name, digest.hexdigest()
+
+
+def _process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _is_stale_spool_dir(name):
+    """True for the spool directory of an app process start that has ended"""
+    pid, _, token = name.partition('-')
+    if not pid.isdigit() or not token or name == PROCESS_SPOOL_NAME:
+        return False
+    # An earlier start with this process's PID, or a process that has exited
+    return int(pid) == os.getpid() or not _process_running(int(pid))
+
+
+def remove_stale_spooled(spool_root=SPOOL_ROOT):
+    """Delete the spool directories of app processes that are no longer running, e.g. after a crash or restart"""
+    removed = 0
+    try:
+        entries = list(os.scandir(spool_root))
+    except OSError:
+        return 0
+    for entry in entries:
+        if entry.is_dir() and _is_stale_spool_dir(entry.name):
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+@contextmanager
+def map_pdf(path):
+    """Read-only memory map of a PDF on disk"""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+def count_pages(path):
+    """Number of pages of a PDF on disk"""
+    with map_pdf(path) as mapped:
+        return len(PdfReader(mapped).pages)
+
+
+def extract_page_range(path, start, stop):
+    """Text of pages [start, stop) of a PDF on disk; runs inside a pool worker"""
+    with map_pdf(path) as mapped:
+        reader = PdfReader(mapped)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def page_ranges(page_count, parts):
+    """Split pages into at most parts contiguous [start, stop) ranges of near-equal size"""
+    parts = max(1, min(parts, page_count))
+    bounds = [page_count * i // parts for i in range(parts + 1)]
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+
+def extract_page_texts(path, executor=None, page_count=None, workers=DEFAULT_PAGE_WORKERS):
+    """
+    Text of every page of a PDF on disk, in page order
+    Page ranges run on executor (a process pool of workers processes) when the
+    document is large enough
+    """
+    if page_count is None:
+        page_count = count_pages(path)
+    if executor is None or page_count < PARALLEL_MIN_PAGES:
+        return extract_page_range(path, 0, page_count)
+    ranges = page_ranges(page_count, workers * RANGES_PER_WORKER)
+    futures = [executor.submit(extract_page_range, path, start, stop) for start, stop in ranges]
+    texts = []
+    for future in futures:
+        texts.extend(future.result())
+    return texts
+
+
+def new_page_executor(max_workers=DEFAULT_PAGE_WORKERS):
+    """
+    Process pool for page extraction
+    Workers are spawned rather than forked, since the app process runs many threads
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
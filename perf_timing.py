@@ -0,0 +1,124 @@
+# perf_timing.py
+"""
+Per-stage timing spans for extraction jobs and UI steps
+Spans are collected per job into a process-wide registry that can be
+summarised (p50/p95) and exported as Prometheus text or JSON lines
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Most recent spans kept by the registry across all jobs
+MAX_SPANS = 20000
+METRIC_NAME = 'extraction_stage_seconds'
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class SpanRecorder:
+    """Collects the timing spans of one job; safe to use from worker threads"""
+
+    def __init__(self, registry, job_id, kind):
+        self.registry = registry
+        self.job_id = job_id
+        self.kind = kind
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        """Time the enclosed block as one span of the given stage"""
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started, started_at, **attrs)
+
+    def record(self, stage, seconds, started_at=None, **attrs):
+        """Add an already measured span"""
+        span = {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'stage': stage,
+            'start': started_at if started_at is not None else time.time() - seconds,
+            'seconds': seconds
+        }
+        if attrs:
+            span['attrs'] = attrs
+        with self._lock:
+            self.spans.append(span)
+        self.registry.add(span)
+
+    def stage_totals(self):
+        """Total seconds per stage for this job, in first-seen order"""
+        totals = {}
+        with self._lock:
+            for span in self.spans:
+                totals[span['stage']] = totals.get(span['stage'], 0.0) + span['seconds']
+        return totals
+
+
+class TimingRegistry:
+    """Process-wide store of recent spans from every job"""
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def new_recorder(self, kind, job_id=None):
+        """Recorder for a new job of the given kind (e.g. 'single' or 'batch')"""
+        return SpanRecorder(self, job_id or uuid.uuid4().hex, kind)
+
+    def add(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self):
+        """Per-stage count, total, p50, p95 and max seconds over the recent spans"""
+        durations = {}
+        for span in self.spans():
+            durations.setdefault(span['stage'], []).append(span['seconds'])
+        rows = []
+        for stage, values in durations.items():
+            values = np.asarray(values)
+            p50, p95 = np.percentile(values, [50, 95])
+            rows.append({
+                'stage': stage,
+                'count': len(values),
+                'total_s': float(values.sum()),
+                'p50_ms': float(p50) * 1000,
+                'p95_ms': float(p95) * 1000,
+                'max_ms': float(values.max()) * 1000
+            })
+        return sorted(rows, key=lambda r: r['p95_ms'], reverse=True)
+
+    def to_prometheus(self):
+        """Prometheus text exposition of the stage durations as a summary metric"""
+        durations = {}
+        for span in self.spans():
+            durations.setdefault(span['stage'], []).append(span['seconds'])
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each extraction and UI stage",
+            f"# TYPE {METRIC_NAME} summary"
+        ]
+        for stage, values in sorted(durations.items()):
+            values = np.asarray(values)
+            for quantile, value in zip(SUMMARY_QUANTILES, np.quantile(values, SUMMARY_QUANTILES)):
+                lines.append(f'{METRIC_NAME}{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {values.sum():.6f}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {len(values)}')
+        return "\n".join(lines) + "\n"
+
+    def to_json_lines(self):
+        """One JSON object per span"""
+        return "".join(json.dumps(span) + "\n" for span in self.spans())
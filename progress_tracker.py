@@ -0,0 +1,109 @@
+# progress_tracker.py
+"""
+Coalesced progress reporting for batch extractions
+Counts file completions from any thread and renders at most once per
+interval, so the number of UI updates does not grow with the batch size
+"""
+
+import threading
+import time
+from collections import deque
+
+# Minimum seconds between two renders
+DEFAULT_RENDER_INTERVAL = 0.25
+# Completions used for the moving throughput estimate
+THROUGHPUT_WINDOW = 200
+
+
+def format_duration(seconds):
+    """Compact duration such as 45s, 3m 05s or 2h 14m"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class ProgressAggregator:
+    """
+    Batch progress counters with throughput and ETA
+    add() may be called from any thread; render(snapshot) is only called from
+    maybe_render() and flush(), on whichever thread owns the UI
+    """
+
+    def __init__(self, total, render, interval=DEFAULT_RENDER_INTERVAL):
+        self.total = total
+        self.render = render
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.last_item = None
+        self.started = time.monotonic()
+        self.render_count = 0
+        self._completions = deque(maxlen=THROUGHPUT_WINDOW)
+        self._last_render = None
+        self._lock = threading.Lock()
+
+    def add(self, item=None, ok=True):
+        """Record one finished item"""
+        now = time.monotonic()
+        with self._lock:
+            self.done += 1
+            if not ok:
+                self.failed += 1
+            self.last_item = item
+            self._completions.append(now)
+
+    def snapshot(self):
+        """Counts, completed fraction, throughput (items per second) and ETA in seconds"""
+        now = time.monotonic()
+        with self._lock:
+            done, failed, last_item = self.done, self.failed, self.last_item
+            completions = list(self._completions)
+        elapsed = now - self.started
+        if len(completions) >= 2 and completions[-1] > completions[0]:
+            throughput = (len(completions) - 1) / (completions[-1] - completions[0])
+        else:
+            throughput = done / elapsed if done and elapsed > 0 else 0.0
+        remaining = max(0, self.total - done)
+        return {
+            'done': done,
+            'failed': failed,
+            'total': self.total,
+            'fraction': done / self.total if self.total else 1.0,
+            'elapsed': elapsed,
+            'throughput': throughput,
+            'eta': remaining / throughput if throughput else None,
+            'last_item': last_item
+        }
+
+    def maybe_render(self):
+        """Render if the interval has passed since the previous render"""
+        now = time.monotonic()
+        if self._last_render is not None and now - self._last_render < self.interval:
+            return False
+        self.flush()
+        return True
+
+    def flush(self):
+        """Render the current snapshot now, e.g. once the batch has finished"""
+        self._last_render = time.monotonic()
+        self.render_count += 1
+        self.render(self.snapshot())
+
+
+def progress_text(snapshot, unit='files'):
+    """One-line status for a progress snapshot"""
+    parts = [f"{snapshot['done']:,}/{snapshot['total']:,} {unit}"]
+    if snapshot['failed']:
+        parts.append(f"{snapshot['failed']:,} failed")
+    if snapshot['throughput']:
+        parts.append(f"{snapshot['throughput']:.1f} {unit}/s")
+    if snapshot['eta'] is not None and snapshot['done'] < snapshot['total']:
+        parts.append(f"ETA {format_duration(snapshot['eta'])}")
+    if snapshot['last_item']:
+        parts.append(f"last: {snapshot['last_item']}")
+    return " · ".join(parts)
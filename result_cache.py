@@ -0,0 +1,203 @@
+# result_cache.py
+"""
+Content-addressed cache for extraction pipeline responses
+Keeps a size-bounded in-memory LRU in front of a JSON disk tier that survives restarts
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Upper bound for serialized responses held in memory
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+# Oldest disk entries are removed once the disk tier holds more than this
+DEFAULT_MAX_DISK_ENTRIES = 5000
+DEFAULT_CACHE_DIR = os.environ.get(
+    'EXTRACTION_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'trulioo_contract_extractor', 'results')
+)
+
+
+def file_sha256(pdf_bytes):
+    """SHA-256 hex digest of the PDF bytes"""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU + disk) cache of pipeline responses keyed by PDF content"""
+
+    def __init__(self, pipeline_version, cache_dir=DEFAULT_CACHE_DIR,
+                 max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES, max_disk_entries=DEFAULT_MAX_DISK_ENTRIES):
+        self.pipeline_version = pipeline_version
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # key -> Future of a pipeline run in progress, shared by concurrent misses
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, pdf_bytes):
+        """Cache key for a document under the current pipeline version"""
+        return self.key_for_digest(file_sha256(pdf_bytes))
+
+    def key_for_digest(self, digest):
+        """Cache key for a document whose SHA-256 digest is already known"""
+        return f"{self.pipeline_version}-{digest}"
+
+    def __contains__(self, key):
+        """True when either tier holds key; unlike get, not counted as a hit or miss"""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.cache_dir) and os.path.exists(self._disk_path(key))
+
+    def get(self, key, count=True):
+        """
+        Return the cached response for key, or None on a miss
+        count=False reads without touching the hit and miss counters, e.g. to reuse a
+        response the caller already computed or looked up
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += count
+                return self._memory[key][0]
+
+        payload = self._read_disk(key)
+        with self._lock:
+            if payload is None:
+                self.misses += count
+                return None
+            self.hits += count
+            response = json.loads(payload)
+            self._remember(key, response, len(payload))
+            return response
+
+    def put(self, key, response):
+        """Store a response in both tiers"""
+        payload = json.dumps(response).encode('utf-8')
+        with self._lock:
+            self._remember(key, response, len(payload))
+        self._write_disk(key, payload)
+
+    def compute(self, key, pipeline, *args, **kwargs):
+        """Run the pipeline and cache its response without checking the cache first"""
+        response = pipeline(*args, **kwargs)
+        self.put(key, response)
+        return response
+
+    def get_or_compute(self, key, pipeline, *args, **kwargs):
+        """
+        Return the cached response for key, running the pipeline on a miss
+        Concurrent misses for the same key, e.g. identical files in one batch, wait
+        for a single pipeline run instead of starting their own
+        """
+        response = self.get(key)
+        if response is not None:
+            return response
+        with self._lock:
+            if key in self._memory:
+                # Computed by another thread since the lookup above
+                return self._memory[key][0]
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = Future()
+                running = True
+            else:
+                self.coalesced += 1
+                running = False
+        if not running:
+            return inflight.result()
+        try:
+            response = self.compute(key, pipeline, *args, **kwargs)
+        except BaseException as e:
+            inflight.set_exception(e)
+            raise
+        else:
+            inflight.set_result(response)
+            return response
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self):
+        """Hit and miss counters plus current memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'coalesced': self.coalesced,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes
+            }
+
+    def _remember(self, key, response, size):
+        # Caller holds the lock
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = (response, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, payload):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier still holds the entry
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith('.json')]
+        except OSError:
+            return
+        if len(entries) <= self.max_disk_entries:
+            return
+        ages = []
+        for entry in entries:
+            try:
+                ages.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                # Removed by a concurrent prune (another thread or process) since the scan
+                continue
+        ages.sort()
+        for _, path in ages[:len(ages) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
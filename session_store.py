@@ -0,0 +1,284 @@
+# session_store.py
+"""
+Per-session result tables under a memory budget
+Each browser session keeps its result tables in memory up to a byte budget;
+past it the least recently used tables are spilled to Parquet files on local
+disk and read back when they are shown or exported. Idle sessions are spilled
+entirely, and sessions whose browser has gone away are closed and their
+spilled tables and spooled uploads removed
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import pandas as pd
+
+DEFAULT_SPILL_DIR = os.environ.get(
+    'EXTRACTION_SPILL_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'trulioo_contract_extractor', 'sessions')
+)
+# Bytes of result tables one session may hold in memory before spilling to disk
+DEFAULT_SESSION_BUDGET_BYTES = int(os.environ.get('EXTRACTION_SESSION_BUDGET_MB', '64')) * 1024 * 1024
+# Sessions not seen for this long keep no tables in memory; without a connection check they are closed
+DEFAULT_IDLE_SECONDS = 2 * 3600
+# Disconnected sessions are kept this long in case the browser reconnects
+DISCONNECTED_GRACE_SECONDS = 300
+# Minimum seconds between two sweeps for abandoned sessions
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def frame_nbytes(df):
+    """In-memory size of a DataFrame including its string contents"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class FrameNamespace(Mapping):
+    """View of the session tables whose names start with prefix/, e.g. one extraction result"""
+
+    def __init__(self, frames, prefix):
+        self.frames = frames
+        self.prefix = f"{prefix}/"
+
+    def __getitem__(self, name):
+        return self.frames[self.prefix + name]
+
+    def __contains__(self, name):
+        return self.prefix + name in self.frames
+
+    def __iter__(self):
+        return (name[len(self.prefix):] for name in list(self.frames) if name.startswith(self.prefix))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def put(self, name, df):
+        self.frames.put(self.prefix + name, df)
+
+    def clear(self):
+        for name in list(self):
+            self.frames.discard(self.prefix + name)
+
+
+class SessionFrames(Mapping):
+    """
+    Named DataFrames of one session; reading a spilled table loads it from disk
+    Tables are kept in least recently used order and spilled oldest first
+    """
+
+    def __init__(self, session_id, spill_dir=DEFAULT_SPILL_DIR, budget_bytes=DEFAULT_SESSION_BUDGET_BYTES,
+                 owner=None):
+        self.session_id = session_id
+        self.owner = owner
+        self.budget_bytes = budget_bytes
+        self.spill_dir = os.path.join(spill_dir, session_id)
+        self.last_seen = time.time()
+        self.spill_count = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        # name -> (Parquet path, bytes on disk, bytes it takes in memory)
+        self._spilled = {}
+        self._files = set()
+        self._lock = threading.RLock()
+
+    def put(self, name, df):
+        """Store a table under name, replacing any earlier one, and spill if over budget"""
+        with self._lock:
+            self.discard(name)
+            size = frame_nbytes(df)
+            self._memory[name] = (df, size)
+            self._memory_bytes += size
+            self._enforce_budget(self.budget_bytes)
+
+    def namespace(self, prefix):
+        return FrameNamespace(self, prefix)
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name in self._memory:
+                self._memory.move_to_end(name)
+                return self._memory[name][0]
+            path = self._spilled[name][0]
+        # Spilled tables are not promoted back; they would only push another table out
+        return pd.read_parquet(path)
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._memory or name in self._spilled
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._memory) + list(self._spilled))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memory) + len(self._spilled)
+
+    def discard(self, name):
+        """Drop a table from memory or disk"""
+        with self._lock:
+            if name in self._memory:
+                self._memory_bytes -= self._memory.pop(name)[1]
+            if name in self._spilled:
+                _remove_file(self._spilled.pop(name)[0])
+
+    def track_file(self, path):
+        """Remove path together with the session, e.g. a spooled upload"""
+        with self._lock:
+            self._files.add(path)
+
+    def release_file(self, path):
+        """Remove a tracked file now"""
+        with self._lock:
+            self._files.discard(path)
+        _remove_file(path)
+
+    def spill_all(self):
+        """Move every in-memory table to disk, e.g. for an idle session"""
+        with self._lock:
+            self._enforce_budget(0)
+
+    def touch(self):
+        self.last_seen = time.time()
+
+    def stats(self):
+        """Bytes in memory and on disk, table counts and seconds since the session was last seen"""
+        with self._lock:
+            return {
+                'session_id': self.session_id,
+                'owner': self.owner,
+                'memory_bytes': self._memory_bytes,
+                'spilled_bytes': sum(disk for _, disk, _ in self._spilled.values()),
+                'spilled_memory_bytes': sum(size for _, _, size in self._spilled.values()),
+                'tables': len(self._memory),
+                'spilled_tables': len(self._spilled),
+                'spills': self.spill_count,
+                'files': len(self._files),
+                'idle_seconds': time.time() - self.last_seen
+            }
+
+    def close(self):
+        """Drop every table and remove the spill directory and tracked files"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._spilled.clear()
+            for path in self._files:
+                _remove_file(path)
+            self._files.clear()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def _enforce_budget(self, budget_bytes):
+        # Caller holds the lock
+        while self._memory_bytes > budget_bytes and self._memory:
+            name, (df, size) = next(iter(self._memory.items()))
+            if not self._spill(name, df, size):
+                break
+
+    def _spill(self, name, df, size):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.parquet")
+        try:
+            df.to_parquet(path)
+        except (OSError, ValueError, TypeError, NotImplementedError):
+            # Tables that cannot be written as Parquet stay in memory
+            _remove_file(path)
+            return False
+        del self._memory[name]
+        self._memory_bytes -= size
+        self._spilled[name] = (path, os.path.getsize(path), size)
+        self.spill_count += 1
+        return True
+
+
+class SessionStore:
+    """Process-wide registry of SessionFrames with cleanup of abandoned sessions"""
+
+    def __init__(self, spill_dir=DEFAULT_SPILL_DIR, budget_bytes=DEFAULT_SESSION_BUDGET_BYTES,
+                 idle_seconds=DEFAULT_IDLE_SECONDS, is_active=None):
+        """is_active(session_id) reports whether the browser is still connected; without it only idle time counts"""
+        self.spill_dir = spill_dir
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self.is_active = is_active
+        self._sessions = {}
+        self._last_sweep = time.time()
+        self._lock = threading.Lock()
+        os.makedirs(spill_dir, exist_ok=True)
+        self._remove_stale_spill_dirs()
+
+    def session(self, session_id, owner=None):
+        """The session's tables, created on first use; marks the session as seen"""
+        with self._lock:
+            frames = self._sessions.get(session_id)
+            if frames is None:
+                frames = SessionFrames(session_id, self.spill_dir, self.budget_bytes, owner)
+                self._sessions[session_id] = frames
+            if owner:
+                frames.owner = owner
+            sweep_due = time.time() - self._last_sweep >= SWEEP_INTERVAL_SECONDS
+        frames.touch()
+        if sweep_due:
+            self.sweep()
+        return frames
+
+    def close(self, session_id):
+        """Close a session, e.g. on logout"""
+        with self._lock:
+            frames = self._sessions.pop(session_id, None)
+        if frames is not None:
+            frames.close()
+
+    def sweep(self):
+        """
+        Close sessions disconnected past the grace period and spill idle ones that are still connected
+        Without is_active, sessions idle past the timeout are closed. Returns the number closed
+        """
+        now = time.time()
+        with self._lock:
+            self._last_sweep = now
+            candidates = list(self._sessions.values())
+        abandoned = []
+        for frames in candidates:
+            idle = now - frames.last_seen
+            if idle <= DISCONNECTED_GRACE_SECONDS:
+                continue
+            active = self.is_active(frames.session_id) if self.is_active else idle <= self.idle_seconds
+            if not active:
+                abandoned.append(frames)
+            elif idle > self.idle_seconds:
+                frames.spill_all()
+        for frames in abandoned:
+            self.close(frames.session_id)
+        return len(abandoned)
+
+    def report(self):
+        """Per-session memory and disk usage, largest in-memory footprint first"""
+        with self._lock:
+            candidates = list(self._sessions.values())
+        return sorted((frames.stats() for frames in candidates), key=lambda s: s['memory_bytes'], reverse=True)
+
+    def _remove_stale_spill_dirs(self):
+        # Spill directories of sessions from an earlier process that were never closed
+        cutoff = time.time() - self.idle_seconds
+        try:
+            entries = list(os.scandir(self.spill_dir))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                pass
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -4,10 +4,15 @@ Frontend-only version of Trulioo Contract Extractor
 Clean UI code with dummy data imported from separate file
 """
 
+import os
 import pandas as pd
 import streamlit as st
 import time
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from datetime import datetime
+from functools import partial
+from io import BytesIO
 
 # Import all dummy data functions
 from dummy_data import (
@@ -16,12 +21,30 @@ from dummy_data import (
     create_dummy_line_item_data,
     create_dummy_consumption_schedule,
     create_dummy_consumption_rate,
-    dummy_google_folders,
-    dummy_pdf_files,
-    create_dummy_extraction_results,
+    DummyDriveClient,
+    create_dummy_extraction_result,
     main_pipeline_dummy,
-    to_excel_dummy
+    DUMMY_PIPELINE_VERSION
 )
+from batch_extraction import (
+    duplicate_outcome, group_duplicates, results_summary, run_pipelined_extraction, summarize_batch
+)
+from job_queue import FINISHED_STATES, JOB_FAILED, JOB_QUEUED, PRIORITY_BATCH, PRIORITY_INTERACTIVE, JobQueue
+from result_cache import ResultCache, file_sha256
+from drive_listing import DriveListingCache
+from excel_export import WorkbookAppender, read_workbook, write_workbook
+from batch_export import EXPORT_FORMATS, BatchExport
+from batch_manifest import BatchManifest
+from contract_index import ContractIndex, contract_table_rows, drive_summary_rows
+from extraction_result import (
+    RESULT_TABLES, ExtractionResult, contract_summary, table_from_response
+)
+from normalize import normalize_frame
+from perf_timing import TimingRegistry
+from progress_tracker import ProgressAggregator, progress_text
+from extraction_client import ExtractionClient, TokenCache, token_url_fetcher
+from pdf_pages import new_page_executor, remove_stale_spooled, spool_upload
+from session_store import SessionStore
 
 # Streamlit page configuration
 st.set_page_config(
@@ -31,6 +54,221 @@ st.set_page_config(
 )
 
 
+# Seconds between job status polls while an extraction is running
+JOB_POLL_INTERVAL = 0.5
+# Rows sent to the browser per page of a results table
+PREVIEW_PAGE_SIZE = 500
+# Session table holding the Drive batch results
+DRIVE_RESULTS_TABLE = 'drive_results'
+# Result table built and shown as soon as a single extraction response arrives
+FIRST_PREVIEW_TABLE = 'contract'
+# Remote extraction endpoint; the dummy pipeline runs when this is unset
+EXTRACTION_API_URL = os.environ.get('EXTRACTION_API_URL')
+PIPELINE_VERSION = (
+    os.environ.get('EXTRACTION_PIPELINE_VERSION', 'remote-2') if EXTRACTION_API_URL else DUMMY_PIPELINE_VERSION
+)
+
+
+@st.cache_resource
+def get_job_queue():
+    """Process-wide job queue shared by every session"""
+    return JobQueue()
+
+
+@st.cache_resource
+def get_result_cache():
+    """Process-wide cache of pipeline responses keyed by PDF content"""
+    return ResultCache(PIPELINE_VERSION)
+
+
+@st.cache_resource
+def get_drive_listing():
+    """Process-wide cache of Drive folder and file listings, keyed by user"""
+    return DriveListingCache()
+
+
+@st.cache_resource
+def get_timing_registry():
+    """Process-wide store of per-stage timing spans"""
+    return TimingRegistry()
+
+
+@st.cache_resource
+def get_batch_manifest():
+    """Process-wide checkpoint manifest of Drive batch runs"""
+    return BatchManifest()
+
+
+@st.cache_resource
+def get_contract_index():
+    """Process-wide searchable index of every extracted contract"""
+    return ContractIndex()
+
+
+@st.cache_resource
+def get_page_executor():
+    """Process-wide process pool for page-level PDF text extraction"""
+    return new_page_executor()
+
+
+@st.cache_resource
+def get_extraction_client():
+    """Process-wide pooled client for the extraction endpoint, reusing its JWT until expiry"""
+    token_url = os.environ.get('EXTRACTION_TOKEN_URL')
+    if not token_url:
+        raise RuntimeError(
+            "EXTRACTION_API_URL is set but EXTRACTION_TOKEN_URL is not; "
+            "set it to the endpoint the extraction JWT is fetched from"
+        )
+    fetch_token = token_url_fetcher(
+        token_url,
+        {
+            'client_id': os.environ.get('EXTRACTION_CLIENT_ID'),
+            'client_secret': os.environ.get('EXTRACTION_CLIENT_SECRET')
+        }
+    )
+    return ExtractionClient(TokenCache(fetch_token))
+
+
+def session_is_active(session_id):
+    """Whether a browser is still connected to the session; assumed so outside a Streamlit server"""
+    if not Runtime.exists():
+        return True
+    return Runtime.instance().is_active_session(session_id)
+
+
+@st.cache_resource
+def get_session_store():
+    """Process-wide per-session result tables; spooled uploads left by an earlier process are removed"""
+    store = SessionStore(is_active=session_is_active)
+    remove_stale_spooled()
+    return store
+
+
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'local'
+
+
+def get_session_frames():
+    """This session's result tables, kept in memory up to the session budget and spilled to disk past it"""
+    return get_session_store().session(current_session_id(), owner=st.session_state.get('username'))
+
+
+def get_extraction_pipeline():
+    """The pipeline callable and its arguments after the PDF, for the configured endpoint"""
+    if EXTRACTION_API_URL:
+        return get_extraction_client().extract, (EXTRACTION_API_URL,)
+    return partial(main_pipeline_dummy, page_executor=get_page_executor()), ("dummy_endpoint", "dummy_token")
+
+
+def get_drive_client():
+    """Drive client for this session's Google connection"""
+    if st.session_state.get('google_drive_client') is None:
+        # Production builds a drive_client.DriveClient from the OAuth access token
+        st.session_state.google_drive_client = DummyDriveClient()
+    return st.session_state.google_drive_client
+
+
+def show_paginated_dataframe(df, key, page_size=PREVIEW_PAGE_SIZE, height=400):
+    """Display one page of a DataFrame so only that slice is sent to the browser"""
+    page_count = max(1, -(-len(df) // page_size))
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=key)
+    start = (page - 1) * page_size
+    # Normalized date columns are shown without a time of day
+    column_config = {
+        column: st.column_config.DateColumn(format="YYYY-MM-DD")
+        for column in df.columns if pd.api.types.is_datetime64_any_dtype(df[column])
+    }
+    st.dataframe(df.iloc[start:start + page_size], use_container_width=True, height=height, column_config=column_config)
+    if page_count > 1:
+        st.caption(f"Rows {start + 1:,}–{min(start + page_size, len(df)):,} of {len(df):,}")
+
+
+def download_drive_pdf(pdf, drive_client, timings):
+    """Download one Google Drive PDF"""
+    with timings.span('download', file=pdf['name']):
+        return drive_client.download(pdf['id'])
+
+
+def extract_drive_pdf(pdf, pdf_bytes, result_cache, pipeline, pipeline_args, timings, workbook=None):
+    """
+    Run the extraction pipeline for one downloaded Google Drive PDF and summarize the result
+    The file's seven tables are appended to the batch workbook and not kept afterwards
+    """
+    file_hash = file_sha256(pdf_bytes)
+    cache_key = result_cache.key_for_digest(file_hash)
+    response = result_cache.get_or_compute(
+        cache_key,
+        pipeline,
+        BytesIO(pdf_bytes),
+        *pipeline_args,
+        timings=timings
+    )
+    if workbook is not None:
+        with timings.span('workbook_append', file=pdf['name']):
+            result = ExtractionResult.from_response(response)
+            workbook.append(pdf['name'], result.sheets())
+        contract = result['contract']
+    else:
+        contract = table_from_response(response, 'contract')
+    # The dummy pipeline returns the same tables for every file, so it keeps its canned per-file summaries
+    if EXTRACTION_API_URL:
+        summary = contract_summary(pdf['name'], contract)
+    else:
+        summary = create_dummy_extraction_result(pdf)
+    # The cache key lets a resumed run rebuild the workbook without downloading the file again;
+    # the file hash is the document's search index key, as for single uploads
+    return {'summary': summary, 'cache_key': cache_key, 'file_hash': file_hash}
+
+
+def resume_drive_batch(manifest, result_cache, workbook, user, folder_id, pdfs):
+    """
+    Split a folder into files finished by an earlier run and files still to extract
+    Finished files are appended to the workbook from the result cache; those whose
+    response is no longer cached, or that were checkpointed without their file hash,
+    are extracted again. Returns (done by file ID, todo)
+    """
+    done, todo = manifest.plan(user, folder_id, pdfs)
+    evicted = []
+    for file_id, outcome in list(done.items()):
+        # Rebuilding the workbook from an earlier run's response is not a cache lookup
+        response = result_cache.get(outcome['result']['cache_key'], count=False)
+        if response is None or 'file_hash' not in outcome['result']:
+            del done[file_id]
+            evicted.append(outcome['file'])
+        else:
+            workbook.append(outcome['filename'], ExtractionResult.from_response(response).sheets())
+    if evicted:
+        manifest.mark_pending(user, folder_id, evicted)
+        todo = [pdf for pdf in pdfs if pdf['id'] not in done]
+    return done, todo
+
+
+def store_drive_results(results_df, failures, workbook=None):
+    """
+    Replace the Drive batch results, dropping the export files built for the old ones
+    The table goes to the session's frames; session state keeps only its summary
+    """
+    if st.session_state.get('google_extraction_exports') is not None:
+        st.session_state.google_extraction_exports.close()
+    if st.session_state.get('google_extraction_workbook') is not None:
+        st.session_state.google_extraction_workbook.close()
+    frames = get_session_frames()
+    if results_df is None:
+        frames.discard(DRIVE_RESULTS_TABLE)
+        st.session_state.google_extraction_results = None
+        st.session_state.google_extraction_exports = None
+    else:
+        frames.put(DRIVE_RESULTS_TABLE, results_df)
+        st.session_state.google_extraction_results = {'files': len(results_df), **results_summary(results_df)}
+        st.session_state.google_extraction_exports = BatchExport(partial(frames.get, DRIVE_RESULTS_TABLE))
+    st.session_state.google_extraction_failures = failures
+    st.session_state.google_extraction_workbook = workbook
+
+
 def show_auth_page():
     """Display the authentication page with dummy authentication"""
     
@@ -119,7 +357,9 @@ def show_google_drive_tab():
     if 'google_selected_folder' not in st.session_state:
         st.session_state.google_selected_folder = None
     if 'google_extraction_results' not in st.session_state:
-        st.session_state.google_extraction_results = []
+        st.session_state.google_extraction_results = None
+    if 'google_extraction_failures' not in st.session_state:
+        st.session_state.google_extraction_failures = []
     
     # Sub tabs for Google Drive functionality
     google_tab1, google_tab2, google_tab3 = st.tabs(["🔐 Connect Google Drive", "📁 Select Folder", "📄 Extract Contracts"])
@@ -141,6 +381,7 @@ def show_google_drive_tab():
                 with st.spinner("Connecting to Google Drive..."):
                     time.sleep(3)  # Simulate connection
                 st.session_state.google_authenticated = True
+                st.session_state.google_drive_client = DummyDriveClient()
                 st.success("Successfully connected to Google Drive!")
                 st.rerun()
             
@@ -148,8 +389,10 @@ def show_google_drive_tab():
             st.success("✅ Successfully connected to Google Drive!")
             if st.button("🔄 Disconnect Google Drive"):
                 st.session_state.google_authenticated = False
+                st.session_state.google_drive_client = None
+                get_drive_listing().invalidate(st.session_state.username)
                 st.session_state.google_selected_folder = None
-                st.session_state.google_extraction_results = []
+                store_drive_results(None, [])
                 st.rerun()
     
     with google_tab2:
@@ -160,8 +403,8 @@ def show_google_drive_tab():
         else:
             st.info("Select the folder containing your PDF files for extraction.")
             
-            # Use dummy folders
-            folders = dummy_google_folders()
+            # Cached per user, so reruns do not list Drive again
+            folders = get_drive_listing().get_folders(st.session_state.username, get_drive_client())
             folder_names = [folder['name'] for folder in folders]
             
             selected_folder_name = st.selectbox(
@@ -174,8 +417,10 @@ def show_google_drive_tab():
                 selected_folder = next(f for f in folders if f['name'] == selected_folder_name)
                 st.session_state.google_selected_folder = selected_folder
                 
-                # Show folder info and PDF count with dummy data
-                pdfs = dummy_pdf_files()
+                # Show folder info and PDF count from the cached listing
+                pdfs = get_drive_listing().get_folder_files(
+                    st.session_state.username, get_drive_client(), selected_folder['id']
+                )
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -192,7 +437,7 @@ def show_google_drive_tab():
                     }
                     for pdf in pdfs
                 ])
-                st.dataframe(pdf_df, use_container_width=True)
+                show_paginated_dataframe(pdf_df, key="google_folder_page")
     
     with google_tab3:
         st.subheader("Step 3: Extract Contract Information")
@@ -203,9 +448,34 @@ def show_google_drive_tab():
             st.warning("Please select a folder first.")
         else:
             folder = st.session_state.google_selected_folder
-            pdfs = dummy_pdf_files()
+            pdfs = get_drive_listing().get_folder_files(
+                st.session_state.username, get_drive_client(), folder['id']
+            )
             
             st.info(f"Ready to extract from {len(pdfs)} PDF files in '{folder['name']}'")
+            copy_count = sum(len(copies) for copies in group_duplicates(pdfs).values())
+            if copy_count:
+                st.caption(
+                    f"🧬 {copy_count} file(s) have the same size and checksum as another file in this folder; "
+                    "each document is extracted once and its result reused for the copies"
+                )
+            
+            manifest = get_batch_manifest()
+            checkpoint_counts = manifest.counts(st.session_state.username, folder['id'])
+            if checkpoint_counts.get('success'):
+                st.caption(
+                    f"♻️ {checkpoint_counts['success']} file(s) finished in an earlier run; "
+                    "unchanged ones are skipped and only pending or failed files are extracted"
+                )
+                if st.button("Start over", help="Forget the earlier run and extract every file again"):
+                    manifest.clear(st.session_state.username, folder['id'])
+                    st.rerun()
+            
+            job_queue = get_job_queue()
+            st.caption(
+                f"🧵 Files are extracted on the shared server pool, up to {job_queue.user_batch_quota} "
+                f"at a time for your account; single-file extractions always go first"
+            )
             
             col1, col2 = st.columns([2, 1])
             with col1:
@@ -214,49 +484,390 @@ def show_google_drive_tab():
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    extraction_results = create_dummy_extraction_results()
+                    def render_progress(snapshot):
+                        """Coalesced progress display, at most a few updates per second"""
+                        progress_bar.progress(snapshot['fraction'])
+                        status_text.text(progress_text(snapshot))
+                    
+                    timings = get_timing_registry().new_recorder('batch')
+                    st.session_state.google_extraction_timings = timings
+                    
+                    # Downloads of the next files overlap with extraction of earlier ones
+                    pipeline, pipeline_args = get_extraction_pipeline()
+                    result_cache = get_result_cache()
+                    # Every file's tables land in one workbook as it finishes
+                    workbook = WorkbookAppender([sheet_name for _, sheet_name, _ in RESULT_TABLES])
+                    user = st.session_state.username
+                    resumed, todo = resume_drive_batch(manifest, result_cache, workbook, user, folder['id'], pdfs)
+                    progress = ProgressAggregator(len(todo), render_progress)
+                    # Copies of a document wait for one extraction of it; a finished file is preferred as the original
+                    duplicates = group_duplicates(pdfs, preferred=resumed)
+                    pending_ids = {pdf['id'] for pdf in todo}
+                    copy_outcomes = {}
+                    
+                    def record_outcome(outcome):
+                        """Record a file in the manifest before counting it towards the progress"""
+                        manifest.record(user, folder['id'], outcome)
+                        progress.add(outcome['filename'], ok=outcome['status'] == 'success')
+                    
+                    def fan_out(outcome):
+                        """Give the copies of a finished file its result under their own names"""
+                        for pdf in duplicates.get(outcome['file']['id'], []):
+                            if pdf['id'] not in pending_ids:
+                                continue
+                            copy = duplicate_outcome(outcome, pdf)
+                            # The original's response was just computed or resumed; not a cache hit
+                            response = None
+                            if copy['result']:
+                                response = result_cache.get(copy['result']['cache_key'], count=False)
+                            if response is not None:
+                                workbook.append(copy['filename'], ExtractionResult.from_response(response).sheets())
+                            record_outcome(copy)
+                            copy_outcomes[pdf['id']] = copy
                     
-                    # Simulate processing each file
-                    for i, pdf in enumerate(pdfs[:3]):  # Only process first 3 for demo
-                        status_text.text(f"Processing: {pdf['name']} ({i+1}/{len(pdfs)})")
-                        time.sleep(1)  # Simulate processing time
-                        
-                        # Update progress
-                        progress_bar.progress((i + 1) / len(pdfs))
+                    def checkpoint_file(outcome, done, total):
+                        record_outcome(outcome)
+                        fan_out(outcome)
+                        progress.maybe_render()
                     
-                    st.session_state.google_extraction_results = extraction_results
-                    status_text.text("Extraction completed!")
-                    st.success(f"Successfully extracted information from {len(extraction_results)} files!")
+                    for outcome in resumed.values():
+                        fan_out(outcome)
+                    copy_ids = {pdf['id'] for copies in duplicates.values() for pdf in copies}
+                    new_outcomes = run_pipelined_extraction(
+                        [pdf for pdf in todo if pdf['id'] not in copy_ids],
+                        partial(download_drive_pdf, drive_client=get_drive_client(), timings=timings),
+                        partial(
+                            extract_drive_pdf,
+                            result_cache=result_cache,
+                            pipeline=pipeline,
+                            pipeline_args=pipeline_args,
+                            timings=timings,
+                            workbook=workbook
+                        ),
+                        on_file_done=checkpoint_file,
+                        extract_executor=job_queue.executor(user, PRIORITY_BATCH)
+                    )
+                    finished = {**resumed, **copy_outcomes, **{o['file']['id']: o for o in new_outcomes}}
+                    outcomes = [finished[pdf['id']] for pdf in pdfs]
+                    results, failures = summarize_batch(outcomes)
+                    extraction_results = [r['summary'] for r in results]
+                    with timings.span('index_results'):
+                        # Copies share their original's file hash, so only originals are indexed
+                        get_contract_index().add(user, [
+                            row for r in results if 'duplicate_of' not in r['summary']
+                            for row in drive_summary_rows(r['summary'], r['file_hash'])
+                        ])
+                    with timings.span('workbook_close'):
+                        workbook_file, _ = workbook.close()
+                    if not extraction_results:
+                        workbook_file.close()
+                        workbook_file = None
+                    
+                    # Built once here; reruns read the same DataFrame
+                    store_drive_results(
+                        normalize_frame(pd.DataFrame(extraction_results)) if extraction_results else None,
+                        [{'filename': f['filename'], 'error': f['error']} for f in failures],
+                        workbook_file
+                    )
+                    snapshot = progress.snapshot()
+                    progress_bar.progress(snapshot['fraction'])
+                    status_text.text(f"Extraction completed! {progress_text(snapshot)}")
+                    notes = []
+                    if resumed:
+                        notes.append(f"{len(resumed)} resumed from an earlier run")
+                    if copy_outcomes:
+                        notes.append(f"{len(copy_outcomes)} duplicate(s) reused another file's result")
+                    notes = f" ({'; '.join(notes)})" if notes else ""
+                    st.success(f"Successfully extracted information from {len(extraction_results)} files!{notes}")
+                    if failures:
+                        st.error(f"❌ {len(failures)} file(s) failed: " + ", ".join(f['filename'] for f in failures))
             
             with col2:
-                if st.session_state.google_extraction_results:
-                    # Download results as CSV
-                    df = pd.DataFrame(st.session_state.google_extraction_results)
-                    csv = df.to_csv(index=False)
-                    
+                if st.session_state.google_extraction_results is not None:
+                    # Files are built on the first click and reused until the results change
+                    exports = st.session_state.google_extraction_exports
+                    file_stem = f"google_drive_extraction_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                    for fmt, (label, extension, mime) in EXPORT_FORMATS.items():
+                        st.download_button(
+                            label=f"📥 Download Results ({label})",
+                            data=partial(exports.read, fmt),
+                            file_name=f"{file_stem}.{extension}",
+                            mime=mime,
+                            use_container_width=True
+                        )
+                    # All seven tables of every extracted file, with a source file column
                     st.download_button(
-                        label="📥 Download Results (CSV)",
-                        data=csv,
-                        file_name=f"google_drive_extraction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv",
+                        label="📥 Download Workbook (Excel)",
+                        data=partial(read_workbook, st.session_state.google_extraction_workbook),
+                        file_name=f"{file_stem}.xlsx",
+                        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                         use_container_width=True
                     )
             
             # Display results
-            if st.session_state.google_extraction_results:
-                st.markdown("### Extraction Results")
-                
-                results_df = pd.DataFrame(st.session_state.google_extraction_results)
-                st.dataframe(results_df, use_container_width=True)
-                
-                # Summary statistics
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Total Files Processed", len(st.session_state.google_extraction_results))
-                with col2:
-                    st.metric("Successful Extractions", len(st.session_state.google_extraction_results))
-                with col3:
-                    st.metric("Average Text Length", "1,250 chars")
+            if st.session_state.google_extraction_results is not None:
+                show_drive_results(
+                    st.session_state.google_extraction_results,
+                    st.session_state.google_extraction_failures
+                )
+
+
+@st.fragment
+def show_drive_results(summary, failures):
+    """Display the Drive batch results; paging reruns only this fragment"""
+    st.markdown("### Extraction Results")
+    
+    # Read from the session's frames, which may load it back from disk
+    results_df = get_session_frames().get(DRIVE_RESULTS_TABLE)
+    if results_df is None:
+        st.info("These results are no longer held on the server. Run the extraction again to see them.")
+    else:
+        show_paginated_dataframe(results_df, key="google_results_page")
+    
+    # Summary statistics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Files Processed", summary['files'] + len(failures))
+    with col2:
+        st.metric("Successful Extractions", summary['files'])
+    with col3:
+        st.metric("Total Contract Value", f"${summary['total_value']:,.0f}")
+    with col4:
+        average = summary['average_value']
+        st.metric("Average Contract Value", f"${average:,.0f}" if average is not None else "–")
+    details = [f"{status}: {count:,}" for status, count in summary['status_counts'].items()]
+    if summary['first_date'] is not None:
+        details.append(
+            f"contract dates {summary['first_date']:%Y-%m-%d} – {summary['last_date']:%Y-%m-%d}"
+        )
+    if details:
+        st.caption(" · ".join(details))
+
+
+def build_remaining_outputs(response, prebuilt, timings, progress_callback=None):
+    """
+    Build the result tables not in prebuilt and the Excel workbook; runs as a background job
+    The workbook is streamed to a spooled temporary file rather than held as bytes
+    Returns (tables by name, workbook file, seconds spent writing it)
+    """
+    if progress_callback:
+        progress_callback(0.0, "📊 Building the remaining tables...")
+    with timings.span('build_tables'):
+        result = ExtractionResult.from_response(response, prebuilt=prebuilt)
+
+    # Create Excel file
+    if progress_callback:
+        progress_callback(0.5, "📊 Building the Excel workbook...")
+    with timings.span('excel_build'):
+        df_xlsx, export_seconds = write_workbook(result.sheets())
+    return result.tables, df_xlsx, export_seconds
+
+
+@st.fragment
+def show_result_preview(result):
+    """
+    Display the selected result table only; result maps table names to the tables built so far
+    Switching tables or pages reruns this fragment instead of the whole app
+    """
+    tables = {label: name for name, _, label in RESULT_TABLES if name in result}
+    labels = list(tables)
+    if len(tables) < len(RESULT_TABLES):
+        st.caption("The other tables are still being built and appear here when they are ready")
+    selected = st.segmented_control(
+        "Table",
+        options=labels,
+        default=labels[0],
+        key="preview_table",
+        label_visibility="collapsed"
+    )
+    selected = selected or labels[0]
+    # Only the selected table is read, so spilled tables stay on disk
+    show_paginated_dataframe(result[tables[selected]], key=f"preview_page_{labels.index(selected)}")
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def show_job_progress(job_id):
+    """Poll a running job; only this fragment reruns until the job finishes"""
+    job_queue = get_job_queue()
+    job = job_queue.get(job_id)
+    if job is None or job['status'] in FINISHED_STATES:
+        # Rerun the app once so the finished job is collected and rendered
+        st.rerun()
+    st.progress(job['progress'])
+    st.text(job['message'])
+    if job['status'] == JOB_QUEUED:
+        queue_stats = job_queue.stats()
+        st.caption(
+            f"Waiting {time.time() - job['submitted_at']:.1f}s · "
+            f"{queue_stats['queued'][PRIORITY_INTERACTIVE]} single-file job(s) queued · "
+            f"{queue_stats['running']}/{queue_stats['workers']} workers busy"
+        )
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def show_workbook_build(job_id):
+    """Disabled download while the workbook is built; reruns the app once so the finished build is collected"""
+    job = get_job_queue().get(job_id)
+    if job is None or job['status'] in FINISHED_STATES:
+        st.rerun()
+    st.download_button(
+        label='📥 Download Result',
+        data=b'',
+        file_name='Legacy_Data_Line_Items.xlsx',
+        disabled=True,
+        use_container_width=True
+    )
+    st.caption(job['message'])
+
+
+def show_extraction_results(entry):
+    """Display the result tables and the workbook download, which is enabled once the workbook is built"""
+    st.success("✅ Extraction completed successfully!")
+    
+    # Show preview of data
+    with st.expander("📊 Preview Excel File", expanded=True):
+        show_result_preview(get_session_frames().namespace('single'))
+    if entry['first_table_seconds'] is None:
+        entry['first_table_seconds'] = time.time() - entry['response_at']
+        entry['timings'].record('time_to_first_table', entry['first_table_seconds'])
+
+    if entry['xlsx'] is None:
+        show_workbook_build(entry['build_job_id'])
+        return
+
+    # Download button, the workbook is only read when the download is requested
+    st.download_button(
+        label='📥 Download Result',
+        data=partial(read_workbook, entry['xlsx']),
+        file_name='Legacy_Data_Line_Items.xlsx',
+        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        use_container_width=True
+    )
+    st.caption(
+        f"First table shown {entry['first_table_seconds']:.2f}s after the response arrived · "
+        f"workbook built in {entry['export_seconds']:.2f}s"
+    )
+
+
+def get_single_extraction(uploaded_file):
+    """
+    Return the session's extraction entry for the uploaded file
+    The upload is spooled to disk once and the pipeline reads that copy. The entry
+    is keyed by the file's content hash; uploading a different document evicts the
+    previous entry together with its result, workbook and spooled file
+    """
+    entry = st.session_state.single_extraction
+    if entry is not None and entry['file_id'] == uploaded_file.file_id:
+        return entry
+
+    frames = get_session_frames()
+    pdf_path, file_hash = spool_upload(uploaded_file)
+    # Removed with the session if it is abandoned before the upload is discarded
+    frames.track_file(pdf_path)
+    if entry is not None and entry['file_hash'] == file_hash:
+        # Same document uploaded again, keep its results
+        frames.release_file(pdf_path)
+        entry['file_id'] = uploaded_file.file_id
+        return entry
+
+    discard_single_extraction(entry)
+    st.session_state.single_extraction = {
+        'file_id': uploaded_file.file_id,
+        'file_hash': file_hash,
+        'file_name': uploaded_file.name,
+        'pdf_path': pdf_path,
+        'job_id': None,
+        'error': None,
+        'result': None,
+        'xlsx': None,
+        'export_seconds': None,
+        'build_job_id': None,
+        'response_at': None,
+        'first_table_seconds': None,
+        'timings': None
+    }
+    return st.session_state.single_extraction
+
+
+def discard_single_extraction(entry):
+    """Release the jobs, tables, workbook and spooled upload of an extraction entry"""
+    if entry is None:
+        return
+    if entry['xlsx'] is not None:
+        entry['xlsx'].close()
+    job_queue = get_job_queue()
+    if entry['build_job_id'] is not None:
+        job_queue.forget(entry['build_job_id'])
+    frames = get_session_frames()
+    frames.namespace('single').clear()
+    release_upload = partial(frames.release_file, entry['pdf_path'])
+    if entry['job_id'] is not None:
+        # A running extraction still reads the spooled upload, so it is removed once the job stops
+        job_queue.forget(entry['job_id'], then=release_upload)
+    else:
+        release_upload()
+
+
+def index_contract_table(index, owner, df, document, document_key, timings):
+    """Add a single extraction's contract table to the search index"""
+    with timings.span('index_results'):
+        index.add(owner, contract_table_rows(df, document, document_key))
+
+
+def store_single_extraction(entry, response, response_at=None):
+    """
+    Build the first table now and queue the other tables and the workbook as a background job
+    The first table is on screen while the rest is built; see collect_workbook_build
+    """
+    entry['response_at'] = response_at or time.time()
+    entry['first_table_seconds'] = None
+    try:
+        with entry['timings'].span('first_table'):
+            first_table = table_from_response(response, FIRST_PREVIEW_TABLE)
+        # The tables live in the session's frames so they count towards its memory budget
+        tables = get_session_frames().namespace('single')
+        tables.clear()
+        tables.put(FIRST_PREVIEW_TABLE, first_table)
+        entry['error'] = None
+    except Exception as e:
+        entry['error'] = f"Error processing response: {str(e)}"
+        return
+    job_queue = get_job_queue()
+    # Indexing is not needed for the preview either, so it runs next to the workbook build
+    job_queue.enqueue(
+        st.session_state.username,
+        PRIORITY_INTERACTIVE,
+        partial(
+            index_contract_table,
+            get_contract_index(),
+            st.session_state.username,
+            first_table,
+            entry['file_name'],
+            entry['file_hash'],
+            entry['timings']
+        )
+    )
+    entry['build_job_id'] = job_queue.submit(
+        build_remaining_outputs,
+        response,
+        {FIRST_PREVIEW_TABLE: first_table},
+        entry['timings'],
+        owner=st.session_state.username,
+        priority=PRIORITY_INTERACTIVE
+    )
+
+
+def collect_workbook_build(entry, build):
+    """Keep the tables and workbook of a finished background build on the session entry"""
+    if build['status'] == JOB_FAILED:
+        entry['error'] = f"Error processing response: {build['error']}"
+        return
+    built, entry['xlsx'], entry['export_seconds'] = build['result']
+    tables = get_session_frames().namespace('single')
+    for name, df in built.items():
+        if name not in tables:
+            tables.put(name, df)
+    entry['result'] = ExtractionResult(tables)
 
 
 def show_single_extraction_tab():
@@ -265,6 +876,10 @@ def show_single_extraction_tab():
     st.title("🛠️ Trulioo Contract Extractor")
     st.caption("Easily extract person match details from a single order form")
 
+    # Initialize single extraction session state
+    if 'single_extraction' not in st.session_state:
+        st.session_state.single_extraction = None
+
     # File upload
     uploaded_file = st.file_uploader(
         "Upload an order form",
@@ -274,99 +889,166 @@ def show_single_extraction_tab():
     )
 
     if uploaded_file is not None:
+        job_queue = get_job_queue()
+        entry = get_single_extraction(uploaded_file)
+        job = job_queue.get(entry['job_id']) if entry['job_id'] else None
+        job_running = job is not None and job['status'] not in FINISHED_STATES
+        build = job_queue.get(entry['build_job_id']) if entry['build_job_id'] else None
+        building = build is not None and build['status'] not in FINISHED_STATES
         
         # Process button
-        if st.button("🔄 Extract", type="primary", use_container_width=True):
-            try:
-                # Create progress bar and status text
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                def update_progress(progress_value, status_message):
-                    """Callback function to update progress bar and status"""
-                    progress_bar.progress(progress_value)
-                    status_text.text(status_message)
-                
-                # Use the dummy main pipeline with progress callback
-                response = main_pipeline_dummy(
-                    uploaded_file, 
-                    "dummy_endpoint", 
-                    "dummy_token",
-                    progress_callback=update_progress
-                )
+        if st.button("🔄 Extract", type="primary", use_container_width=True, disabled=job_running):
+            if entry['result'] is None and not building:
+                entry['timings'] = get_timing_registry().new_recorder('single')
+                result_cache = get_result_cache()
+                cache_key = result_cache.key_for_digest(entry['file_hash'])
+                with entry['timings'].span('cache_lookup'):
+                    # A miss is looked up and counted by get_or_compute on the worker
+                    response = result_cache.get(cache_key) if cache_key in result_cache else None
                 
-                # Clear the status text after completion
-                status_text.empty()
-                progress_bar.empty()
-                
-                # Process the response
-                res = response['output_records']
-                
-                # Arrange dataframes
-                df_contract = pd.DataFrame(res[0]["data"])
-                df_subscription = pd.DataFrame(res[1]["data"])
-                df_lineitemsource = pd.DataFrame(res[2]["data"])
-                df_subconsumptionschedule = pd.DataFrame(res[3]["data"])
-                df_subconsumptionrate = pd.DataFrame(res[4]["data"])
-                df_lisconsmptionschedule = pd.DataFrame(res[5]["data"])
-                df_lisconsumptionrate = pd.DataFrame(res[6]["data"])
-
-                # Create Excel file
-                df_xlsx = to_excel_dummy(
-                    df_contract=df_contract, 
-                    df_subscription=df_subscription,
-                    df_lineitemsource=df_lineitemsource,
-                    df_subconsumptionschedule=df_subconsumptionschedule,
-                    df_subconsumptionrate=df_subconsumptionrate,
-                    df_lisconsmptionschedule=df_lisconsmptionschedule,
-                    df_lisconsumptionrate=df_lisconsumptionrate
-                )
+                if response is not None:
+                    store_single_extraction(entry, response)
+                    building = entry['build_job_id'] is not None
+                else:
+                    # Run the main pipeline on a background worker; the same document
+                    # extracted elsewhere at the same time is waited for instead of run again
+                    pipeline, pipeline_args = get_extraction_pipeline()
+                    entry['job_id'] = job_queue.submit(
+                        result_cache.get_or_compute,
+                        cache_key,
+                        pipeline,
+                        entry['pdf_path'],
+                        *pipeline_args,
+                        owner=st.session_state.username,
+                        priority=PRIORITY_INTERACTIVE,
+                        timings=entry['timings']
+                    )
+                    entry['error'] = None
+                    job = job_queue.get(entry['job_id'])
+                    job_running = True
 
-                st.success("✅ Extraction completed successfully!")
-                
-                # Show preview of data
-                with st.expander("📊 Preview Excel File", expanded=True):
-                    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-                        "📋 Contract Data", 
-                        "📊 Subscription Data",
-                        "📄 Line Item Source",
-                        "📅 Sub Consumption Schedule", 
-                        "💰 Sub Consumption Rate",
-                        "📋 LIS Consumption Schedule",
-                        "💸 LIS Consumption Rate"
-                    ])
-                    
-                    with tab1:
-                        st.dataframe(df_contract, use_container_width=True, height=400)
-                    
-                    with tab2:
-                        st.dataframe(df_subscription, use_container_width=True, height=400)      
+        if job is not None and not job_running:
+            # Collect the finished job once, then release it from the queue
+            if job['status'] == JOB_FAILED:
+                entry['error'] = f"Error processing response: {job['error']}"
+            else:
+                store_single_extraction(entry, job['result'], response_at=job['finished_at'])
+                building = entry['build_job_id'] is not None
+            job_queue.forget(entry['job_id'])
+            entry['job_id'] = None
 
-                    with tab3:
-                        st.dataframe(df_lineitemsource, use_container_width=True, height=400) 
+        if entry['build_job_id'] is not None and not building:
+            # Collect the finished build once; an expired build leaves Extract to start over
+            if build is not None:
+                collect_workbook_build(entry, build)
+            job_queue.forget(entry['build_job_id'])
+            entry['build_job_id'] = None
 
-                    with tab4:
-                        st.dataframe(df_subconsumptionschedule, use_container_width=True, height=400) 
+        if job_running:
+            # Poll the job and show its progress until it finishes
+            show_job_progress(entry['job_id'])
+        elif entry['error']:
+            st.error(f"❌ {entry['error']}")
+        elif entry['result'] is not None or building:
+            with entry['timings'].span('render_results'):
+                show_extraction_results(entry)
 
-                    with tab5:
-                        st.dataframe(df_subconsumptionrate, use_container_width=True, height=400) 
 
-                    with tab6:
-                        st.dataframe(df_lisconsmptionschedule, use_container_width=True, height=400) 
+@st.fragment
+def show_search_tab():
+    """Search the contracts indexed from earlier extractions; filtering reruns only this fragment"""
+    st.title("🔎 Search Past Extractions")
+    st.caption("Look up contracts from earlier extractions without running them again")
 
-                    with tab7:
-                        st.dataframe(df_lisconsumptionrate, use_container_width=True, height=400) 
+    index = get_contract_index()
+    user = st.session_state.username
+    indexed = index.count(user)
+    if not indexed:
+        st.info("No contracts indexed yet. Results from the extraction tabs are added here automatically.")
+        return
 
-                # Download button
-                st.download_button(
-                    label='📥 Download Result',
-                    data=df_xlsx,
-                    file_name='Legacy_Data_Line_Items.xlsx',
-                    use_container_width=True
-                )
+    text = st.text_input("Party, contract type or file name", placeholder="e.g. ABC Corporation")
+    col1, col2 = st.columns(2)
+    with col1:
+        statuses = st.multiselect("Status", index.statuses(user))
+    with col2:
+        date_range = st.date_input("Contract date", value=[], format="YYYY-MM-DD")
+    col3, col4 = st.columns(2)
+    with col3:
+        min_value = st.number_input("Minimum value", min_value=0.0, value=None, step=1000.0)
+    with col4:
+        max_value = st.number_input("Maximum value", min_value=0.0, value=None, step=1000.0)
+
+    started = time.perf_counter()
+    results_df, matches = index.search(
+        user,
+        text=text,
+        statuses=statuses,
+        date_from=date_range[0] if len(date_range) > 0 else None,
+        date_to=date_range[1] if len(date_range) > 1 else None,
+        min_value=min_value,
+        max_value=max_value
+    )
+    elapsed = time.perf_counter() - started
 
-            except Exception as e:
-                st.error(f"❌ Error processing response: {str(e)}")
+    st.caption(f"{matches:,} of {indexed:,} indexed contracts match · {elapsed * 1000:.0f} ms")
+    if len(results_df):
+        show_paginated_dataframe(results_df, key="search_results_page")
+    if matches > len(results_df):
+        st.caption(f"Showing the {len(results_df):,} most recent matches; add filters to narrow them down")
+
+
+def show_performance_panel():
+    """Sidebar panel with per-stage timings across jobs and for this session"""
+    registry = get_timing_registry()
+    st.markdown("**📈 Performance**")
+    
+    summary = registry.summary()
+    if not summary:
+        st.caption("No timings recorded yet.")
+        return
+    st.dataframe(
+        pd.DataFrame(summary).round(1),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    entry = st.session_state.get('single_extraction')
+    if entry is not None and entry['timings'] is not None:
+        st.caption("Last single extraction (s)")
+        st.json({stage: round(seconds, 3) for stage, seconds in entry['timings'].stage_totals().items()})
+    
+    st.caption("Result tables per session (MB)")
+    sessions = get_session_store().report()
+    st.dataframe(
+        pd.DataFrame([
+            {
+                'user': s['owner'],
+                'in memory': round(s['memory_bytes'] / 2**20, 1),
+                'spilled': round(s['spilled_bytes'] / 2**20, 1),
+                'tables': s['tables'] + s['spilled_tables'],
+                'idle (s)': round(s['idle_seconds'])
+            }
+            for s in sessions
+        ]),
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    st.download_button(
+        "Export Prometheus text",
+        data=registry.to_prometheus,
+        file_name="extraction_timings.prom",
+        mime="text/plain",
+        use_container_width=True
+    )
+    st.download_button(
+        "Export JSON lines",
+        data=registry.to_json_lines,
+        file_name="extraction_timings.jsonl",
+        mime="application/jsonl",
+        use_container_width=True
+    )
 
 
 def main_app():
@@ -379,13 +1061,17 @@ def main_app():
 
         if st.button("🚪 Logout", use_container_width=True):
             # Clear session state
-            for key in ['authenticated', 'username', 'google_authenticated', 'google_selected_folder', 'google_extraction_results']:
+            get_drive_listing().invalidate(st.session_state.username)
+            discard_single_extraction(st.session_state.get('single_extraction'))
+            get_session_store().close(current_session_id())
+            for key in ['authenticated', 'username', 'google_authenticated', 'google_drive_client', 'google_selected_folder', 'google_extraction_results', 'google_extraction_failures', 'google_extraction_timings',
+                        'google_extraction_exports', 'google_extraction_workbook', 'single_extraction']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
 
     # Create tabs for Multiple and Single Extraction
-    tab1, tab2 = st.tabs(["Multiple Extraction", "Single Extraction"])
+    tab1, tab2, tab3 = st.tabs(["Multiple Extraction", "Single Extraction", "Search"])
 
     with tab1:
         show_google_drive_tab()
@@ -393,6 +1079,31 @@ def main_app():
     with tab2:
         show_single_extraction_tab()
 
+    with tab3:
+        show_search_tab()
+
+    # Rendered after the tabs so the counters and timings include this run
+    with st.sidebar:
+        cache_stats = get_result_cache().stats()
+        st.caption(f"🗄️ Result cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+        session_stats = get_session_frames().stats()
+        st.caption(
+            f"💾 Your results: {session_stats['memory_bytes'] / 2**20:.1f} MB in memory · "
+            f"{session_stats['spilled_bytes'] / 2**20:.1f} MB spilled to disk "
+            f"(budget {get_session_store().budget_bytes / 2**20:.0f} MB)"
+        )
+        queue_stats = get_job_queue().stats()
+        st.caption(
+            f"🧵 Workers: {queue_stats['running']}/{queue_stats['workers']} busy · "
+            f"queued: {queue_stats['queued'][PRIORITY_INTERACTIVE]} single / {queue_stats['queued'][PRIORITY_BATCH]} batch "
+            f"(yours: {queue_stats['queued_by_owner'].get(st.session_state.username, 0)}) · "
+            f"p95 wait: {queue_stats[f'{PRIORITY_INTERACTIVE}_wait_p95']:.1f}s single / "
+            f"{queue_stats[f'{PRIORITY_BATCH}_wait_p95']:.1f}s batch"
+        )
+        
+        if st.toggle("Show performance panel", key="show_performance_panel"):
+            show_performance_panel()
+
 
 def main():
     """Main function that handles authentication flow"""
@@ -0,0 +1,121 @@
+# tests/test_batch_extraction.py
+"""Drive batch extraction engine: concurrency against the dummy pipeline, per-file failures, prefetch and duplicates"""
+
+import threading
+import time
+from functools import partial
+from io import BytesIO
+
+import pytest
+
+from batch_extraction import ByteBudget, duplicate_outcome, group_duplicates, run_pipelined_extraction
+from dummy_data import main_pipeline_dummy
+
+# Seconds main_pipeline_dummy sleeps per file at delay_scale=1
+DUMMY_PIPELINE_SECONDS = 2.8
+
+
+def make_pdfs(count, size=100):
+    return [{'id': f"pdf_{i}", 'name': f"file_{i}.pdf", 'size': str(size)} for i in range(count)]
+
+
+def test_concurrent_extractions_overlap_against_dummy_pipeline():
+    delay_scale = 0.1
+    dummy = partial(main_pipeline_dummy, delay_scale=delay_scale, rows=10)
+    pdfs = make_pdfs(8)
+
+    started = time.perf_counter()
+    outcomes = run_pipelined_extraction(
+        pdfs, lambda pdf: b'%PDF',
+        lambda pdf, pdf_bytes: dummy(BytesIO(pdf_bytes), 'dummy_endpoint', 'dummy_token'),
+        max_workers=8
+    )
+    elapsed = time.perf_counter() - started
+
+    serial = len(pdfs) * DUMMY_PIPELINE_SECONDS * delay_scale
+    assert all(o['status'] == 'success' for o in outcomes)
+    assert len(outcomes[0]['result']['output_records']) == 7
+    assert elapsed < serial / 2
+
+
+def test_failing_file_is_recorded_and_the_rest_complete():
+    pdfs = make_pdfs(6)
+    progress = []
+
+    def pipeline(pdf, pdf_bytes):
+        if pdf['id'] == 'pdf_2':
+            raise RuntimeError('unreadable PDF')
+        return pdf_bytes.decode()
+
+    outcomes = run_pipelined_extraction(
+        pdfs, lambda pdf: pdf['id'].encode(), pipeline, max_workers=3,
+        on_file_done=lambda outcome, done, total: progress.append((done, total))
+    )
+    assert [o['filename'] for o in outcomes] == [pdf['name'] for pdf in pdfs]
+    assert [o['status'] for o in outcomes] == ['success', 'success', 'failed', 'success', 'success', 'success']
+    assert outcomes[2]['error'] == 'unreadable PDF'
+    assert outcomes[0]['result'] == 'pdf_0'
+    assert progress == [(done, 6) for done in range(1, 7)]
+
+
+def test_failing_download_is_recorded_as_failed_file():
+    def download(pdf):
+        if pdf['id'] == 'pdf_1':
+            raise OSError('download interrupted')
+        return b'%PDF'
+
+    outcomes = run_pipelined_extraction(make_pdfs(3), download, lambda pdf, pdf_bytes: len(pdf_bytes))
+    assert [o['status'] for o in outcomes] == ['success', 'failed', 'success']
+    assert outcomes[1]['error'] == 'download interrupted'
+
+
+def test_prefetch_stays_within_byte_budget():
+    held = []
+    lock = threading.Lock()
+    in_flight = [0]
+
+    def download(pdf):
+        with lock:
+            in_flight[0] += 1
+            held.append(in_flight[0])
+        return b'%PDF'
+
+    def pipeline(pdf, pdf_bytes):
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+
+    run_pipelined_extraction(make_pdfs(20, size=100), download, pipeline, prefetch_bytes=300)
+    # Files are admitted by listed size, so at most three 100-byte files are held at once
+    assert max(held) <= 3
+
+
+def test_byte_budget_admits_oversized_file_alone():
+    budget = ByteBudget(10)
+    budget.acquire(50)
+    assert budget.used == 50
+    budget.release(50)
+    assert budget.used == 0
+
+
+@pytest.mark.parametrize('preferred, representative', [((), 'a'), (('c',), 'c')])
+def test_group_duplicates_by_size_and_checksum(preferred, representative):
+    pdfs = [
+        {'id': 'a', 'size': '10', 'md5Checksum': 'x'},
+        {'id': 'b', 'size': '10', 'md5Checksum': 'y'},
+        {'id': 'c', 'size': '10', 'md5Checksum': 'x'},
+        {'id': 'd', 'size': '10'}
+    ]
+    groups = group_duplicates(pdfs, preferred=preferred)
+    assert list(groups) == [representative]
+    assert [pdf['id'] for pdf in groups[representative]] == [i for i in ('a', 'c') if i != representative]
+
+
+def test_duplicate_outcome_names_the_copy_and_its_original():
+    outcome = run_pipelined_extraction(
+        make_pdfs(1), lambda pdf: b'x', lambda pdf, pdf_bytes: {'summary': {'filename': pdf['name']}}
+    )[0]
+    copy = duplicate_outcome(outcome, {'id': 'copy', 'name': 'copy.pdf'})
+    assert copy['filename'] == 'copy.pdf'
+    assert copy['result']['summary'] == {'filename': 'copy.pdf', 'duplicate_of': 'file_0.pdf'}
+    assert outcome['result']['summary'] == {'filename': 'file_0.pdf'}
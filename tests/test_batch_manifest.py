@@ -0,0 +1,121 @@
+# tests/test_batch_manifest.py
+"""BatchManifest resume logic and resuming a Drive batch from the result cache"""
+
+from batch_manifest import STATUS_FAILED, STATUS_PENDING, STATUS_SUCCESS, BatchManifest
+from dummy_data import main_pipeline_dummy
+from result_cache import ResultCache
+from streamlit_frontend_only import resume_drive_batch
+
+USER = 'alice@example.com'
+FOLDER = 'folder_1'
+
+
+def make_pdfs(count, modified='2024-01-01T00:00:00Z'):
+    return [{'id': f"pdf_{i}", 'name': f"file_{i}.pdf", 'modifiedTime': modified} for i in range(count)]
+
+
+def outcome(pdf, status=STATUS_SUCCESS, result=None, error=None):
+    return {'filename': pdf['name'], 'file': pdf, 'status': status, 'result': result, 'error': error, 'elapsed': 0.1}
+
+
+def result_for(pdf):
+    return {'summary': {'filename': pdf['name']}, 'cache_key': f"v1-{pdf['id']}", 'file_hash': pdf['id']}
+
+
+def run_batch(manifest, pdfs, failed=()):
+    """Plan a folder and checkpoint every planned file, failing those in failed"""
+    done, todo = manifest.plan(USER, FOLDER, pdfs)
+    for pdf in todo:
+        if pdf['id'] in failed:
+            manifest.record(USER, FOLDER, outcome(pdf, STATUS_FAILED, error='endpoint down'))
+        else:
+            manifest.record(USER, FOLDER, outcome(pdf, result=result_for(pdf)))
+    return done, todo
+
+
+def test_first_plan_marks_every_file_pending():
+    manifest = BatchManifest(':memory:')
+    pdfs = make_pdfs(3)
+    done, todo = manifest.plan(USER, FOLDER, pdfs)
+    assert done == {}
+    assert todo == pdfs
+    assert manifest.counts(USER, FOLDER) == {STATUS_PENDING: 3}
+
+
+def test_unchanged_files_are_skipped_and_changed_ones_run_again():
+    manifest = BatchManifest(':memory:')
+    pdfs = make_pdfs(3)
+    run_batch(manifest, pdfs)
+
+    changed = dict(pdfs[1], modifiedTime='2024-06-01T00:00:00Z')
+    done, todo = manifest.plan(USER, FOLDER, [pdfs[0], changed, pdfs[2]])
+    assert sorted(done) == ['pdf_0', 'pdf_2']
+    assert done['pdf_0']['result'] == result_for(pdfs[0])
+    assert done['pdf_0']['status'] == STATUS_SUCCESS
+    assert todo == [changed]
+    assert manifest.counts(USER, FOLDER) == {STATUS_SUCCESS: 2, STATUS_PENDING: 1}
+
+
+def test_failed_files_are_queued_again():
+    manifest = BatchManifest(':memory:')
+    pdfs = make_pdfs(3)
+    run_batch(manifest, pdfs, failed={'pdf_1'})
+    assert manifest.counts(USER, FOLDER) == {STATUS_SUCCESS: 2, STATUS_FAILED: 1}
+
+    done, todo = manifest.plan(USER, FOLDER, pdfs)
+    assert sorted(done) == ['pdf_0', 'pdf_2']
+    assert todo == [pdfs[1]]
+
+
+def test_mark_pending_clears_the_stored_result():
+    manifest = BatchManifest(':memory:')
+    pdfs = make_pdfs(2)
+    run_batch(manifest, pdfs)
+    manifest.mark_pending(USER, FOLDER, [pdfs[0]])
+
+    done, todo = manifest.plan(USER, FOLDER, pdfs)
+    assert list(done) == ['pdf_1']
+    assert todo == [pdfs[0]]
+    stored = manifest._conn.execute(
+        "SELECT result FROM batch_files WHERE file_id = 'pdf_0'"
+    ).fetchone()[0]
+    assert stored is None
+
+
+def test_checkpoints_are_kept_per_user_and_folder():
+    manifest = BatchManifest(':memory:')
+    pdfs = make_pdfs(2)
+    run_batch(manifest, pdfs)
+    assert manifest.plan('bob@example.com', FOLDER, pdfs)[1] == pdfs
+    assert manifest.plan(USER, 'folder_2', pdfs)[1] == pdfs
+    manifest.clear(USER, FOLDER)
+    assert manifest.plan(USER, FOLDER, pdfs)[1] == pdfs
+
+
+class RecordingWorkbook:
+    """Stands in for the batch WorkbookAppender and records which files were appended"""
+
+    def __init__(self):
+        self.appended = []
+
+    def append(self, filename, sheets):
+        self.appended.append(filename)
+
+
+def test_resume_requeues_files_whose_response_was_evicted():
+    manifest = BatchManifest(':memory:')
+    cache = ResultCache('v1', cache_dir=None)
+    pdfs = make_pdfs(3)
+    run_batch(manifest, pdfs)
+    response = main_pipeline_dummy(None, 'dummy_endpoint', 'dummy_token', delay_scale=0, rows=5)
+    # pdf_1's response is no longer cached
+    cache.put('v1-pdf_0', response)
+    cache.put('v1-pdf_2', response)
+
+    workbook = RecordingWorkbook()
+    done, todo = resume_drive_batch(manifest, cache, workbook, USER, FOLDER, pdfs)
+    assert sorted(done) == ['pdf_0', 'pdf_2']
+    assert todo == [pdfs[1]]
+    assert workbook.appended == ['file_0.pdf', 'file_2.pdf']
+    assert manifest.counts(USER, FOLDER) == {STATUS_SUCCESS: 2, STATUS_PENDING: 1}
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (0, 0)
@@ -0,0 +1,60 @@
+# tests/test_contract_index.py
+"""ContractIndex: one entry per document whichever path indexed it, and search filters"""
+
+import pandas as pd
+
+from contract_index import ContractIndex, contract_table_rows, drive_summary_rows
+
+FILE_HASH = 'a' * 64
+
+
+def contract_table():
+    return pd.DataFrame([{
+        'Contract ID': 'C-1',
+        'Client Name': 'Acme Corp',
+        'Contract Type': 'Subscription',
+        'Status': 'Active',
+        'Start Date': pd.Timestamp('2024-01-01'),
+        'End Date': pd.Timestamp('2025-01-01'),
+        'Contract Value': 1200.0
+    }])
+
+
+def drive_summary():
+    return {
+        'filename': 'acme.pdf',
+        'contract_date': '2024-01-01',
+        'party_1': 'Acme Corp',
+        'party_2': None,
+        'contract_value': 1200.0,
+        'contract_type': 'Subscription',
+        'status': 'Active'
+    }
+
+
+def test_upload_then_drive_batch_keeps_one_entry():
+    index = ContractIndex(':memory:')
+    index.add('alice', contract_table_rows(contract_table(), 'acme.pdf', FILE_HASH))
+    index.add('alice', drive_summary_rows(drive_summary(), FILE_HASH))
+    df, total = index.search('alice', text='acme')
+    assert total == 1
+    assert df.iloc[0]['source'] == 'drive'
+
+
+def test_drive_batch_then_upload_keeps_one_entry():
+    index = ContractIndex(':memory:')
+    index.add('alice', drive_summary_rows(drive_summary(), FILE_HASH))
+    index.add('alice', contract_table_rows(contract_table(), 'acme.pdf', FILE_HASH))
+    df, total = index.search('alice')
+    assert total == 1
+    assert df.iloc[0]['contract_id'] == 'C-1'
+
+
+def test_documents_are_kept_apart_per_key_and_owner():
+    index = ContractIndex(':memory:')
+    index.add('alice', drive_summary_rows(drive_summary(), FILE_HASH))
+    index.add('alice', drive_summary_rows(dict(drive_summary(), filename='other.pdf'), 'b' * 64))
+    index.add('bob', drive_summary_rows(drive_summary(), FILE_HASH))
+    assert index.search('alice')[1] == 2
+    assert index.search('bob')[1] == 1
+    assert index.search('alice', min_value=2000)[1] == 0
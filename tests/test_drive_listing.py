@@ -0,0 +1,184 @@
+# tests/test_drive_listing.py
+"""DriveListingCache and DriveClient against a local fake Drive v3 server"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from drive_client import FOLDER_MIME_TYPE, PDF_MIME_TYPE, DriveClient
+from drive_listing import DriveListingCache
+
+CLAUSE_PATTERNS = [
+    (re.compile(r"^'(.+)' in parents$"), lambda f, v: v in f.get('parents', [])),
+    (re.compile(r"^mimeType='(.+)'$"), lambda f, v: f['mimeType'] == v),
+    (re.compile(r"^trashed=(false)$"), lambda f, v: not f.get('trashed', False)),
+    (re.compile(r"^modifiedTime < '(.+)'$"), lambda f, v: f['modifiedTime'] < v),
+    (re.compile(r"^modifiedTime >= '(.+)'$"), lambda f, v: f['modifiedTime'] >= v)
+]
+
+
+def matches(file, query):
+    for clause in query.split(' and '):
+        for pattern, test in CLAUSE_PATTERNS:
+            match = pattern.match(clause)
+            if match:
+                if not test(file, match.group(1)):
+                    return False
+                break
+        else:
+            raise ValueError(f"Unsupported query clause: {clause}")
+    return True
+
+
+class FakeDrive:
+    """
+    Drive v3 files.list, changes and download endpoints over in-memory files
+    Pages hold at most page_size entries whatever the client asks for, so small
+    listings still span several pages
+    """
+
+    def __init__(self, page_size=3):
+        self.page_size = page_size
+        self.files = {}
+        self.changes = []
+        self.requests = []
+        # Change tokens below this are answered with 410, as when Drive expires them
+        self.oldest_change_token = 0
+        drive = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                drive.requests.append(url.path)
+                status, body = drive.handle(url.path, params)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def put(self, file):
+        """Add or update a file and record the change"""
+        self.files[file['id']] = file
+        self.changes.append({'fileId': file['id'], 'removed': False, 'file': file})
+
+    def delete(self, file_id):
+        del self.files[file_id]
+        self.changes.append({'fileId': file_id, 'removed': True})
+
+    def handle(self, path, params):
+        page_size = min(int(params.get('pageSize', 100)), self.page_size)
+        start = int(params.get('pageToken', 0))
+        if path == '/files':
+            found = sorted((f for f in self.files.values() if matches(f, params['q'])), key=lambda f: f['id'])
+            page = {'files': found[start:start + page_size]}
+            if start + page_size < len(found):
+                page['nextPageToken'] = str(start + page_size)
+            return 200, page
+        if path == '/changes/startPageToken':
+            return 200, {'startPageToken': str(len(self.changes))}
+        if path == '/changes':
+            if start < self.oldest_change_token:
+                return 410, {'error': 'expired page token'}
+            page = {'changes': self.changes[start:start + page_size]}
+            if start + page_size < len(self.changes):
+                page['nextPageToken'] = str(start + page_size)
+            else:
+                page['newStartPageToken'] = str(len(self.changes))
+            return 200, page
+        return 404, {}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def pdf(file_id, folder_id='folder_a', year=2020):
+    return {
+        'id': file_id,
+        'name': f"{file_id}.pdf",
+        'mimeType': PDF_MIME_TYPE,
+        'parents': [folder_id],
+        'modifiedTime': f"{year}-06-01T00:00:00.000Z",
+        'size': '1024'
+    }
+
+
+@pytest.fixture
+def drive():
+    fake = FakeDrive()
+    fake.files['folder_a'] = {'id': 'folder_a', 'name': 'A', 'mimeType': FOLDER_MIME_TYPE, 'modifiedTime': '2019'}
+    for i in range(20):
+        fake.files[f"pdf_{i:02d}"] = pdf(f"pdf_{i:02d}", year=2007 + i)
+    fake.files['other'] = pdf('other', folder_id='folder_b')
+    yield fake
+    fake.close()
+
+
+def test_cold_listing_pages_through_every_partition(drive):
+    client = DriveClient('token', base_url=drive.url)
+    files = DriveListingCache(partitions=4).get_folder_files('user', client, 'folder_a')
+    assert [f['id'] for f in files] == [f"pdf_{i:02d}" for i in range(20)]
+    # 20 files in 4 modifiedTime windows of at most 3 files per page take more than one page each
+    assert drive.requests.count('/files') > 4
+
+
+def test_listing_is_cached_within_ttl(drive):
+    client = DriveClient('token', base_url=drive.url)
+    cache = DriveListingCache()
+    cache.get_folder_files('user', client, 'folder_a')
+    listed = len(drive.requests)
+    drive.put(pdf('pdf_new'))
+    assert len(cache.get_folder_files('user', client, 'folder_a')) == 20
+    assert len(drive.requests) == listed
+
+
+def test_stale_listing_syncs_from_change_feed(drive):
+    client = DriveClient('token', base_url=drive.url)
+    cache = DriveListingCache(ttl_seconds=0)
+    cache.get_folder_files('user', client, 'folder_a')
+    drive.requests.clear()
+    drive.put(pdf('pdf_new'))
+    drive.delete('pdf_03')
+    drive.put(pdf('pdf_05', folder_id='folder_b'))
+    drive.put(dict(pdf('pdf_07'), name='renamed.pdf'))
+    drive.put(dict(pdf('pdf_08'), trashed=True))
+
+    files = {f['id']: f for f in cache.get_folder_files('user', client, 'folder_a')}
+    assert 'pdf_new' in files
+    assert not {'pdf_03', 'pdf_05', 'pdf_08'} & set(files)
+    assert files['pdf_07']['name'] == 'renamed.pdf'
+    assert len(files) == 18
+    # Five changes over pages of three, and no folder re-listing
+    assert drive.requests == ['/changes', '/changes']
+
+
+def test_expired_change_token_falls_back_to_full_listing(drive):
+    client = DriveClient('token', base_url=drive.url)
+    cache = DriveListingCache(ttl_seconds=0)
+    cache.get_folder_files('user', client, 'folder_a')
+    drive.put(pdf('pdf_new'))
+    drive.oldest_change_token = len(drive.changes)
+    drive.requests.clear()
+    files = cache.get_folder_files('user', client, 'folder_a')
+    assert len(files) == 21
+    assert '/files' in drive.requests
+
+
+def test_folders_are_listed_and_sorted(drive):
+    drive.files['folder_0'] = {'id': 'folder_0', 'name': '0 first', 'mimeType': FOLDER_MIME_TYPE}
+    client = DriveClient('token', base_url=drive.url)
+    assert [f['name'] for f in DriveListingCache().get_folders('user', client)] == ['0 first', 'A']
@@ -0,0 +1,33 @@
+# tests/test_dummy_data.py
+"""Synthetic data generators accept every size, including empty, and record and frame variants agree"""
+
+import pytest
+
+import dummy_data
+
+
+@pytest.mark.parametrize('generator', [
+    dummy_data.create_dummy_contract_data,
+    dummy_data.create_dummy_subscription_data,
+    dummy_data.create_dummy_line_item_data,
+    dummy_data.create_dummy_consumption_schedule,
+    dummy_data.create_dummy_consumption_rate,
+    dummy_data.dummy_pdf_files,
+    dummy_data.dummy_pdf_listing,
+    dummy_data.create_dummy_extraction_results,
+    dummy_data.create_dummy_extraction_frame
+])
+@pytest.mark.parametrize('rows', [0, 1, 1000])
+def test_generators_return_requested_rows(generator, rows):
+    assert len(generator(rows)) == rows
+
+
+def test_record_generators_match_their_frames():
+    listing = dummy_data.dummy_pdf_listing(50, seed=3, id_prefix='bulk_')
+    assert dummy_data.dummy_pdf_files(50, seed=3, id_prefix='bulk_') == listing.astype(object).to_dict('records')
+    results = dummy_data.create_dummy_extraction_results(50, seed=3)
+    assert results == dummy_data.create_dummy_extraction_frame(50, seed=3).astype(object).to_dict('records')
+    assert [r['filename'] for r in results] == listing['name'].tolist()
+    first = results[0]
+    assert first['contract_value'].startswith('$') and first['contract_value'].endswith(',000')
+    assert first['contract_date'] == listing['modifiedTime'][0][:10]
@@ -0,0 +1,43 @@
+# tests/test_excel_export.py
+"""Workbook export: continuation worksheets for Excel's row limit and for columns added by later files"""
+
+import io
+
+import openpyxl
+import pandas as pd
+import xlsxwriter
+
+from excel_export import WorkbookAppender, part_name, write_sheet
+
+
+def sheet_values(output):
+    output.seek(0)
+    return {ws.title: list(ws.values) for ws in openpyxl.load_workbook(io.BytesIO(output.read()))}
+
+
+def test_appender_continues_sheet_for_new_columns_and_row_limit():
+    appender = WorkbookAppender(['Contract'], max_rows=4)
+    appender.append('a.pdf', [('Contract', pd.DataFrame({'x': [1, 2]}))])
+    appender.append('b.pdf', [('Contract', pd.DataFrame({'x': [3], 'z': [9]}))])
+    appender.append('c.pdf', [('Contract', pd.DataFrame({'x': [4, 5, 6]}))])
+    output, _ = appender.close()
+    assert sheet_values(output) == {
+        'Contract': [('Source File', 'x'), ('a.pdf', 1), ('a.pdf', 2)],
+        'Contract (2)': [('Source File', 'x', 'z'), ('b.pdf', 3, 9), ('c.pdf', 4, None), ('c.pdf', 5, None)],
+        'Contract (3)': [('Source File', 'x', 'z'), ('c.pdf', 6, None)]
+    }
+
+
+def test_write_sheet_splits_rows_past_the_limit():
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    assert write_sheet(workbook, 'Contract', pd.DataFrame({'x': range(5)}), max_rows=3) == 3
+    workbook.close()
+    values = sheet_values(output)
+    assert [len(rows) - 1 for rows in values.values()] == [2, 2, 1]
+    assert sum((rows[1:] for rows in values.values()), []) == [(i,) for i in range(5)]
+
+
+def test_part_name_fits_excel_limit():
+    assert part_name('Contract', 1) == 'Contract'
+    assert len(part_name('x' * 31, 12)) == 31
@@ -0,0 +1,123 @@
+# tests/test_extraction_client.py
+"""ExtractionClient against a local stub endpoint: retries, backoff, token refresh and compression"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import extraction_client
+from extraction_client import ExtractionClient, ExtractionError, TokenCache
+from pdf_pages import map_pdf
+
+
+class StubEndpoint:
+    """Answers POSTs with the scripted (status, headers) replies in turn, then 200 with a JSON body"""
+
+    def __init__(self, replies=()):
+        self.replies = list(replies)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                stub.requests.append({'headers': dict(self.headers), 'body': body})
+                status, headers = stub.replies.pop(0) if stub.replies else (200, {})
+                payload = json.dumps({'output_records': []}).encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/extract"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff sleeps of the client, recorded instead of slept"""
+    recorded = []
+    monkeypatch.setattr(extraction_client.time, 'sleep', recorded.append)
+    return recorded
+
+
+def make_client(**kwargs):
+    tokens = iter(f"token-{i}" for i in range(100))
+    return ExtractionClient(TokenCache(lambda: {'access_token': next(tokens), 'expires_in': 3600}), **kwargs)
+
+
+def test_retries_server_errors_then_succeeds(sleeps):
+    stub = StubEndpoint([(503, {}), (429, {'Retry-After': '3'})])
+    try:
+        response = make_client().post(stub.url, b'%PDF', 'application/pdf')
+    finally:
+        stub.close()
+    assert response.status_code == 200
+    assert len(stub.requests) == 3
+    assert 0 <= sleeps[0] <= extraction_client.BACKOFF_BASE
+    # Retry-After wins over the jittered backoff
+    assert sleeps[1] == 3
+
+
+def test_gives_up_after_max_retries(sleeps):
+    stub = StubEndpoint([(500, {})] * 3)
+    try:
+        with pytest.raises(ExtractionError):
+            make_client(max_retries=2).post(stub.url, b'%PDF', 'application/pdf')
+    finally:
+        stub.close()
+    assert len(stub.requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_backoff_is_capped_full_jitter():
+    client = make_client()
+    for attempt in range(10):
+        limit = min(extraction_client.BACKOFF_CAP, extraction_client.BACKOFF_BASE * 2 ** attempt)
+        assert 0 <= client._backoff(attempt) <= limit
+
+
+def test_401_refreshes_token_without_using_a_retry(sleeps):
+    stub = StubEndpoint([(401, {})])
+    try:
+        response = make_client(max_retries=0).post(stub.url, b'%PDF', 'application/pdf')
+    finally:
+        stub.close()
+    assert response.status_code == 200
+    assert [r['headers']['Authorization'] for r in stub.requests] == ['Bearer token-0', 'Bearer token-1']
+    assert sleeps == []
+
+
+def test_compresses_small_bytes_and_streams_memory_maps(tmp_path):
+    body = b'%PDF ' + b'x' * 4096
+    path = tmp_path / 'upload.pdf'
+    path.write_bytes(body)
+    stub = StubEndpoint()
+    try:
+        client = make_client()
+        client.post(stub.url, body, 'application/pdf')
+        with map_pdf(str(path)) as mapped:
+            client.post(stub.url, mapped, 'application/pdf')
+    finally:
+        stub.close()
+    compressed, streamed = stub.requests
+    assert compressed['headers']['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed['body']) == body
+    assert 'Content-Encoding' not in streamed['headers']
+    assert streamed['body'] == body
@@ -0,0 +1,35 @@
+# tests/test_extraction_result.py
+"""Columnar result blocks: the pipeline, the endpoint conversion and ExtractionResult"""
+
+import json
+
+import pandas as pd
+
+from dummy_data import main_pipeline_dummy
+from extraction_result import RESULT_TABLES, ExtractionResult, columnar_response, contract_summary
+
+
+def test_dummy_pipeline_returns_json_ready_columnar_blocks():
+    response = main_pipeline_dummy(None, 'dummy_endpoint', 'dummy_token', delay_scale=0, rows=50)
+    blocks = response['output_records']
+    assert len(blocks) == len(RESULT_TABLES)
+    assert all(set(block) == {'columns'} for block in blocks)
+    result = ExtractionResult.from_response(json.loads(json.dumps(response)))
+    assert len(result['contract']) == 50
+    assert result['contract']['Contract Value'].dtype == 'float64'
+    assert pd.api.types.is_datetime64_any_dtype(result['contract']['Start Date'])
+
+
+def test_row_oriented_endpoint_blocks_are_converted_once():
+    response = {'output_records': [{'data': [{'Contract ID': 'C-1', 'Contract Value': '$1,000'}]}] * 7}
+    converted = columnar_response(response)
+    assert converted['output_records'][0] == {'columns': {'Contract ID': ['C-1'], 'Contract Value': ['$1,000']}}
+    assert ExtractionResult.from_response(converted)['contract']['Contract Value'].tolist() == [1000.0]
+
+
+def test_contract_summary_keeps_unparsed_values():
+    contract = pd.DataFrame({'Client Name': ['Acme'], 'Contract Value': ['TBD'], 'Start Date': ['2024-01-15']})
+    summary = contract_summary('acme.pdf', contract)
+    assert summary['contract_value'] == 'TBD'
+    assert summary['contract_date'] == '2024-01-15'
+    assert summary['party_1'] == 'Acme'
@@ -0,0 +1,155 @@
+# tests/test_job_queue.py
+"""JobQueue: job tracking, forgetting jobs, per-user batch quota, reserved interactive workers and round-robin owners"""
+
+import threading
+import time
+
+from batch_extraction import run_pipelined_extraction
+from job_queue import (
+    JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, PRIORITY_BATCH, PRIORITY_INTERACTIVE, JobQueue
+)
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, 'condition not reached in time'
+        time.sleep(0.01)
+
+
+def test_submit_tracks_progress_result_and_failure():
+    queue = JobQueue(max_workers=2)
+
+    def job(value, progress_callback):
+        progress_callback(0.5, 'halfway')
+        if value is None:
+            raise ValueError('no value')
+        return value * 2
+
+    ok = queue.submit(job, 21, owner='alice')
+    failed = queue.submit(job, None, owner='alice')
+    wait_until(lambda: queue.get(ok)['status'] == JOB_SUCCEEDED and queue.get(failed)['status'] == JOB_FAILED)
+    assert queue.get(ok)['result'] == 42
+    assert queue.get(ok)['progress'] == 1.0
+    assert queue.get(failed)['error'] == 'no value'
+    queue.forget(ok)
+    assert queue.get(ok) is None
+
+
+def test_forgetting_a_running_job_defers_cleanup_until_it_stops():
+    queue = JobQueue(max_workers=1, reserved_interactive=0)
+    release = threading.Event()
+    cleaned = []
+
+    job_id = queue.submit(lambda progress_callback: release.wait(5))
+    wait_until(lambda: queue.get(job_id)['status'] == JOB_RUNNING)
+    queue.forget(job_id, then=lambda: cleaned.append(job_id))
+    assert queue.get(job_id) is None
+    time.sleep(0.05)
+    assert cleaned == []
+
+    release.set()
+    wait_until(lambda: cleaned == [job_id])
+
+
+def test_forgotten_queued_job_is_not_started():
+    queue = JobQueue(max_workers=1, reserved_interactive=0)
+    release = threading.Event()
+    started = []
+    cleaned = []
+
+    blocker = queue.submit(lambda progress_callback: release.wait(5))
+    queued = queue.submit(lambda progress_callback: started.append(True))
+    wait_until(lambda: queue.get(blocker)['status'] == JOB_RUNNING)
+    queue.forget(queued, then=lambda: cleaned.append(queued))
+    release.set()
+    wait_until(lambda: cleaned == [queued])
+    time.sleep(0.05)
+    assert started == []
+
+
+def test_forgetting_a_finished_job_cleans_up_at_once():
+    queue = JobQueue(max_workers=1)
+    cleaned = []
+    job_id = queue.submit(lambda progress_callback: None)
+    wait_until(lambda: queue.get(job_id)['status'] == JOB_SUCCEEDED)
+    queue.forget(job_id, then=lambda: cleaned.append(job_id))
+    assert cleaned == [job_id]
+
+
+class Recorder:
+    """Tasks that record who is running and block until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.running = {}
+        self.peak = {}
+        self.started = []
+        self._lock = threading.Lock()
+
+    def task(self, owner):
+        def run():
+            with self._lock:
+                self.running[owner] = self.running.get(owner, 0) + 1
+                self.peak[owner] = max(self.peak.get(owner, 0), self.running[owner])
+                self.started.append(owner)
+            self.release.wait(5)
+            with self._lock:
+                self.running[owner] -= 1
+        return run
+
+
+def test_batch_quota_and_reserved_interactive_worker():
+    queue = JobQueue(max_workers=4, user_batch_quota=2, reserved_interactive=1)
+    recorder = Recorder()
+    for _ in range(6):
+        queue.enqueue('alice', PRIORITY_BATCH, recorder.task('alice'))
+    for _ in range(6):
+        queue.enqueue('bob', PRIORITY_BATCH, recorder.task('bob'))
+    # Three batch workers: two for one owner, one for the other
+    wait_until(lambda: sum(recorder.running.values()) == 3)
+    time.sleep(0.1)
+    assert sum(recorder.running.values()) == 3
+    assert max(recorder.running.values()) == 2
+    assert set(recorder.started) == {'alice', 'bob'}
+
+    job_id = queue.submit(lambda progress_callback: 'done', owner='carol', priority=PRIORITY_INTERACTIVE)
+    wait_until(lambda: queue.get(job_id)['status'] == JOB_SUCCEEDED)
+
+    recorder.release.set()
+    wait_until(lambda: len(recorder.started) == 12)
+    assert max(recorder.peak.values()) == 2
+
+
+def test_owners_are_served_round_robin():
+    queue = JobQueue(max_workers=2, user_batch_quota=1, reserved_interactive=1)
+    order = []
+    gate = threading.Event()
+    # Hold the only batch worker so both owners queue up behind it
+    queue.enqueue('blocker', PRIORITY_BATCH, lambda: gate.wait(5))
+    for i in range(3):
+        queue.enqueue('alice', PRIORITY_BATCH, lambda i=i: order.append(('alice', i)))
+        queue.enqueue('bob', PRIORITY_BATCH, lambda i=i: order.append(('bob', i)))
+    gate.set()
+    wait_until(lambda: len(order) == 6)
+    assert [owner for owner, _ in order] == ['alice', 'bob'] * 3
+
+
+def test_fair_share_executor_shutdown_waits_for_its_tasks():
+    queue = JobQueue(max_workers=2)
+    executor = queue.executor('alice')
+    done = []
+    futures = [executor.submit(lambda i=i: (time.sleep(0.05), done.append(i))) for i in range(4)]
+    executor.shutdown(wait=True)
+    assert all(f.done() for f in futures)
+    assert sorted(done) == [0, 1, 2, 3]
+
+
+def test_batch_extraction_runs_on_shared_workers():
+    queue = JobQueue(max_workers=2)
+    pdfs = [{'id': f"pdf_{i}", 'name': f"file_{i}.pdf", 'size': '100'} for i in range(5)]
+    outcomes = run_pipelined_extraction(
+        pdfs, lambda pdf: b'x', lambda pdf, pdf_bytes: pdf['id'],
+        extract_executor=queue.executor('user@example.com')
+    )
+    assert [o['result'] for o in outcomes] == [f"pdf_{i}" for i in range(5)]
@@ -0,0 +1,71 @@
+# tests/test_normalize.py
+"""normalize_frame: currency, percentage, date and category columns, and columns that do not parse"""
+
+import pandas as pd
+
+from batch_extraction import results_summary
+from normalize import normalize_frame, parse_currency, parse_dates
+
+
+def test_currency_and_percentage_become_floats():
+    df = normalize_frame(pd.DataFrame({
+        'Contract Value': ['$75,000', 'USD 1,200.50', None],
+        'Usage Percentage': ['85%', '12.5%', '0%']
+    }))
+    assert df['Contract Value'].dtype == 'float64'
+    assert df['Contract Value'].tolist()[:2] == [75000.0, 1200.5]
+    assert pd.isna(df['Contract Value'].iloc[2])
+    assert df['Usage Percentage'].tolist() == [85.0, 12.5, 0.0]
+
+
+def test_iso_dates_become_datetimes():
+    df = normalize_frame(pd.DataFrame({'Start Date': ['2024-01-15', '2024-02-01T00:00:00', None]}))
+    assert pd.api.types.is_datetime64_any_dtype(df['Start Date'])
+    assert df['Start Date'].iloc[0] == pd.Timestamp('2024-01-15')
+    assert pd.isna(df['Start Date'].iloc[2])
+
+
+def test_labels_become_categoricals_and_other_columns_are_kept():
+    df = normalize_frame(pd.DataFrame({'Status': ['Active', 'Pending', 'Active'], 'Notes': ['a', 'b', 'c']}))
+    assert isinstance(df['Status'].dtype, pd.CategoricalDtype)
+    assert df['Notes'].tolist() == ['a', 'b', 'c']
+
+
+def test_already_typed_columns_are_unchanged():
+    dates = pd.to_datetime(['2024-01-15'])
+    df = normalize_frame(pd.DataFrame({'Contract Value': [50000], 'Start Date': dates}))
+    assert df['Contract Value'].tolist() == [50000.0]
+    assert df['Start Date'].iloc[0] == dates[0]
+
+
+def test_columns_with_unparseable_values_keep_their_text():
+    original = pd.DataFrame({
+        'Contract Value': ['$50,000', 'TBD'],
+        'Usage Percentage': ['85%', 'n/a'],
+        'Start Date': ['2024-01-15', 'January 15, 2024'],
+        'End Date': ['01/15/2024', '2025-01-15'],
+        'Monthly Fee': ['$100', '$200']
+    })
+    df = normalize_frame(original)
+    for column in ['Contract Value', 'Usage Percentage', 'Start Date', 'End Date']:
+        assert df[column].tolist() == original[column].tolist()
+    assert df['Monthly Fee'].tolist() == [100.0, 200.0]
+
+
+def test_parsers_coerce_for_figures_only():
+    assert parse_currency(pd.Series(['$10', 'TBD'])).tolist()[0] == 10.0
+    assert pd.isna(parse_dates(pd.Series(['January 15, 2024'])).iloc[0])
+
+
+def test_results_summary_counts_parseable_values_of_text_columns():
+    results_df = normalize_frame(pd.DataFrame({
+        'contract_value': ['$1,000', 'TBD', '$3,000'],
+        'contract_date': ['2024-03-01', 'Q2 2024', '2024-01-01'],
+        'status': ['Active', 'Active', 'Pending']
+    }))
+    summary = results_summary(results_df)
+    assert summary['total_value'] == 4000.0
+    assert summary['average_value'] == 2000.0
+    assert summary['first_date'] == pd.Timestamp('2024-01-01')
+    assert summary['last_date'] == pd.Timestamp('2024-03-01')
+    assert summary['status_counts'] == {'Active': 2, 'Pending': 1}
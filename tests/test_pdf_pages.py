@@ -0,0 +1,68 @@
+# tests/test_pdf_pages.py
+"""Spooled uploads live in a directory per process start; page ranges are extracted in page order"""
+
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from dummy_data import dummy_pdf_bytes
+from pdf_pages import (
+    PARALLEL_MIN_PAGES, PROCESS_SPOOL_NAME, extract_page_texts, new_page_executor, page_ranges, process_spool_dir,
+    remove_stale_spooled, spool_upload
+)
+
+
+def test_spool_upload_uses_process_directory(tmp_path):
+    spool_dir = process_spool_dir(str(tmp_path))
+    path, digest = spool_upload(io.BytesIO(b'%PDF-1.4'), spool_dir=spool_dir)
+    assert os.path.dirname(path) == os.path.join(tmp_path, PROCESS_SPOOL_NAME)
+    assert PROCESS_SPOOL_NAME.startswith(f"{os.getpid()}-")
+    with open(path, 'rb') as f:
+        assert f.read() == b'%PDF-1.4'
+    assert len(digest) == 64
+
+
+def test_remove_stale_spooled_keeps_running_processes(tmp_path):
+    exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                            capture_output=True, text=True, check=True)
+    names = [
+        f"{exited.stdout.strip()}-a1",  # process has exited
+        f"{os.getpid()}-b2",  # earlier start that got this process's PID
+        PROCESS_SPOOL_NAME,
+        f"{os.getppid()}-c3",  # another running process
+        'not-a-pid'
+    ]
+    for name in names:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'upload_x.pdf').write_bytes(b'%PDF')
+    assert remove_stale_spooled(str(tmp_path)) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(names[2:])
+
+
+@pytest.fixture(scope='module')
+def page_executor():
+    executor = new_page_executor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_extract_page_texts_merges_ranges_in_page_order(tmp_path, page_executor):
+    page_count = PARALLEL_MIN_PAGES + 5
+    path = tmp_path / 'order.pdf'
+    path.write_bytes(dummy_pdf_bytes(page_count, 'Order'))
+    assert len(page_ranges(page_count, 4)) == 4
+
+    texts = extract_page_texts(str(path), page_executor, workers=2)
+    assert len(texts) == page_count
+    for page, text in enumerate(texts, start=1):
+        assert f"page {page} of {page_count}" in text
+    assert texts == extract_page_texts(str(path))
+
+
+def test_page_ranges_cover_every_page_once():
+    ranges = page_ranges(10, 4)
+    assert ranges == [(0, 2), (2, 5), (5, 7), (7, 10)]
+    assert page_ranges(2, 4) == [(0, 1), (1, 2)]
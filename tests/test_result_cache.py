@@ -0,0 +1,146 @@
+# tests/test_result_cache.py
+"""ResultCache: content keys, the memory LRU, the disk tier and single-flight computation of concurrent misses"""
+
+import threading
+import time
+
+import pytest
+
+from result_cache import ResultCache
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, 'condition not reached in time'
+        time.sleep(0.01)
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    ResultCache('v1', cache_dir=str(tmp_path)).put('v1-abc', {'output_records': []})
+    cache = ResultCache('v1', cache_dir=str(tmp_path))
+    assert cache.get('v1-abc') == {'output_records': []}
+    assert cache.stats()['hits'] == 1
+
+
+def test_concurrent_writes_past_the_disk_limit_all_succeed(tmp_path):
+    caches = [ResultCache('v1', cache_dir=str(tmp_path), max_disk_entries=5) for _ in range(2)]
+    errors = []
+    start = threading.Barrier(8)
+
+    def write(worker):
+        start.wait()
+        try:
+            for i in range(100):
+                caches[worker % 2].put(f"v1-{worker}-{i}", {'output_records': []})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    caches[0].put('v1-last', {'output_records': []})
+    assert len([name for name in tmp_path.iterdir() if name.suffix == '.json']) <= 5
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache('v1', cache_dir=None, max_memory_bytes=40)
+    cache.put('a', {'v': 'x' * 10})
+    cache.put('b', {'v': 'y' * 10})
+    cache.get('a')
+    cache.put('c', {'v': 'z' * 10})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+
+
+def test_membership_is_not_counted_as_a_lookup(tmp_path):
+    cache = ResultCache('v1', cache_dir=str(tmp_path))
+    assert 'v1-abc' not in cache
+    cache.put('v1-abc', {'output_records': []})
+    assert 'v1-abc' in cache
+    assert 'v1-abc' in ResultCache('v1', cache_dir=str(tmp_path))
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (0, 0)
+
+
+def test_get_or_compute_runs_the_pipeline_once_per_key(tmp_path):
+    cache = ResultCache('v1', cache_dir=str(tmp_path))
+    calls = []
+
+    def pipeline(value, progress_callback=None):
+        calls.append(value)
+        return {'value': value}
+
+    assert cache.get_or_compute('key', pipeline, 1, progress_callback=None) == {'value': 1}
+    assert cache.get_or_compute('key', pipeline, 2) == {'value': 1}
+    assert calls == [1]
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+
+@pytest.mark.parametrize('version', ['v1', 'v2'])
+def test_key_includes_pipeline_version(version):
+    assert ResultCache(version, cache_dir=None).key_for(b'%PDF').startswith(f"{version}-")
+
+
+def test_concurrent_misses_share_one_pipeline_run(tmp_path):
+    cache = ResultCache('v1', cache_dir=str(tmp_path))
+    release = threading.Event()
+    calls = []
+
+    def pipeline(value):
+        calls.append(value)
+        release.wait(5)
+        return {'value': value}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute('key', pipeline, 42)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.stats()['coalesced'] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [42]
+    assert results == [{'value': 42}] * 5
+
+
+def test_failed_run_is_raised_to_waiters_and_not_cached(tmp_path):
+    cache = ResultCache('v1', cache_dir=str(tmp_path))
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError('endpoint down')
+
+    def call():
+        try:
+            cache.get_or_compute('key', failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: cache.stats()['coalesced'] == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ['endpoint down'] * 3
+    assert cache.get_or_compute('key', lambda: {'ok': True}) == {'ok': True}
+
+
+def test_uncounted_reads_leave_hits_and_misses_alone(tmp_path):
+    cache = ResultCache('v1', cache_dir=str(tmp_path))
+    assert cache.get('v1-abc', count=False) is None
+    cache.put('v1-abc', {'output_records': []})
+    assert cache.get('v1-abc', count=False) == {'output_records': []}
+    assert ResultCache('v1', cache_dir=str(tmp_path)).get('v1-abc', count=False) == {'output_records': []}
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (0, 0)
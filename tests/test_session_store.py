@@ -0,0 +1,121 @@
+# tests/test_session_store.py
+"""SessionStore: spilling over budget, reading spilled tables back and closing abandoned sessions"""
+
+import os
+import time
+
+import pandas as pd
+
+from session_store import DISCONNECTED_GRACE_SECONDS, SessionFrames, SessionStore, frame_nbytes
+
+
+def table(value, rows=100):
+    return pd.DataFrame({
+        'Contract ID': [f"{value}-{i}" for i in range(rows)],
+        'Value': [float(i) for i in range(rows)]
+    })
+
+
+def test_tables_past_the_budget_are_spilled_least_recently_used_first(tmp_path):
+    size = frame_nbytes(table('a'))
+    frames = SessionFrames('s1', str(tmp_path), budget_bytes=2 * size)
+    frames.put('a', table('a'))
+    frames.put('b', table('b'))
+    frames['a']
+    frames.put('c', table('c'))
+
+    stats = frames.stats()
+    assert (stats['tables'], stats['spilled_tables'], stats['spills']) == (2, 1, 1)
+    assert stats['memory_bytes'] == 2 * size
+    assert len(os.listdir(tmp_path / 's1')) == 1
+    # b was the least recently used table
+    pd.testing.assert_frame_equal(frames['b'], table('b'))
+    assert sorted(frames) == ['a', 'b', 'c']
+
+
+def test_replacing_and_discarding_a_spilled_table_removes_its_file(tmp_path):
+    frames = SessionFrames('s1', str(tmp_path), budget_bytes=0)
+    frames.put('a', table('a'))
+    assert len(os.listdir(tmp_path / 's1')) == 1
+    frames.put('a', table('a2'))
+    assert len(os.listdir(tmp_path / 's1')) == 1
+    assert frames['a']['Contract ID'].iloc[0] == 'a2-0'
+    frames.discard('a')
+    assert os.listdir(tmp_path / 's1') == []
+    assert 'a' not in frames
+
+
+def test_namespace_clear_leaves_other_tables(tmp_path):
+    frames = SessionFrames('s1', str(tmp_path))
+    single = frames.namespace('single')
+    single.put('contract', table('a'))
+    frames.put('drive', table('b'))
+    assert list(single) == ['contract']
+    single.clear()
+    assert list(frames) == ['drive']
+
+
+def test_close_removes_spill_directory_and_tracked_files(tmp_path):
+    upload = tmp_path / 'upload.pdf'
+    upload.write_bytes(b'%PDF')
+    frames = SessionFrames('s1', str(tmp_path / 'spill'), budget_bytes=0)
+    frames.put('a', table('a'))
+    frames.track_file(str(upload))
+    frames.close()
+    assert not (tmp_path / 'spill' / 's1').exists()
+    assert not upload.exists()
+    assert len(frames) == 0
+
+
+def make_store(tmp_path, connected, idle_seconds=3600):
+    return SessionStore(str(tmp_path / 'spill'), idle_seconds=idle_seconds, is_active=lambda sid: sid in connected)
+
+
+def test_sweep_closes_disconnected_sessions_after_the_grace_period(tmp_path):
+    upload = tmp_path / 'upload.pdf'
+    upload.write_bytes(b'%PDF')
+    connected = set()
+    store = make_store(tmp_path, connected)
+    frames = store.session('gone')
+    frames.put('a', table('a'))
+    frames.track_file(str(upload))
+    store.session('recent')
+
+    # Disconnected but within the grace period
+    assert store.sweep() == 0
+    frames.last_seen = time.time() - DISCONNECTED_GRACE_SECONDS - 1
+    assert store.sweep() == 1
+    assert not upload.exists()
+    assert [s['session_id'] for s in store.report()] == ['recent']
+
+
+def test_sweep_spills_idle_sessions_that_are_still_connected(tmp_path):
+    connected = {'idle'}
+    store = make_store(tmp_path, connected, idle_seconds=DISCONNECTED_GRACE_SECONDS + 10)
+    frames = store.session('idle')
+    frames.put('a', table('a'))
+    frames.last_seen = time.time() - DISCONNECTED_GRACE_SECONDS - 20
+
+    assert store.sweep() == 0
+    stats = frames.stats()
+    assert (stats['tables'], stats['spilled_tables']) == (0, 1)
+    pd.testing.assert_frame_equal(frames['a'], table('a'))
+
+
+def test_without_connection_check_idle_sessions_are_closed(tmp_path):
+    store = SessionStore(str(tmp_path / 'spill'), idle_seconds=DISCONNECTED_GRACE_SECONDS + 10)
+    frames = store.session('s1')
+    frames.put('a', table('a'))
+    frames.last_seen = time.time() - DISCONNECTED_GRACE_SECONDS - 5
+    assert store.sweep() == 0
+    frames.last_seen = time.time() - DISCONNECTED_GRACE_SECONDS - 20
+    assert store.sweep() == 1
+
+
+def test_store_close_removes_the_session_spill_directory(tmp_path):
+    store = SessionStore(str(tmp_path / 'spill'), budget_bytes=0)
+    store.session('s1').put('a', table('a'))
+    assert (tmp_path / 'spill' / 's1').exists()
+    store.close('s1')
+    assert not (tmp_path / 'spill' / 's1').exists()
+    assert store.report() == []